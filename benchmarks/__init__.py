@@ -0,0 +1 @@
+"""Benchmarks of pytest-mysql fixtures' overhead."""
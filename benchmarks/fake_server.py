@@ -0,0 +1,110 @@
+"""Local server speaking just enough of MySQL's protocol for the client fixture.
+
+Every connection gets authenticated, and every command gets answered with an OK packet,
+so that client fixture's logic (connecting, creating, using and dropping databases)
+can be benchmarked without the server's own work.
+"""
+
+import os
+import socketserver
+import struct
+import threading
+from typing import Any, Optional, Tuple
+
+PROTOCOL_VERSION = 10
+SERVER_VERSION = b"8.0.0-pytest-mysql-fake"
+AUTH_PLUGIN = b"mysql_native_password"
+# LONG_PASSWORD, FOUND_ROWS, LONG_FLAG, CONNECT_WITH_DB, PROTOCOL_41, TRANSACTIONS,
+# SECURE_CONNECTION, MULTI_STATEMENTS, MULTI_RESULTS and PLUGIN_AUTH
+CAPABILITIES = 0x1 | 0x2 | 0x4 | 0x8 | 0x200 | 0x2000 | 0x8000 | 0x10000 | 0x20000 | 0x80000
+UTF8_GENERAL_CI = 33
+SERVER_STATUS_AUTOCOMMIT = 0x2
+COM_QUIT = 0x01
+
+
+def handshake(connection_id: int) -> bytes:
+    """Return initial handshake packet's payload (protocol version 10)."""
+    salt = os.urandom(20)
+    return b"".join(
+        (
+            struct.pack("<B", PROTOCOL_VERSION),
+            SERVER_VERSION + b"\0",
+            struct.pack("<I", connection_id),
+            salt[:8] + b"\0",
+            struct.pack("<H", CAPABILITIES & 0xFFFF),
+            struct.pack("<BH", UTF8_GENERAL_CI, SERVER_STATUS_AUTOCOMMIT),
+            struct.pack("<H", CAPABILITIES >> 16),
+            struct.pack("<B", len(salt) + 1),
+            b"\0" * 10,
+            salt[8:] + b"\0",
+            AUTH_PLUGIN + b"\0",
+        )
+    )
+
+
+def ok_packet() -> bytes:
+    """Return OK packet's payload: no affected rows, no insert id, autocommit on."""
+    return struct.pack("<BBBHH", 0, 0, 0, SERVER_STATUS_AUTOCOMMIT, 0)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: Any = self.server
+        self._write(0, handshake(server.next_connection_id()))
+        # handshake response, accepted whatever the credentials
+        packet = self._read()
+        if packet is None:
+            return
+        self._write(packet[0] + 1, ok_packet())
+        while (packet := self._read()) is not None:
+            sequence_id, payload = packet
+            if not payload or payload[0] == COM_QUIT:
+                return
+            self._write(sequence_id + 1, ok_packet())
+
+    def _read(self) -> Optional[Tuple[int, bytes]]:
+        header = self.rfile.read(4)
+        if len(header) < 4:
+            return None
+        length = int.from_bytes(header[:3], "little")
+        return header[3], self.rfile.read(length)
+
+    def _write(self, sequence_id: int, payload: bytes) -> None:
+        self.wfile.write(len(payload).to_bytes(3, "little") + bytes([sequence_id % 256]) + payload)
+
+
+class FakeMySQLServer(socketserver.ThreadingTCPServer):
+    """Fake MySQL server listening on a local TCP port, served from a background thread."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Bind the server, port 0 picks a free one.
+
+        :param host: address to listen on
+        :param port: port to listen on
+        """
+        super().__init__((host, port), _Handler)
+        self.host = host
+        self.port: int = self.server_address[1]
+        self._connection_id = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_connection_id(self) -> int:
+        """Return id for the next connection."""
+        with self._lock:
+            self._connection_id += 1
+            return self._connection_id
+
+    def __enter__(self) -> "FakeMySQLServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
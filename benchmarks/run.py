@@ -0,0 +1,314 @@
+"""Benchmark pytest-mysql fixtures' overhead, and write results into a JSON file.
+
+Every target runs the same scenario - a number of trivial tests using the client fixture:
+
+* ``fake`` - against local fake protocol server (see :mod:`benchmarks.fake_server`),
+  measuring only the client fixture's logic,
+* ``mysql`` and ``mariadb`` - against real servers started by ``mysql_proc``
+  with the default launcher (``mysqld_safe``),
+  first with an empty cache directory (cold start), then with the populated one (warm start).
+  Targets get skipped if their binaries can't be found.
+* ``mysql-mysqld`` and ``mariadb-mysqld`` - the same, with servers started by ``mysqld`` directly.
+
+Usage, from the repository's root::
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --output results.json --compare baseline.json
+
+Arguments after ``--`` are passed to pytest, like ``-- --mysql-user=$USER``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from importlib.metadata import PackageNotFoundError, entry_points, version
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import port_for
+
+from benchmarks.fake_server import FakeMySQLServer
+from pytest_mysql.timing import percentile
+
+ROOT = Path(__file__).parent.parent
+SCENARIO = Path(__file__).parent / "scenario"
+TARGETS = ("fake", "mysql", "mariadb", "mysql-mysqld", "mariadb-mysqld")
+STARTUP_PHASES = ("version detection", "datadir init", "process start", "readiness")
+# metrics, that got better when they went up, all the other ones are durations in seconds
+HIGHER_IS_BETTER = ("throughput",)
+
+
+class ScenarioFailed(Exception):
+    """Benchmark scenario's test run failed."""
+
+
+def _plugin_args() -> List[str]:
+    """Load the plugin explicitly, unless it's installed and loaded through its entry point."""
+    for entry_point in entry_points(group="pytest11"):
+        if entry_point.value == "pytest_mysql.plugin":
+            return []
+    return ["-p", "pytest_mysql.plugin"]
+
+
+def run_scenario(
+    workdir: Path, name: str, process_fixture: str, tests: int, pytest_args: List[str]
+) -> Dict[str, Any]:
+    """Run scenario's tests, and return measured metrics.
+
+    :param workdir: directory for pytest's basetemp and results
+    :param name: run's name
+    :param process_fixture: process fixture used by scenario's client fixture
+    :param tests: number of tests to run
+    :param pytest_args: additional pytest arguments
+    :returns: phases' timings from ``--mysql-timings-json``,
+        tests' durations from the JUnit XML report,
+        and tests' setup and teardown durations reported by the scenario
+    """
+    timings_path = workdir / f"{name}-timings.json"
+    reports_path = workdir / f"{name}-reports.json"
+    junit_path = workdir / f"{name}-junit.xml"
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        str(SCENARIO),
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        *_plugin_args(),
+        f"--basetemp={workdir / name}",
+        f"--mysql-timings-json={timings_path}",
+        f"--junitxml={junit_path}",
+        *pytest_args,
+    ]
+    env = {
+        **os.environ,
+        "PYTEST_MYSQL_BENCHMARK_PROC": process_fixture,
+        "PYTEST_MYSQL_BENCHMARK_TESTS": str(tests),
+        "PYTEST_MYSQL_BENCHMARK_REPORTS": str(reports_path),
+        "PYTHONPATH": os.pathsep.join(filter(None, (str(ROOT), os.environ.get("PYTHONPATH")))),
+    }
+    completed = subprocess.run(
+        command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    if completed.returncode:
+        raise ScenarioFailed(completed.stdout[-2000:])
+    phases = {(row["fixture"], row["phase"]): row for row in json.loads(timings_path.read_text())}
+    durations = [
+        float(testcase.get("time", 0)) for testcase in ET.parse(junit_path).iter("testcase")
+    ]
+    reports = json.loads(reports_path.read_text())
+    return {
+        "phases": phases,
+        "durations": durations,
+        "setup": reports["setup"],
+        "teardown": reports["teardown"],
+    }
+
+
+def client_metrics(run: Dict[str, Any]) -> Dict[str, float]:
+    """Return client fixture's setup and teardown latency, and tests' throughput.
+
+    Latency percentiles are calculated from each test's whole setup and teardown,
+    which in the scenario cover nothing but the client fixture.
+    First test's setup and last test's teardown include process fixture's setup and teardown,
+    so they're left out, and throughput is calculated from the tests in between.
+    """
+    setup = run["setup"][1:] or run["setup"]
+    teardown = run["teardown"][:-1] or run["teardown"]
+    middle = run["durations"][1:-1]
+    return {
+        "client_setup_p50": percentile(setup, 0.5),
+        "client_setup_p95": percentile(setup, 0.95),
+        "client_teardown_p50": percentile(teardown, 0.5),
+        "client_teardown_p95": percentile(teardown, 0.95),
+        "throughput": len(middle) / sum(middle) if sum(middle) else 0.0,
+    }
+
+
+def startup(run: Dict[str, Any]) -> float:
+    """Return process fixture's startup duration."""
+    return float(
+        sum(
+            run["phases"][("mysql_proc", phase)]["total"]
+            for phase in STARTUP_PHASES
+            if ("mysql_proc", phase) in run["phases"]
+        )
+    )
+
+
+def benchmark_fake(workdir: Path, tests: int, pytest_args: List[str]) -> Dict[str, Any]:
+    """Benchmark client fixture against the fake server."""
+    with FakeMySQLServer() as server:
+        run = run_scenario(
+            workdir,
+            "fake",
+            "mysql_noproc",
+            tests,
+            [f"--mysql-host={server.host}", f"--mysql-port={server.port}", *pytest_args],
+        )
+    return {"status": "ok", "version": "fake", "metrics": client_metrics(run)}
+
+
+def server_version(mysqld: Optional[str]) -> Optional[str]:
+    """Return ``mysqld --version`` output, None if binary can't be run."""
+    if not mysqld:
+        return None
+    try:
+        return subprocess.check_output([mysqld, "--version"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_mysqld(target: str, mysqld: Optional[str]) -> Optional[str]:
+    """Return path to mysqld of a given implementation, None if it's not installed."""
+    candidates = (
+        [mysqld] if mysqld else ["mariadbd", "mysqld"] if target == "mariadb" else ["mysqld"]
+    )
+    for candidate in candidates:
+        path = shutil.which(candidate)
+        output = server_version(path)
+        if output and ("MariaDB" in output) == (target == "mariadb"):
+            return path
+    return None
+
+
+def benchmark_server(
+    workdir: Path,
+    target: str,
+    mysqld: Optional[str],
+    install_db: Optional[str],
+    tests: int,
+    pytest_args: List[str],
+) -> Dict[str, Any]:
+    """Benchmark process and client fixtures against a real server.
+
+    :param target: ``mysql`` or ``mariadb``, with ``-mysqld`` suffix
+        to start the server with ``mysqld`` launcher, instead of the default one
+    """
+    implementation, _, launcher = target.partition("-")
+    mysqld_path = find_mysqld(implementation, mysqld)
+    if mysqld_path is None:
+        return {"status": "skipped", "reason": f"{mysqld or implementation} binary not found"}
+    args = [
+        f"--mysql-mysqld={mysqld_path}",
+        f"--mysql-port={port_for.select_random()}",
+        f"--mysql-cache-dir={workdir / f'{target}-cache'}",
+    ]
+    if launcher:
+        args.append(f"--mysql-launcher={launcher}")
+    else:
+        # the one installed along with benchmarked mysqld
+        mysqld_safe = Path(mysqld_path).with_name("mysqld_safe")
+        if mysqld_safe.exists():
+            args.append(f"--mysql-mysqld-safe={mysqld_safe}")
+    if implementation == "mariadb":
+        install_db = install_db or shutil.which("mariadb-install-db") or "mysql_install_db"
+        args.append(f"--mysql-install-db={install_db}")
+    cold = run_scenario(workdir, f"{target}-cold", "mysql_proc", tests, [*args, *pytest_args])
+    warm = run_scenario(workdir, f"{target}-warm", "mysql_proc", tests, [*args, *pytest_args])
+    return {
+        "status": "ok",
+        "version": server_version(mysqld_path),
+        "metrics": {
+            "startup_cold": startup(cold),
+            "startup_warm": startup(warm),
+            "shutdown": warm["phases"][("mysql_proc", "shutdown")]["total"],
+            **client_metrics(warm),
+        },
+    }
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any], threshold: float) -> List[str]:
+    """Print metrics' change against the baseline, and return regressed ones.
+
+    :param baseline: earlier results
+    :param results: current results
+    :param threshold: relative change considered a regression
+    """
+    regressions = []
+    for target, result in results["targets"].items():
+        base = baseline["targets"].get(target, {})
+        if result["status"] != "ok" or base.get("status") != "ok":
+            continue
+        for metric, value in result["metrics"].items():
+            base_value = base["metrics"].get(metric)
+            if not base_value:
+                continue
+            change = (value - base_value) / base_value
+            regressed = -change > threshold if metric in HIGHER_IS_BETTER else change > threshold
+            line = f"{target:14} {metric:20} {base_value:12.6f} {value:12.6f} {change:+8.1%}"
+            print(f"{line}  REGRESSION" if regressed else line)
+            if regressed:
+                regressions.append(f"{target} {metric}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=50, help="number of tests per run")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--mysqld", help="MySQL's mysqld binary")
+    parser.add_argument("--mariadbd", help="MariaDB's mysqld binary")
+    parser.add_argument("--install-db", help="MariaDB's mysql_install_db script")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="relative change considered a regression"
+    )
+    parser.add_argument("pytest_args", nargs="*", help="additional pytest arguments")
+    args = parser.parse_args(argv)
+    if args.tests < 3:
+        parser.error("at least 3 tests are needed to measure throughput")
+
+    try:
+        package_version = version("pytest-mysql")
+    except PackageNotFoundError:
+        package_version = "not installed"
+    results: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pytest-mysql": package_version,
+        },
+        "tests": args.tests,
+        "targets": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="pytest-mysql-benchmarks-") as tmpdir:
+        for target in args.targets:
+            workdir = Path(tmpdir)
+            try:
+                if target == "fake":
+                    result = benchmark_fake(workdir, args.tests, args.pytest_args)
+                else:
+                    result = benchmark_server(
+                        workdir,
+                        target,
+                        args.mariadbd if target.startswith("mariadb") else args.mysqld,
+                        args.install_db,
+                        args.tests,
+                        args.pytest_args,
+                    )
+            except ScenarioFailed as e:
+                result = {"status": "failed", "reason": str(e)}
+            results["targets"][target] = result
+            print(f"{target}: {result['status']} {result.get('metrics', result.get('reason'))}")
+    args.output.write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), results, args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Benchmark scenario's fixtures."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from pytest_mysql import factories
+
+# process fixture is chosen by the benchmark runner: mysql_proc or mysql_noproc
+mysql_benchmark = factories.mysql(os.environ.get("PYTEST_MYSQL_BENCHMARK_PROC", "mysql_proc"))
+
+_durations: Dict[str, List[float]] = {"setup": [], "teardown": []}
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    """Collect each test's setup and teardown duration."""
+    if report.when in _durations:
+        _durations[report.when].append(report.duration)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Write tests' setup and teardown durations for the benchmark runner."""
+    path = os.environ.get("PYTEST_MYSQL_BENCHMARK_REPORTS")
+    if path:
+        Path(path).write_text(json.dumps(_durations))
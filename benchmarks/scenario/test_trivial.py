@@ -0,0 +1,13 @@
+"""Trivial tests, measuring nothing but the fixtures' overhead."""
+
+import os
+
+import pytest
+from pymysql import Connection
+
+TESTS = int(os.environ.get("PYTEST_MYSQL_BENCHMARK_TESTS", "50"))
+
+
+@pytest.mark.parametrize("number", range(TESTS))
+def test_trivial(mysql_benchmark: Connection, number: int) -> None:
+    """Only request the client fixture."""
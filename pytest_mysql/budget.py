@@ -0,0 +1,159 @@
+"""Asserting the number of statements and rows examined by a block of code."""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from pymysql import Connection
+
+from pytest_mysql.exceptions import QueryBudgetExceeded
+
+# session status counters, incremented for each row read by storage engines
+HANDLER_READ = (
+    "Handler_read_first",
+    "Handler_read_key",
+    "Handler_read_last",
+    "Handler_read_next",
+    "Handler_read_prev",
+    "Handler_read_rnd",
+    "Handler_read_rnd_next",
+)
+
+
+class QueryCounter:
+    """Count statements run on the connection, and rows they have examined.
+
+    With performance schema turned on, counters of connection's thread are read
+    through a separate connection, so reading them doesn't affect the counts.
+    Otherwise, connection's own session status is read: ``Questions`` for statements,
+    and sum of ``Handler_read_*`` counters for rows examined, less what reading
+    the status costs itself.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        tracker: Optional[Connection] = None,
+        performance_schema: Optional[bool] = None,
+    ) -> None:
+        """Find connection's thread and pick the counters to read.
+
+        :param connection: connection whose statements are counted
+        :param tracker: connection used to read performance schema's counters.
+            By default, opened with the same credentials as the counted one.
+        :param performance_schema: whether to read performance schema's counters,
+            by default if it's turned on
+        """
+        self.connection = connection
+        # run before the counting starts
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT CONNECTION_ID(), @@performance_schema")
+            self.connection_id, enabled = cursor.fetchone()
+        self.performance_schema = (
+            bool(enabled) if performance_schema is None else performance_schema
+        )
+        self._own_tracker = tracker is None and self.performance_schema
+        self.tracker: Optional[Connection] = tracker if self.performance_schema else None
+        if self._own_tracker:
+            self.tracker = Connection(
+                host=connection.host,
+                port=connection.port,
+                user=connection.user,
+                password=connection.password,
+                unix_socket=connection.unix_socket,
+            )
+        self._overhead = (0, 0)
+        if self.tracker is None:
+            first = self.counters()
+            self._overhead = self._difference(first, self.counters())
+
+    def counters(self) -> Tuple[int, int]:
+        """Return statements run and rows examined by the connection so far."""
+        if self.tracker is not None:
+            with self.tracker.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COALESCE(SUM(s.COUNT_STAR), 0), COALESCE(SUM(s.SUM_ROWS_EXAMINED), 0) "
+                    "FROM performance_schema.events_statements_summary_by_thread_by_event_name s "
+                    "JOIN performance_schema.threads t ON t.THREAD_ID = s.THREAD_ID "
+                    "WHERE t.PROCESSLIST_ID = %s",
+                    (self.connection_id,),
+                )
+                statements, rows_examined = cursor.fetchone()
+                return int(statements), int(rows_examined)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SHOW SESSION STATUS WHERE Variable_name IN %s",
+                (("Questions", *HANDLER_READ),),
+            )
+            status: Dict[str, int] = {name: int(value) for name, value in cursor.fetchall()}
+        return status["Questions"], sum(status.get(name, 0) for name in HANDLER_READ)
+
+    def _difference(self, before: Tuple[int, int], after: Tuple[int, int]) -> Tuple[int, int]:
+        return after[0] - before[0], after[1] - before[1]
+
+    def since(self, before: Tuple[int, int]) -> Tuple[int, int]:
+        """Return statements run and rows examined since the earlier counters."""
+        statements, rows_examined = self._difference(before, self.counters())
+        return (
+            max(statements - self._overhead[0], 0),
+            max(rows_examined - self._overhead[1], 0),
+        )
+
+    def close(self) -> None:
+        """Close the tracking connection, if it was opened by the counter."""
+        if self._own_tracker and self.tracker is not None:
+            self.tracker.close()
+
+
+class QueryUsage:
+    """Statements run and rows examined within the query budget's block."""
+
+    def __init__(self) -> None:
+        """Initialize counts, filled in once the block ends."""
+        self.queries = 0
+        self.rows_examined = 0
+
+    def __repr__(self) -> str:
+        """Show counts."""
+        return f"<QueryUsage queries={self.queries} rows_examined={self.rows_examined}>"
+
+
+@contextmanager
+def query_budget(
+    connection: Connection,
+    max_queries: Optional[int] = None,
+    max_rows_examined: Optional[int] = None,
+    tracker: Optional[Connection] = None,
+) -> Iterator[QueryUsage]:
+    """Fail, if the block runs more statements or examines more rows than allowed.
+
+    Counts come from server's counters, so statements run by any library
+    using the connection are counted as well.
+
+    .. code-block:: python
+
+        with query_budget(mysql, max_queries=5, max_rows_examined=1000) as usage:
+            list_owners_with_pets(mysql)
+
+    :param connection: connection whose statements are counted, ie. client fixture
+    :param max_queries: maximum number of statements, not limited if None
+    :param max_rows_examined: maximum number of rows examined, not limited if None
+    :param tracker: connection used to read performance schema's counters,
+        see :class:`QueryCounter`
+    :returns: usage, with counts filled in once the block ends
+    :raises QueryBudgetExceeded: if any of the limits got exceeded
+    """
+    counter = QueryCounter(connection, tracker)
+    usage = QueryUsage()
+    try:
+        before = counter.counters()
+        yield usage
+        usage.queries, usage.rows_examined = counter.since(before)
+    finally:
+        counter.close()
+    exceeded = []
+    if max_queries is not None and usage.queries > max_queries:
+        exceeded.append(f"{usage.queries} queries run, {max_queries} allowed")
+    if max_rows_examined is not None and usage.rows_examined > max_rows_examined:
+        exceeded.append(f"{usage.rows_examined} rows examined, {max_rows_examined} allowed")
+    if exceeded:
+        raise QueryBudgetExceeded("Query budget exceeded: " + "; ".join(exceeded))
@@ -0,0 +1,193 @@
+"""Persistent caches shared between pytest runs."""
+
+import fcntl
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Sequence
+
+from pytest_mysql.loader import LoadType
+
+# ioctl request cloning file's extents (copy-on-write) on Linux filesystems
+# that support it - btrfs, xfs, bcachefs, overlayfs on top of those.
+FICLONE = 0x40049409
+
+
+def _clone_or_copy(src: str, dst: str) -> str:
+    """Reflink file if filesystem supports it, copy it otherwise."""
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            shutil.copyfileobj(src_file, dst_file)
+    shutil.copystat(src, dst)
+    return dst
+
+
+class DatadirCache:
+    """Initialised MySQL data directories kept as templates for new servers.
+
+    Initialising data directory is the most time-consuming part of starting
+    MySQL server for tests. Initialised directory gets stored in the cache
+    under the key describing the server and the way it was initialised,
+    and then it's copied into every new data directory sharing the same key.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize cache.
+
+        :param cache_dir: pytest-mysql's cache directory.
+        """
+        self.path = cache_dir / "datadirs"
+
+    @staticmethod
+    def key(mysqld: Path, version: str, implementation: str, init_flags: str) -> str:
+        """Compute cache key for initialised data directory.
+
+        :param mysqld: path to mysqld executable
+        :param version: mysqld's version
+        :param implementation: mysqld's implementation (mysql or mariadb)
+        :param init_flags: initialisation method and its flags
+        """
+        mysqld_path = shutil.which(mysqld) or str(mysqld)
+        key_source = "\0".join((os.path.realpath(mysqld_path), version, implementation, init_flags))
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return path to the cached data directory if exists."""
+        template = self.path / key
+        if template.is_dir():
+            return template
+        return None
+
+    def restore(self, key: str, datadir: Path) -> bool:
+        """Populate datadir with a cached template.
+
+        :returns: True if template was found and copied into datadir.
+        """
+        template = self.get(key)
+        if template is None:
+            return False
+        shutil.copytree(template, datadir, copy_function=_clone_or_copy, dirs_exist_ok=True)
+        return True
+
+    def store(self, key: str, datadir: Path) -> None:
+        """Store initialised datadir as template.
+
+        Template is copied aside first and moved into its place afterwards,
+        so several processes initialising same datadir at once
+        never see a partially written template.
+        """
+        if self.get(key):
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        partial = self.path / f".{key}.{os.getpid()}"
+        # server's UUID gets generated on first start if auto.cnf is missing
+        ignored = shutil.ignore_patterns("auto.cnf", "*.pid", "*.sock")
+        shutil.copytree(datadir, partial, copy_function=_clone_or_copy, ignore=ignored)
+        try:
+            partial.rename(self.path / key)
+        except OSError:
+            # other process stored the same template in the meantime
+            shutil.rmtree(partial, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove all cached data directories."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class SchemaCache(DatadirCache):
+    """Data directories with the schema loaded, kept to skip loading it on every start.
+
+    Loading schema (or running migrations) into the new server can take longer
+    than initialising its data directory. Data directory with the schema loaded
+    is stored under the key built from initialised datadir's key and schema's sources,
+    so changing migration files or upgrading the server invalidates the snapshot.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize cache.
+
+        :param cache_dir: pytest-mysql's cache directory.
+        """
+        self.path = cache_dir / "schemas"
+
+    @staticmethod
+    def source_hash(schema: Sequence[LoadType], schema_files: Sequence[Path]) -> str:
+        """Compute hash of schema's sources.
+
+        :param schema: sql files, import paths or callables loading the schema.
+            Sql files' contents are hashed, other loaders by their names.
+        :param schema_files: files or directories (like migrations) the schema
+            loaders read, hashed by their contents and names relative to the directory.
+        """
+        digest = hashlib.sha256()
+        paths = []
+        for load in schema:
+            if isinstance(load, Path):
+                paths.append(load)
+            else:
+                name = load if isinstance(load, str) else f"{load.__module__}.{load.__qualname__}"
+                digest.update(f"{name}\0".encode("utf-8"))
+        for path in [*paths, *schema_files]:
+            files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+            for file_path in files:
+                # relative names, so that project's checkouts in other places share snapshots
+                name = file_path.relative_to(path).as_posix() if path.is_dir() else file_path.name
+                digest.update(f"{name}\0".encode("utf-8"))
+                digest.update(file_path.read_bytes())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def snapshot_key(datadir_key: str, source_hash: str) -> str:
+        """Compute cache key for the data directory with the schema loaded.
+
+        :param datadir_key: key of the initialised data directory, see :meth:`DatadirCache.key`
+        :param source_hash: hash of schema's sources, see :meth:`source_hash`
+        """
+        return hashlib.sha256(f"{datadir_key}\0{source_hash}".encode("utf-8")).hexdigest()[:16]
+
+
+class VersionCache:
+    """Output of ``mysqld --version`` kept to skip running the binary on every start.
+
+    Output is stored under the key built from binary's path, size and modification
+    time, so upgraded binary never gets the stale version.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize cache.
+
+        :param cache_dir: pytest-mysql's cache directory.
+        """
+        self.path = cache_dir / "versions"
+
+    @staticmethod
+    def key(mysqld: Path) -> Optional[str]:
+        """Compute cache key for the binary, None if binary can not be found."""
+        mysqld_path = shutil.which(mysqld)
+        if not mysqld_path:
+            return None
+        mysqld_path = os.path.realpath(mysqld_path)
+        stat = os.stat(mysqld_path)
+        key_source = "\0".join((mysqld_path, str(stat.st_size), str(stat.st_mtime_ns)))
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached version output if exists."""
+        try:
+            return (self.path / key).read_text()
+        except FileNotFoundError:
+            return None
+
+    def store(self, key: str, output: str) -> None:
+        """Store version output."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        partial = self.path / f".{key}.{os.getpid()}"
+        partial.write_text(output)
+        partial.replace(self.path / key)
+
+    def clear(self) -> None:
+        """Remove all cached version outputs."""
+        shutil.rmtree(self.path, ignore_errors=True)
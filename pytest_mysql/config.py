@@ -1,9 +1,12 @@
 """Config module."""
 
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, List, Optional, TypedDict, Union
 
-from pytest import FixtureRequest
+from pytest import Config, FixtureRequest
+
+from pytest_mysql.executor import LauncherType, ReadinessType
+from pytest_mysql.profiles import ProfileType
 
 
 class MySQLConfigType(TypedDict):
@@ -20,14 +23,28 @@ class MySQLConfigType(TypedDict):
     params: str
     logsdir: str
     install_db: str
+    cache_dir: str
+    xdist_shared: bool
+    db_pool_size: int
+    datadir_mode: str
+    tmpfs_path: Path
+    profile: Optional[ProfileType]
+    readiness: ReadinessType
+    launcher: LauncherType
+    reuse_server: bool
+    digests: bool
+    digests_limit: int
+    status: bool
+    status_counters: List[str]
 
 
-def get_config(request: FixtureRequest) -> MySQLConfigType:
+def get_config(request: Union[FixtureRequest, Config]) -> MySQLConfigType:
     """Return a dictionary with config options."""
+    pytest_config = request if isinstance(request, Config) else request.config
 
     def get_conf_option(option: str) -> Any:
         option_name = "mysql_" + option
-        return request.config.getoption(option_name) or request.config.getini(option_name)
+        return pytest_config.getoption(option_name) or pytest_config.getini(option_name)
 
     config: MySQLConfigType = {
         "mysqld": Path(get_conf_option("mysqld")),
@@ -41,5 +58,22 @@ def get_config(request: FixtureRequest) -> MySQLConfigType:
         "params": get_conf_option("params"),
         "logsdir": get_conf_option("logsdir"),
         "install_db": get_conf_option("install_db"),
+        "cache_dir": get_conf_option("cache_dir"),
+        "xdist_shared": get_conf_option("xdist_shared"),
+        "db_pool_size": int(get_conf_option("db_pool_size")),
+        "datadir_mode": get_conf_option("datadir_mode"),
+        "tmpfs_path": Path(get_conf_option("tmpfs_path")),
+        "profile": get_conf_option("profile") or None,
+        "readiness": get_conf_option("readiness"),
+        "launcher": get_conf_option("launcher"),
+        "reuse_server": get_conf_option("reuse_server"),
+        "digests": get_conf_option("digests"),
+        "digests_limit": int(get_conf_option("digests_limit")),
+        "status": bool(get_conf_option("status") or get_conf_option("status_json")),
+        "status_counters": [
+            counter.strip()
+            for counter in get_conf_option("status_counters").split(",")
+            if counter.strip()
+        ],
     }
     return config
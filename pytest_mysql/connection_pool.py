@@ -0,0 +1,109 @@
+"""Pool of authenticated connections, reused in between tests."""
+
+import threading
+import weakref
+from typing import Any, Dict, List, Tuple
+
+from pymysql import Connection, MySQLError
+
+# pymysql doesn't define it: command resetting session's state, keeping connection authenticated
+COM_RESET_CONNECTION = 0x1F
+
+
+class ConnectionPool:
+    """Connections kept open in between tests, and reset before they're handed out again.
+
+    ``COM_RESET_CONNECTION`` rolls back open transaction, releases locks, drops temporary
+    tables and restores session variables, without authenticating again.
+    Servers that don't support it (before MySQL 5.7.3 and MariaDB 10.2.4) get
+    a new connection for every test.
+
+    The reset doesn't change the authenticated user, so connections are only handed out
+    to callers connecting with the same keyword arguments they were opened with.
+    """
+
+    def __init__(self, size: int = 2) -> None:
+        """Initialize empty pool.
+
+        :param size: maximum number of idle connections kept open
+        """
+        self.size = size
+        self.supported = True
+        self._closed = False
+        self._idle: List[Tuple[Dict[str, Any], Connection]] = []
+        self._kwargs: "weakref.WeakKeyDictionary[Connection, Dict[str, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def connect(self, connection_kwargs: Dict[str, Any]) -> Connection:
+        """Return reset idle connection opened with the same arguments, or a new one."""
+        while True:
+            with self._lock:
+                matching = [
+                    index
+                    for index, (kwargs, _) in enumerate(self._idle)
+                    if kwargs == connection_kwargs
+                ]
+                if not matching:
+                    break
+                _, mysql_conn = self._idle.pop(matching[-1])
+            if self._reset(mysql_conn, bool(connection_kwargs.get("autocommit", False))):
+                return mysql_conn
+        # LOAD DATA LOCAL INFILE lets pytest_mysql.seed stream rows into tables
+        mysql_conn = Connection(local_infile=True, **connection_kwargs)
+        with self._lock:
+            self._kwargs[mysql_conn] = dict(connection_kwargs)
+        return mysql_conn
+
+    def _reset(self, mysql_conn: Connection, autocommit: bool) -> bool:
+        """Reset session's state, and restore the one connection was set up with.
+
+        :param mysql_conn: connection to reset
+        :param autocommit: connection's autocommit mode, that the test might have changed
+        """
+        try:
+            # pymysql has no public API to send it
+            mysql_conn._execute_command(COM_RESET_CONNECTION, b"")  # type: ignore
+            mysql_conn._read_ok_packet()  # type: ignore
+            names = f"NAMES {mysql_conn.charset}"
+            if mysql_conn.collation:
+                names += f" COLLATE {mysql_conn.collation}"
+            with mysql_conn.cursor() as cursor:
+                cursor.execute(f"SET {names}, autocommit = {int(autocommit)}")
+                if mysql_conn.sql_mode is not None:
+                    cursor.execute("SET sql_mode = %s", (mysql_conn.sql_mode,))
+                if mysql_conn.init_command is not None:
+                    cursor.execute(mysql_conn.init_command)
+            mysql_conn.autocommit_mode = autocommit  # type: ignore
+        except MySQLError:
+            # connection got lost, or server doesn't know the command
+            if mysql_conn.open:
+                self.supported = False
+                mysql_conn.close()
+            return False
+        return True
+
+    def release(self, mysql_conn: Connection) -> None:
+        """Keep connection for later tests, or close it if the pool is full."""
+        if mysql_conn.open:
+            with self._lock:
+                kwargs = self._kwargs.get(mysql_conn)
+                if (
+                    kwargs is not None
+                    and self.supported
+                    and not self._closed
+                    and len(self._idle) < self.size
+                ):
+                    self._idle.append((kwargs, mysql_conn))
+                    return
+            mysql_conn.close()
+
+    def close(self) -> None:
+        """Close idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._closed = True
+        for _, mysql_conn in idle:
+            if mysql_conn.open:
+                mysql_conn.close()
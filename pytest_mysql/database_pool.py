@@ -0,0 +1,106 @@
+"""Pool of databases created ahead of time."""
+
+import itertools
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class DatabasePool:
+    """Databases created in the background, and dropped in the background after use.
+
+    Producer thread keeps up to ``size`` databases ready to be handed out,
+    creating the next one only once one of them has been taken,
+    while reaper thread drops databases that were released.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        size: int,
+        create: Callable[[str], None],
+        drop: Callable[[str], None],
+    ) -> None:
+        """Initialize database pool.
+
+        :param prefix: database name prefix
+        :param size: number of databases kept ready
+        :param create: callable creating the database of a given name.
+            It's called from producer thread.
+        :param drop: callable dropping the database of a given name.
+            It's called from reaper thread.
+        """
+        self.prefix = prefix
+        self.create = create
+        self.drop = drop
+        self._counter = itertools.count()
+        self._ready: "queue.Queue[str]" = queue.Queue()
+        # slots for databases that are created, or being created, and not taken yet
+        self._slots = threading.Semaphore(size)
+        self._released: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._closing = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._producer = threading.Thread(target=self._produce, daemon=True)
+        self._reaper = threading.Thread(target=self._reap, daemon=True)
+
+    def next_name(self) -> str:
+        """Return unique database name."""
+        return f"{self.prefix}_pool{next(self._counter)}"
+
+    def start(self, *ready: str) -> None:
+        """Start producer and reaper threads.
+
+        :param ready: names of databases that have already been created.
+        """
+        for dbname in ready:
+            self._slots.acquire(blocking=False)
+            self._ready.put_nowait(dbname)
+        self._producer.start()
+        self._reaper.start()
+
+    def get(self) -> str:
+        """Get the name of the database ready to be used."""
+        while True:
+            try:
+                dbname = self._ready.get(timeout=0.1)
+                self._slots.release()
+                return dbname
+            except queue.Empty:
+                if self._error:
+                    raise self._error
+                if not self._producer.is_alive():
+                    raise RuntimeError("Database pool has been closed.")
+
+    def release(self, dbname: str) -> None:
+        """Hand used database over to be dropped in the background."""
+        self._released.put(dbname)
+
+    def close(self) -> None:
+        """Stop producing databases, and drop all of them."""
+        self._closing.set()
+        self._producer.join()
+        while not self._ready.empty():
+            self._released.put(self._ready.get_nowait())
+        self._released.put(None)
+        self._reaper.join()
+
+    def _produce(self) -> None:
+        try:
+            while not self._closing.is_set():
+                if not self._slots.acquire(timeout=0.1):
+                    continue
+                dbname = self.next_name()
+                self.create(dbname)
+                self._ready.put(dbname)
+        except BaseException as e:
+            self._error = e
+
+    def _reap(self) -> None:
+        while True:
+            dbname = self._released.get()
+            if dbname is None:
+                return
+            try:
+                self.drop(dbname)
+            except Exception as e:
+                print(str(e))
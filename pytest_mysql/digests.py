@@ -0,0 +1,150 @@
+"""Profiling statements run by the test, by their digests."""
+
+import threading
+from typing import Dict, List, NamedTuple
+
+from pymysql import Connection
+
+# performance schema's timers count picoseconds
+PICOSECONDS = 10**12
+
+
+class DigestStats(NamedTuple):
+    """Statistics of statements sharing the same digest."""
+
+    digest: str
+    text: str
+    calls: int
+    latency: float
+    rows_examined: int
+    rows_sent: int
+
+    def plus(self, other: "DigestStats") -> "DigestStats":
+        """Sum statistics of the same digest."""
+        return self._combine(other, 1)
+
+    def minus(self, other: "DigestStats") -> "DigestStats":
+        """Subtract earlier statistics of the same digest."""
+        return self._combine(other, -1)
+
+    def _combine(self, other: "DigestStats", sign: int) -> "DigestStats":
+        return self._replace(
+            calls=self.calls + sign * other.calls,
+            latency=self.latency + sign * other.latency,
+            rows_examined=self.rows_examined + sign * other.rows_examined,
+            rows_sent=self.rows_sent + sign * other.rows_sent,
+        )
+
+
+class StatementDigests:
+    """Snapshot ``events_statements_summary_by_digest`` of the test database.
+
+    Statements run by the test are the difference in between snapshots
+    taken before and after it.
+    """
+
+    def __init__(self, connection: Connection, dbname: str) -> None:
+        """Prepare connection for taking snapshots.
+
+        :param connection: connection used to take snapshots,
+            not the one used by the test.
+        :param dbname: database the test's statements run in
+        """
+        self.connection = connection
+        self.dbname = dbname
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@performance_schema")
+            self.enabled = bool(cursor.fetchone()[0])
+
+    def snapshot(self) -> Dict[str, DigestStats]:
+        """Read statistics of statements run in the database so far."""
+        if not self.enabled:
+            return {}
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT DIGEST, DIGEST_TEXT, COUNT_STAR, SUM_TIMER_WAIT, "
+                "SUM_ROWS_EXAMINED, SUM_ROWS_SENT "
+                "FROM performance_schema.events_statements_summary_by_digest "
+                "WHERE SCHEMA_NAME = %s AND DIGEST IS NOT NULL",
+                (self.dbname,),
+            )
+            return {
+                digest: DigestStats(digest, text or "", calls, wait / PICOSECONDS, examined, sent)
+                for digest, text, calls, wait, examined, sent in cursor.fetchall()
+            }
+
+    @staticmethod
+    def delta(before: Dict[str, DigestStats], after: Dict[str, DigestStats]) -> List[DigestStats]:
+        """Return statistics of statements run in between snapshots."""
+        changes = []
+        for digest, stats in after.items():
+            previous = before.get(digest)
+            if previous is None:
+                changes.append(stats)
+            elif stats.calls > previous.calls:
+                changes.append(stats.minus(previous))
+        return changes
+
+
+def top(digests: List[DigestStats], limit: int) -> List[DigestStats]:
+    """Return most expensive digests by total latency, rows examined and rows sent.
+
+    :param digests: digests' statistics
+    :param limit: number of digests taken by each of the measures
+    :returns: digests that are among the top ones by any measure, ordered by latency
+    """
+    selected: Dict[str, DigestStats] = {}
+    for measure in ("latency", "rows_examined", "rows_sent"):
+        ranked = sorted(digests, key=lambda stats: getattr(stats, measure), reverse=True)
+        selected.update((stats.digest, stats) for stats in ranked[:limit])
+    return sorted(selected.values(), key=lambda stats: stats.latency, reverse=True)
+
+
+def format_digests(digests: List[DigestStats], text_width: int = 80) -> List[str]:
+    """Format digests' statistics as table lines, with latency in milliseconds."""
+    header = ("calls", "latency", "examined", "sent", "statement")
+    rows = [
+        (
+            str(stats.calls),
+            f"{stats.latency * 1000:.1f}",
+            str(stats.rows_examined),
+            str(stats.rows_sent),
+            stats.text[:text_width],
+        )
+        for stats in digests
+    ]
+    widths = [max(len(row[column]) for row in [header, *rows]) for column in range(4)]
+    return [
+        "  ".join([*(cell.rjust(width) for cell, width in zip(row[:4], widths)), row[4]])
+        for row in [header, *rows]
+    ]
+
+
+class DigestSummary:
+    """Statement digests' statistics summed across the test session."""
+
+    def __init__(self) -> None:
+        """Initialize empty summary."""
+        self._digests: Dict[str, DigestStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, digests: List[DigestStats]) -> None:
+        """Add statistics of statements run by the test."""
+        with self._lock:
+            for stats in digests:
+                previous = self._digests.get(stats.digest)
+                self._digests[stats.digest] = previous.plus(stats) if previous else stats
+
+    def clear(self) -> None:
+        """Remove all recorded statistics."""
+        with self._lock:
+            self._digests.clear()
+
+    def top(self, limit: int) -> List[DigestStats]:
+        """Return most expensive digests of the session, see :func:`top`."""
+        with self._lock:
+            digests = list(self._digests.values())
+        return top(digests, limit)
+
+
+digest_summary = DigestSummary()
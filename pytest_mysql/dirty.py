@@ -0,0 +1,141 @@
+"""Detecting tables modified by the test."""
+
+from datetime import datetime
+from typing import Any, Dict, Literal, NamedTuple, Set, Tuple
+
+from pymysql import Connection, MySQLError
+
+TrackingType = Literal["performance_schema", "update_time", "checksum"]
+
+TableState = Tuple[Any, ...]
+
+
+class Snapshot(NamedTuple):
+    """State of database's tables at a given time."""
+
+    taken_at: datetime
+    tables: Dict[str, TableState]
+    # (parent, child) tables of foreign keys changing child's rows along with parent's ones
+    cascades: Tuple[Tuple[str, str], ...] = ()
+
+
+class DirtyTables:
+    """Snapshot tables' state to find ones modified in between snapshots.
+
+    Table's state consists of its definition fingerprint (creation time,
+    auto increment and columns) and a marker changing along with the data:
+
+    * ``performance_schema`` - number of rows written,
+      read from ``table_io_waits_summary_by_table``.
+      Falls back to ``checksum``, if performance schema is disabled.
+    * ``update_time`` - ``information_schema.TABLES.UPDATE_TIME``.
+      It has one second resolution, so tables updated in the second
+      the first snapshot was taken in are always treated as modified.
+    * ``checksum`` - ``CHECKSUM TABLE`` result. Exact, but it reads all the data.
+
+    Rows changed by foreign keys' ``CASCADE`` or ``SET NULL`` actions
+    don't change ``performance_schema`` or ``update_time`` markers,
+    so with these methods tables referencing modified tables through such
+    foreign keys are treated as modified as well.
+    """
+
+    def __init__(self, connection: Connection, dbname: str, tracking: TrackingType) -> None:
+        """Prepare connection for taking snapshots.
+
+        :param connection: connection used to take snapshots,
+            not the one used by the test.
+        :param dbname: tracked database
+        :param tracking: method detecting data modifications
+        """
+        self.connection = connection
+        self.dbname = dbname
+        self.tracking = tracking
+        with connection.cursor() as cursor:
+            try:
+                # MySQL 8 caches table statistics in information_schema by default
+                cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+            except MySQLError:
+                pass
+            if tracking == "performance_schema":
+                cursor.execute("SELECT @@performance_schema")
+                if not cursor.fetchone()[0]:
+                    self.tracking = "checksum"
+
+    def snapshot(self) -> Snapshot:
+        """Read current state of all database's tables."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT t.TABLE_NAME, t.CREATE_TIME, t.AUTO_INCREMENT, t.UPDATE_TIME, "
+                "GROUP_CONCAT(c.COLUMN_NAME, ' ', c.COLUMN_TYPE ORDER BY c.ORDINAL_POSITION) "
+                "FROM information_schema.TABLES t JOIN information_schema.COLUMNS c "
+                "ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME "
+                "WHERE t.TABLE_SCHEMA = %s AND t.TABLE_TYPE = 'BASE TABLE' "
+                "GROUP BY t.TABLE_NAME, t.CREATE_TIME, t.AUTO_INCREMENT, t.UPDATE_TIME",
+                (self.dbname,),
+            )
+            tables = cursor.fetchall()
+            cursor.execute("SELECT NOW()")
+            taken_at = cursor.fetchone()[0]
+            markers: Dict[str, Any] = {}
+            if self.tracking == "performance_schema":
+                cursor.execute(
+                    "SELECT OBJECT_NAME, COUNT_WRITE "
+                    "FROM performance_schema.table_io_waits_summary_by_table "
+                    "WHERE OBJECT_TYPE = 'TABLE' AND OBJECT_SCHEMA = %s",
+                    (self.dbname,),
+                )
+                markers = dict(cursor.fetchall())
+            elif self.tracking == "update_time":
+                markers = {table: update_time for table, _, _, update_time, _ in tables}
+            elif tables:
+                table_list = ", ".join(f"`{self.dbname}`.`{table[0]}`" for table in tables)
+                cursor.execute(f"CHECKSUM TABLE {table_list}")
+                markers = {
+                    name[len(self.dbname) + 1 :]: checksum for name, checksum in cursor.fetchall()
+                }
+            cascades: Tuple[Tuple[str, str], ...] = ()
+            if self.tracking != "checksum":
+                cursor.execute(
+                    "SELECT REFERENCED_TABLE_NAME, TABLE_NAME "
+                    "FROM information_schema.REFERENTIAL_CONSTRAINTS "
+                    "WHERE CONSTRAINT_SCHEMA = %s AND UNIQUE_CONSTRAINT_SCHEMA = %s "
+                    "AND (DELETE_RULE IN ('CASCADE', 'SET NULL', 'SET DEFAULT') "
+                    "OR UPDATE_RULE IN ('CASCADE', 'SET NULL', 'SET DEFAULT'))",
+                    (self.dbname, self.dbname),
+                )
+                cascades = tuple(cursor.fetchall())
+        return Snapshot(
+            taken_at,
+            {
+                table: (create_time, auto_increment, columns, markers.get(table))
+                for table, create_time, auto_increment, _, columns in tables
+            },
+            cascades,
+        )
+
+    def modified(self, before: Snapshot, after: Snapshot) -> Tuple[Set[str], Set[str]]:
+        """Compare snapshots.
+
+        :returns: tables that were modified or removed,
+            and tables that were created in between the snapshots.
+        """
+        modified = {
+            table for table, state in before.tables.items() if after.tables.get(table) != state
+        }
+        if self.tracking == "update_time":
+            # updated in the same second the first snapshot was taken in
+            modified.update(
+                table
+                for table, state in after.tables.items()
+                if state[-1] is not None and state[-1] >= before.taken_at
+            )
+        # rows changed by foreign keys' actions, along with the modified tables
+        cascades = set(before.cascades) | set(after.cascades)
+        children = modified
+        while children:
+            children = {
+                child for parent, child in cascades if parent in children and child not in modified
+            }
+            modified |= children
+        created = set(after.tables) - set(before.tables)
+        return modified - created, created
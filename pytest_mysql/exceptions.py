@@ -24,5 +24,13 @@ class SocketPathTooLong(PytestMySQLException):
     """
 
 
+class NotEnoughSpace(PytestMySQLException):
+    """Raised when there's not enough free space to place MySQL's data directory in."""
+
+
 class DatabaseExists(PytestMySQLException):
     """Raise this exception, when the database already exists."""
+
+
+class QueryBudgetExceeded(PytestMySQLException, AssertionError):
+    """Raised when statements run within query budget exceed its limits."""
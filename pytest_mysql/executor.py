@@ -1,19 +1,54 @@
 """Specified MySQL Executor."""
 
+import os
 import platform
 import re
+import shlex
+import shutil
+import signal
+import socket
 import subprocess
+import time
 from pathlib import Path
-from typing import Any, Literal, Optional, Union
+from tempfile import mkdtemp
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from mirakuru import TCPExecutor
+from mirakuru.base import ENV_UUID, SimpleExecutor
+from mirakuru.exceptions import AlreadyRunning
 from packaging.version import parse
+from pymysql import Connection, MySQLError, OperationalError
 
+from pytest_mysql.cache import DatadirCache, SchemaCache, VersionCache
 from pytest_mysql.exceptions import (
     MySQLUnsupported,
+    NotEnoughSpace,
     SocketPathTooLong,
     VersionNotDetected,
 )
+from pytest_mysql.loader import LoadType, build_loader
+from pytest_mysql.profiles import ProfileType, profile_params
+from pytest_mysql.timing import timings
+
+ReadinessType = Literal["tcp", "log", "socket"]
+LauncherType = Literal["mysqld_safe", "mysqld"]
+
+# mysqld --version outputs detected in this process, keyed by VersionCache.key
+_version_outputs: Dict[str, str] = {}
+
+
+def handshake_received(unixsocket: str) -> bool:
+    """Check whether the server sends protocol handshake through the unix socket."""
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.settimeout(1)
+        try:
+            sock.connect(unixsocket)
+            # packet header, and the first byte of the payload
+            packet = sock.recv(5, socket.MSG_WAITALL)
+        except OSError:
+            return False
+    # handshake starts with protocol version 10, error packets with 0xff
+    return len(packet) == 5 and packet[4] == 10
 
 
 class MySQLExecutor(TCPExecutor):
@@ -21,6 +56,10 @@ class MySQLExecutor(TCPExecutor):
 
     VERSION_RE = re.compile(r"(?:[a-z_ ]+)(Ver)? (?P<version>[\d.]+).*", re.I)
     IMPLEMENTATION_RE = re.compile(r".*MariaDB.*")
+    # X Plugin's "ready for connections" line comes before the server is ready
+    READY_RE = re.compile(rb": ready for connections")
+    # free space required on memory-backed filesystem to place datadir on
+    TMPFS_MIN_FREE = 256 * 1024 * 1024
 
     def __init__(
         self,
@@ -35,6 +74,14 @@ class MySQLExecutor(TCPExecutor):
         port: int,
         timeout: int = 60,
         install_db: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        tmpfs_path: Optional[Path] = None,
+        profile: Optional[ProfileType] = None,
+        readiness: ReadinessType = "tcp",
+        launcher: LauncherType = "mysqld_safe",
+        detached: bool = False,
+        schema: Optional[List[LoadType]] = None,
+        schema_files: Optional[List[Path]] = None,
     ) -> None:
         """Specialised Executor to run and manage MySQL server process.
 
@@ -50,35 +97,141 @@ class MySQLExecutor(TCPExecutor):
         :param port: server's port
         :param timeout: executor's timeout for start and stop actions
         :param install_db:
+        :param cache_dir: directory to keep initialised data directories in,
+            and reuse them instead of initialising new ones
+        :param tmpfs_path: memory-backed filesystem path (like ``/dev/shm``)
+            to place database files and temporary files in,
+            instead of base_directory.
+        :param profile: tuning profile adding parameters suitable for
+            detected server's version, see :func:`pytest_mysql.profiles.profile_params`
+        :param readiness: how to detect that the server is ready:
+            ``tcp`` - port accepts connections,
+            ``log`` - server logged that it's ready for connections,
+            ``socket`` - server sends handshake through the unix socket.
+        :param launcher: ``mysqld_safe`` starts the server through mysqld_safe wrapper,
+            ``mysqld`` runs mysqld directly, and stops it with a signal.
+        :param detached: start the server so it can be left running
+            after the executor is gone, see :meth:`detach`.
+        :param schema: sql files, import paths or callables loading the schema
+            (or running migrations) into the new server. Callables receive pymysql's
+            connection keyword arguments. With cache_dir, data directory with
+            the schema loaded is kept there, and restored by the following starts.
+        :param schema_files: files or directories the schema loaders read,
+            the snapshot gets invalidated when their contents change.
         """
         self.mysqld_safe = mysqld_safe
         self.mysqld = mysqld
         self.install_db = install_db
         self.admin_exec = admin_exec
         self.base_directory = base_directory
-        self.datadir = self.base_directory / f"mysqldata_{port}"
+        self.tmpfs_directory: Optional[Path] = None
+        data_directory = self.tmpdir = self.base_directory
+        if tmpfs_path:
+            free_space = shutil.disk_usage(tmpfs_path).free
+            if free_space < self.TMPFS_MIN_FREE:
+                raise NotEnoughSpace(
+                    f"Only {free_space // 2**20}MB is free in {tmpfs_path}, "
+                    f"at least {self.TMPFS_MIN_FREE // 2**20}MB is needed for data directory."
+                )
+            self.tmpfs_directory = Path(mkdtemp(prefix=f"pytest-mysql-{port}-", dir=tmpfs_path))
+            data_directory = self.tmpfs_directory
+            self.tmpdir = self.tmpfs_directory / "tmp"
+            self.tmpdir.mkdir()
+        self.datadir = data_directory / f"mysqldata_{port}"
         self.datadir.mkdir()
         self.pidfile = self.base_directory / f"mysql-server.{port}.pid"
         self.unixsocket = str(self.base_directory / f"mysql.{port}.sock")
         self.logfile_path = logfile_path
         self.user = user
+        self.params = params
+        self.profile = profile
+        self.datadir_cache = DatadirCache(cache_dir) if cache_dir else None
+        self.version_cache = VersionCache(cache_dir) if cache_dir else None
+        self.schema = schema or []
+        self.schema_files = schema_files or []
+        self.schema_cache = SchemaCache(cache_dir) if cache_dir and self.schema else None
+        self._schema_key: Optional[str] = None
+        self._schema_loaded = False
+        self._version_output: Optional[str] = None
+        self.readiness = readiness
+        self._log_offset = 0
+        self.launcher = launcher
+        self.detached = detached
+        # server shared between pytest-xdist workers
+        self.shared = False
+        # name phases' timings are recorded under
+        self.fixturename = "mysql_proc"
         self._initialised = False
-        command = (
-            f"{self.mysqld_safe} "
+        self._base_command = (
+            f"{self.mysqld_safe if launcher == 'mysqld_safe' else self.mysqld} "
             f"--datadir={self.datadir} "
             f"--pid-file={self.pidfile} "
             f"--port={port} "
             f"--user={self.user} "
             f"--socket={self.unixsocket} "
             f"--log-error={self.logfile_path} "
-            f"--tmpdir={self.base_directory} "
-            f"--skip-syslog {params}"
+            f"--tmpdir={self.tmpdir}"
         )
-        super().__init__(command, host, port, timeout=timeout)
+        if launcher == "mysqld_safe":
+            self._base_command += " --skip-syslog"
+        command = f"{self._base_command} {params}"
+        # log and socket checks are cheap, and positive only once server is usable
+        sleep = 0.1 if readiness == "tcp" else 0.01
+        if detached:
+            # detached server must not write to pipes of the process that's gone
+            super().__init__(
+                command,
+                host,
+                port,
+                timeout=timeout,
+                sleep=sleep,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            super().__init__(command, host, port, timeout=timeout, sleep=sleep)
+
+    @property
+    def envvars(self) -> Dict[str, str]:
+        """Environment variables, without mirakuru's mark for detached server.
+
+        mirakuru kills processes carrying its mark on interpreter's exit.
+        """
+        envs = super().envvars
+        if self.detached:
+            envs.pop(ENV_UUID)
+        return envs
+
+    def detach(self) -> None:
+        """Leave the server running after the executor is gone."""
+        # mirakuru kills the process it still holds on executor's deletion
+        self.process = None
+
+    def version_output(self) -> str:
+        """Run ``mysqld --version`` once, and reuse its output.
+
+        Output is shared by executors using the same binary,
+        and kept in the cache directory in between test runs, if configured.
+        """
+        if self._version_output is not None:
+            return self._version_output
+        key = VersionCache.key(self.mysqld)
+        version_output = _version_outputs.get(key) if key else None
+        if version_output is None and key and self.version_cache:
+            version_output = self.version_cache.get(key)
+        if version_output is None:
+            with timings.measure(self.fixturename, "version detection"):
+                version_output = subprocess.check_output([self.mysqld, "--version"]).decode("utf-8")
+            if key and self.version_cache:
+                self.version_cache.store(key, version_output)
+        if key:
+            _version_outputs[key] = version_output
+        self._version_output = version_output
+        return version_output
 
     def version(self) -> str:
         """Read MySQL's version."""
-        version_output = subprocess.check_output([self.mysqld, "--version"]).decode("utf-8")
+        version_output = self.version_output()
         matches = self.VERSION_RE.search(version_output)
         if not matches:
             raise VersionNotDetected(version_output)
@@ -86,7 +239,7 @@ class MySQLExecutor(TCPExecutor):
 
     def implementation(self) -> Union[Literal["mariadb"], Literal["mysql"]]:
         """Detect MySQL Implementation."""
-        version_output = subprocess.check_output([self.mysqld, "--version"]).decode("utf-8")
+        version_output = self.version_output()
         if self.IMPLEMENTATION_RE.search(version_output):
             return "mariadb"
         return "mysql"
@@ -107,11 +260,10 @@ class MySQLExecutor(TCPExecutor):
             return
         init_command = (
             f"{self.mysqld} --initialize-insecure "
-            f"--datadir={self.datadir} --tmpdir={self.base_directory} "
+            f"--datadir={self.datadir} --tmpdir={self.tmpdir} "
             f"--log-error={self.logfile_path}"
         )
-        subprocess.check_output(init_command, shell=True)
-        self._initialised = True
+        self._initialise_datadir(init_command, "--initialize-insecure")
 
     def initialise_mysql_db_install(self) -> None:
         """Initialise mysql directory for older MySQL installations or MariaDB.
@@ -129,9 +281,40 @@ class MySQLExecutor(TCPExecutor):
             return
         init_command = (
             f"{self.install_db} --user={self.user} "
-            f"--datadir={self.datadir} --tmpdir={self.base_directory}"
+            f"--datadir={self.datadir} --tmpdir={self.tmpdir}"
+        )
+        self._initialise_datadir(init_command, f"{self.install_db} --user={self.user}")
+
+    def _initialise_datadir(self, init_command: str, init_flags: str) -> None:
+        """Run datadir initialisation, or copy it from the cache if possible.
+
+        :param init_command: command initialising datadir
+        :param init_flags: part of init_command identifying the way
+            datadir gets initialised.
+        """
+        with timings.measure(self.fixturename, "datadir init"):
+            self._initialise_or_restore_datadir(init_command, init_flags)
+
+    def _initialise_or_restore_datadir(self, init_command: str, init_flags: str) -> None:
+        if not self.datadir_cache:
+            subprocess.check_output(init_command, shell=True)
+            self._initialised = True
+            return
+
+        cache_key = self.datadir_cache.key(
+            self.mysqld, self.version(), self.implementation(), init_flags
         )
-        subprocess.check_output(init_command, shell=True)
+        if self.schema_cache:
+            self._schema_key = self.schema_cache.snapshot_key(
+                cache_key, SchemaCache.source_hash(self.schema, self.schema_files)
+            )
+            if self.schema_cache.restore(self._schema_key, self.datadir):
+                self._schema_loaded = True
+                self._initialised = True
+                return
+        if not self.datadir_cache.restore(cache_key, self.datadir):
+            subprocess.check_output(init_command, shell=True)
+            self.datadir_cache.store(cache_key, self.datadir)
         self._initialised = True
 
     def start(self) -> "MySQLExecutor":
@@ -148,10 +331,111 @@ class MySQLExecutor(TCPExecutor):
                 raise MySQLUnsupported("mysqld_init path is missing.")
         else:
             raise MySQLUnsupported("Only MySQL and MariaDB servers are supported with MariaDB.")
-        return super().start()
+        if self.profile:
+            # profile parameters go first, so they can be overridden with params
+            profile = " ".join(profile_params(self.profile, implementation, self.version()))
+            self.command = f"{self._base_command} {profile} {self.params}"
+            self.command_parts = shlex.split(self.command)
+        # only lines logged by this start count, log might be reused by restarts
+        try:
+            self._log_offset = os.path.getsize(self.logfile_path)
+        except OSError:
+            self._log_offset = 0
+        # mirakuru's start split into phases measured separately
+        with timings.measure(self.fixturename, "process start"):
+            if self.pre_start_check():
+                raise AlreadyRunning(self)
+            SimpleExecutor.start(self)
+        with timings.measure(self.fixturename, "readiness"):
+            self.wait_for(self.check_subprocess)
+        if self.schema and not self._schema_loaded:
+            self._load_schema()
+        return self
+
+    def _load_schema(self) -> None:
+        """Load schema into the started server, and keep data directory's snapshot.
+
+        Server gets restarted, so the snapshot is taken from cleanly shut down server.
+        """
+        connection_kwargs: Dict[str, Any] = {"unix_socket": self.unixsocket, "user": self.user}
+        try:
+            Connection(**connection_kwargs).close()
+        except OperationalError:
+            # Fallback to mysql connection with root user
+            connection_kwargs["user"] = "root"
+        with timings.measure(self.fixturename, "schema"):
+            for load in self.schema:
+                build_loader(load)(**connection_kwargs)
+        self._schema_loaded = True
+        if self.schema_cache and self._schema_key:
+            self.stop()
+            with timings.measure(self.fixturename, "schema snapshot"):
+                self.schema_cache.store(self._schema_key, self.datadir)
+            self.start()
+
+    def after_start_check(self) -> bool:
+        """Check whether the server is ready, using configured readiness detection."""
+        if self.readiness == "log":
+            return self._log_ready()
+        if self.readiness == "socket":
+            return self._socket_ready()
+        return super().after_start_check()
+
+    def _log_ready(self) -> bool:
+        try:
+            with open(self.logfile_path, "rb") as logfile:
+                logfile.seek(self._log_offset)
+                log = logfile.read()
+        except FileNotFoundError:
+            return False
+        if self.READY_RE.search(log):
+            return True
+        # skip complete lines on the next check
+        self._log_offset += log.rfind(b"\n") + 1
+        return False
+
+    def _socket_ready(self) -> bool:
+        return handshake_received(self.unixsocket)
 
     def shutdown(self) -> None:
-        """Send shutdown command to the server."""
+        """Shut the server down, and wait until it exits.
+
+        ``SHUTDOWN`` statement is sent through the unix socket,
+        falling back to mysqladmin if it can't be (MySQL before 5.7.9).
+        Server is sent SIGTERM, if it's still running after the timeout.
+        """
+        pid = self.read_pid()
+        try:
+            self._shutdown_statement()
+        except MySQLError:
+            self._admin_shutdown()
+        if self._wait_for_pidfile_removal() or pid is None:
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _shutdown_statement(self) -> None:
+        """Send SHUTDOWN statement, as configured user or as root."""
+        try:
+            self._shutdown_as(self.user)
+        except MySQLError:
+            # Fallback to using root user for shutdown,
+            # user without SHUTDOWN privilege gets an InternalError (1227)
+            self._shutdown_as("root")
+
+    def _shutdown_as(self, user: str) -> None:
+        """Send SHUTDOWN statement as given user, closing the connection afterwards."""
+        mysql_conn = Connection(unix_socket=self.unixsocket, user=user)
+        try:
+            mysql_conn.query("SHUTDOWN")
+        finally:
+            if mysql_conn.open:
+                mysql_conn.close()
+
+    def _admin_shutdown(self) -> None:
+        """Send shutdown command through mysqladmin."""
         shutdown_command = (
             f"{self.admin_exec} --socket={self.unixsocket} " f"--user={self.user} shutdown"
         )
@@ -164,10 +448,38 @@ class MySQLExecutor(TCPExecutor):
             )
             subprocess.check_output(shutdown_command, shell=True)
 
+    def read_pid(self) -> Optional[int]:
+        """Read server's pid from its pidfile."""
+        try:
+            return int(self.pidfile.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _wait_for_pidfile_removal(self) -> bool:
+        """Wait until server removes its pidfile on exit.
+
+        :returns: False if pidfile is still there after the timeout.
+        """
+        deadline = time.monotonic() + self._timeout if self._timeout else None
+        while self.pidfile.exists():
+            if deadline and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
     def stop(self, *args: Any, **kwargs: Any) -> "MySQLExecutor":
         """Stop the server."""
-        self.shutdown()
-        return super().stop(*args, **kwargs)
+        with timings.measure(self.fixturename, "shutdown"):
+            # mysqld started directly shuts down cleanly on SIGTERM sent by mirakuru
+            if self.launcher == "mysqld_safe":
+                self.shutdown()
+            return super().stop(*args, **kwargs)
+
+    def remove_tmpfs_directory(self) -> None:
+        """Remove database files from memory-backed filesystem."""
+        if self.tmpfs_directory:
+            shutil.rmtree(self.tmpfs_directory, ignore_errors=True)
+            self.tmpfs_directory = None
 
     def _check_socket_path(self) -> None:
         if platform.system() in ["Darwin", "FreeBSD]"] and len(self.unixsocket) > 103:
@@ -1,6 +1,6 @@
 """Module containing Noop executor."""
 
-from typing import Any, Literal
+from typing import Any, Literal, Optional
 
 
 class NoopMySQLExecutor:
@@ -14,12 +14,15 @@ class NoopMySQLExecutor:
         user: str,
         host: str,
         port: int,
+        unixsocket: Optional[str] = None,
     ) -> None:
         """Initialize NoopMySQLExecutor."""
         self.user = user
         self.host = host
         self.port = port
-        self.unixsocket = None
+        self.unixsocket = unixsocket
+        # server shared between pytest-xdist workers
+        self.shared = False
 
     def running(self) -> Literal[True]:
         """Check if process is running."""
@@ -1,7 +1,17 @@
 """Factories module."""
 
+from pytest_mysql.factories.async_client import mysql_async
 from pytest_mysql.factories.client import mysql
+from pytest_mysql.factories.group import mysql_proc_group
 from pytest_mysql.factories.noprocess import mysql_noproc
 from pytest_mysql.factories.process import mysql_proc
+from pytest_mysql.factories.readonly import mysql_readonly
 
-__all__ = ("mysql", "mysql_proc", "mysql_noproc")
+__all__ = (
+    "mysql",
+    "mysql_async",
+    "mysql_proc",
+    "mysql_noproc",
+    "mysql_proc_group",
+    "mysql_readonly",
+)
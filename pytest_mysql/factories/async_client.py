@@ -0,0 +1,156 @@
+# Copyright (C) 2013 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of pytest-mysql.
+
+# pytest-mysql is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# pytest-mysql is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytest-mysql.  If not, see <http://www.gnu.org/licenses/>.
+"""Asyncio client fixture factory for MySQL database, using aiomysql."""
+
+import asyncio
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Union
+
+import pytest
+from pytest import FixtureRequest
+
+from pytest_mysql import prewarm
+from pytest_mysql.config import get_config
+from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.executor_noop import NoopMySQLExecutor
+from pytest_mysql.loader import LoadType, build_loader
+from pytest_mysql.timing import timings
+
+
+def _async_fixture() -> Callable[..., Any]:
+    """Return decorator for async fixtures, of the plugin running them."""
+    try:
+        import pytest_asyncio
+    except ImportError:
+        # anyio's pytest plugin, or pytest-asyncio in auto mode run plain async fixtures
+        return pytest.fixture
+    return pytest_asyncio.fixture  # type: ignore[no-any-return]
+
+
+def mysql_async(
+    process_fixture_name: str,
+    passwd: Optional[str] = None,
+    dbname: Optional[str] = None,
+    charset: str = "utf8",
+    collation: str = "utf8_general_ci",
+    load: Optional[List[LoadType]] = None,
+    pool_size: int = 5,
+) -> Callable[[FixtureRequest], Any]:
+    """Asyncio client fixture factory for MySQL server.
+
+    Fixture returns ``aiomysql`` pool of connections to the test database,
+    so that tests can run many queries concurrently. Requires ``aiomysql``
+    (``pip install pytest-mysql[async]``), and an asyncio pytest plugin
+    (like ``pytest-asyncio``) to run the fixture.
+
+    :param process_fixture_name: process fixture name, its executor is shared
+        with the synchronous client fixtures
+    :param passwd: mysql server's password
+    :param dbname: database's name
+    :param charset: MySQL characterset to use by default for the database
+    :param collation: MySQL collation to use by default for the database
+    :param load: sql files, import paths or callables loading data into the database.
+        Callables receive pymysql's connection keyword arguments.
+    :param pool_size: number of connections in the pool, all of them opened up front
+    :returns: function ``mysql_async_fixture`` with function scope
+    """
+    try:
+        import aiomysql
+    except ImportError as e:
+        raise ImportError("mysql_async requires aiomysql: pip install pytest-mysql[async]") from e
+
+    loaders = [build_loader(load_element) for load_element in load or []]
+
+    def _load(mysql_db: str, connection_kwargs: Dict[str, Any]) -> None:
+        for loader in loaders:
+            loader(db=mysql_db, **connection_kwargs)
+
+    async def _close_pool(pool: Any) -> None:
+        # test has finished, even if it didn't release the connections it acquired
+        pool.terminate()
+        await pool.wait_closed()
+
+    async def mysql_async_fixture(request: FixtureRequest) -> AsyncGenerator[Any, None]:
+        """Asyncio client fixture for MySQL server.
+
+        #. Create the database, then load data while the pool's connections are being opened.
+        #. Yield the pool of connections to the database.
+        #. Close the pool, while the database is being dropped.
+
+        :param request: fixture request object
+        :returns: ``aiomysql.Pool`` of connections to the test database
+        """
+        config = get_config(request)
+        fixturename = str(request.fixturename)
+        process: Union[NoopMySQLExecutor, MySQLExecutor] = request.getfixturevalue(
+            process_fixture_name
+        )
+        if not process.running():
+            process.start()
+
+        mysql_db = dbname or config["dbname"]
+        worker_input = getattr(request.config, "workerinput", None)
+        if process.shared and worker_input:
+            # every pytest-xdist worker needs its own database on the shared server
+            mysql_db = f"{mysql_db}_{worker_input['workerid']}"
+
+        connection_kwargs: Dict[str, Any] = {
+            "host": process.host,
+            "user": process.user,
+            "password": passwd or config["passwd"],
+        }
+        if process.unixsocket:
+            connection_kwargs["unix_socket"] = process.unixsocket
+        else:
+            connection_kwargs["port"] = process.port
+
+        with timings.measure(fixturename, "create database"):
+            try:
+                admin_conn = await aiomysql.connect(**connection_kwargs)
+            except aiomysql.OperationalError:
+                # Fallback to mysql connection with root user
+                connection_kwargs["user"] = "root"
+                admin_conn = await aiomysql.connect(**connection_kwargs)
+            async with admin_conn.cursor() as cursor:
+                await cursor.execute(
+                    f"CREATE DATABASE `{mysql_db}` "
+                    f"DEFAULT CHARACTER SET {charset} "
+                    f"DEFAULT COLLATE {collation}"
+                )
+        with timings.measure(fixturename, "load data"):
+            pool, _ = await asyncio.gather(
+                aiomysql.create_pool(
+                    minsize=pool_size,
+                    maxsize=pool_size,
+                    db=mysql_db,
+                    autocommit=True,
+                    **connection_kwargs,
+                ),
+                asyncio.to_thread(_load, mysql_db, connection_kwargs),
+            )
+        yield pool
+
+        with timings.measure(fixturename, "drop database"):
+            async with admin_conn.cursor() as cursor:
+                await asyncio.gather(
+                    _close_pool(pool), cursor.execute(f"DROP DATABASE IF EXISTS `{mysql_db}`")
+                )
+            admin_conn.close()
+
+    fixture: Callable[[FixtureRequest], Any] = _async_fixture()(mysql_async_fixture)
+    prewarm.register_client(fixture, process_fixture_name)
+    return fixture
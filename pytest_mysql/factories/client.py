@@ -16,16 +16,27 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pytest-mysql.  If not, see <http://www.gnu.org/licenses/>.
 """Client fixture factory for MySQL database."""
-from typing import Any, Callable, Dict, Generator, Optional, Union
+from typing import Any, Callable, Dict, Generator, List, Literal, Optional, Union
+from warnings import warn
 
 import pytest
 from _pytest.fixtures import FixtureRequest
-from pymysql import Connection, OperationalError, ProgrammingError
+from pymysql import Connection, MySQLError, OperationalError, ProgrammingError
 
+from pytest_mysql import prewarm
 from pytest_mysql.config import get_config
+from pytest_mysql.connection_pool import ConnectionPool
+from pytest_mysql.database_pool import DatabasePool
+from pytest_mysql.digests import StatementDigests, format_digests, top
+from pytest_mysql.dirty import DirtyTables, TrackingType
 from pytest_mysql.exceptions import DatabaseExists
 from pytest_mysql.executor import MySQLExecutor
 from pytest_mysql.executor_noop import NoopMySQLExecutor
+from pytest_mysql.loader import LoadType, build_loader
+from pytest_mysql.status import delta, read_status, status_log
+from pytest_mysql.template import TemplateDatabase
+from pytest_mysql.timing import timings
+from pytest_mysql.transaction import TransactionalConnection
 
 
 def mysql(
@@ -34,6 +45,14 @@ def mysql(
     dbname: Optional[str] = None,
     charset: str = "utf8",
     collation: str = "utf8_general_ci",
+    isolation: Literal["database", "transaction", "tables"] = "database",
+    load: Optional[List[LoadType]] = None,
+    template: bool = False,
+    clone_workers: int = 4,
+    dirty_tracking: TrackingType = "performance_schema",
+    db_pool_size: Optional[int] = None,
+    digests: Optional[bool] = None,
+    status: Optional[bool] = None,
 ) -> Callable[[FixtureRequest], Any]:
     """Client fixture factory for MySQL server.
 
@@ -51,17 +70,74 @@ def mysql(
         for *tests* database
     :param str collation: MySQL collation to use by default
         for *tests* database
+    :param isolation: how tests are isolated from each other.
+        ``database`` creates the database before, and drops it after each test.
+        ``transaction`` creates the database once per session and rolls back
+        each test's transaction. Database gets recreated after the test
+        that run a statement causing an implicit commit (like DDL).
+        ``tables`` creates the database once per session, and after each test
+        restores only tables the test has modified from the template database.
+    :param load: sql files, import paths or callables loading data into
+        a newly created database. Callables receive pymysql's connection
+        keyword arguments.
+    :param template: load data once per session into the template database,
+        and clone it's tables into every newly created database.
+    :param clone_workers: maximum number of threads cloning template's tables
+    :param dirty_tracking: method detecting tables modified by the test
+        in ``tables`` isolation: ``performance_schema``, ``update_time``
+        or ``checksum``. See :class:`pytest_mysql.dirty.DirtyTables`.
+    :param db_pool_size: number of databases created ahead of time
+        in ``database`` isolation. Tests get databases from the pool,
+        and used databases get dropped in the background.
+    :param digests: profile statements run by each test with performance schema's
+        statement digests, and attach the most expensive ones to test's report.
+    :param status: record changes of server's and session's status counters
+        over each test, in test's report and ``mysql_status_json`` file.
 
     :returns: function ``mysql_fixture`` with suit scope
     :rtype: func
     """
+    loaders = [build_loader(load_element) for load_element in load or []]
+    # tables isolation restores modified tables from the template
+    use_template = template or isolation == "tables"
+    # connection arguments for databases kept for the whole session in transaction isolation
+    session_databases: Dict[int, Dict[str, Any]] = {}
+    templates: Dict[int, TemplateDatabase] = {}
+    pools: Dict[int, DatabasePool] = {}
+    connection_pools: Dict[int, ConnectionPool] = {}
+    # user that managed to connect and create the database, tried first by later tests
+    users: Dict[int, str] = {}
 
-    def _connect(connect_kwargs: Dict[str, Any], query_str: str, mysql_db: str) -> Connection:
+    def _get_connection_pool(
+        request: FixtureRequest, process: Union[NoopMySQLExecutor, MySQLExecutor]
+    ) -> ConnectionPool:
+        """Keep connections to the server open for the whole session."""
+        key = id(process)
+        if key not in connection_pools:
+            connection_pools[key] = ConnectionPool()
+
+            def close_connection_pool() -> None:
+                connection_pools.pop(key).close()
+
+            request.session.addfinalizer(close_connection_pool)
+        return connection_pools[key]
+
+    def _connect(
+        fixturename: str,
+        connections: ConnectionPool,
+        connect_kwargs: Dict[str, Any],
+        query_str: str,
+        mysql_db: str,
+    ) -> Connection:
         """Apply given query to a  given MySQLdb connection."""
-        mysql_conn = Connection(**connect_kwargs)
+        with timings.measure(fixturename, "connect"):
+            mysql_conn = connections.connect(connect_kwargs)
         try:
-            mysql_conn.query(query_str)
-        except ProgrammingError as e:
+            with timings.measure(fixturename, "create database"):
+                mysql_conn.query(query_str)
+        except (OperationalError, ProgrammingError) as e:
+            # connection might belong to the user, that isn't allowed to create databases
+            mysql_conn.close()
             if "database exists" in str(e):
                 raise DatabaseExists(
                     f"Database {mysql_db} already exists. There's some test "
@@ -73,6 +149,354 @@ def mysql(
             raise
         return mysql_conn
 
+    def _select_db(fixturename: str, mysql_conn: Connection, mysql_db: str) -> None:
+        """Switch connection to the database, keeping its name in connection's ``db``."""
+        with timings.measure(fixturename, "select database"):
+            mysql_conn.select_db(mysql_db)
+        # pymysql only sets it when connecting, wrappers find test's database by it
+        mysql_conn.db = mysql_db
+
+    def _create_query(mysql_db: str) -> str:
+        return (
+            f"CREATE DATABASE `{mysql_db}` "
+            f"DEFAULT CHARACTER SET {charset} "
+            f"DEFAULT COLLATE {collation}"
+        )
+
+    def _create_database(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Connection:
+        """Create and load the database, return connection using it."""
+        fixturename = str(request.fixturename)
+        connections = _get_connection_pool(request, process)
+        mysql_conn = _create_empty_database(
+            fixturename, connections, id(process), connection_kwargs, mysql_db
+        )
+        with timings.measure(fixturename, "load data"):
+            template_db = (
+                _get_template(request, process, connection_kwargs, mysql_db)
+                if use_template
+                else None
+            )
+            _load_database(connection_kwargs, mysql_db, template_db)
+        return mysql_conn
+
+    def _create_empty_database(
+        fixturename: str,
+        connections: ConnectionPool,
+        process_key: int,
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Connection:
+        """Create the database, return connection using it."""
+        query_str = _create_query(mysql_db)
+        try:
+            mysql_conn: Connection = _connect(
+                fixturename, connections, connection_kwargs, query_str, mysql_db
+            )
+        except OperationalError:
+            # Fallback to mysql connection with root user
+            connection_kwargs["user"] = "root"
+            mysql_conn = _connect(fixturename, connections, connection_kwargs, query_str, mysql_db)
+        # later tests connect as the user that succeeded right away
+        users[process_key] = connection_kwargs["user"]
+        _select_db(fixturename, mysql_conn, mysql_db)
+        return mysql_conn
+
+    def _load_database(
+        connection_kwargs: Dict[str, Any], mysql_db: str, template_db: Optional[TemplateDatabase]
+    ) -> None:
+        """Load data into the database, cloning it from the template if there's one."""
+        if template_db:
+            template_db.clone(mysql_db)
+        else:
+            for loader in loaders:
+                loader(db=mysql_db, **connection_kwargs)
+
+    def _get_template(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> TemplateDatabase:
+        """Create template database once per session, and drop it at the end of it."""
+        key = id(process)
+        if key not in templates:
+            template_db = f"{mysql_db}_template"
+            connections = _get_connection_pool(request, process)
+            connections.release(
+                _connect(
+                    str(request.fixturename),
+                    connections,
+                    connection_kwargs,
+                    _create_query(template_db),
+                    template_db,
+                )
+            )
+            for loader in loaders:
+                loader(db=template_db, **connection_kwargs)
+            templates[key] = TemplateDatabase(connection_kwargs, template_db, clone_workers)
+
+            def drop_template() -> None:
+                templates.pop(key).drop()
+
+            request.session.addfinalizer(drop_template)
+        return templates[key]
+
+    def _drop_database(
+        fixturename: str,
+        connections: ConnectionPool,
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> None:
+        with timings.measure(fixturename, "connect"):
+            mysql_conn = connections.connect(connection_kwargs)
+        with timings.measure(fixturename, "drop database"):
+            mysql_conn.query(f"DROP DATABASE IF EXISTS `{mysql_db}`")
+        connections.release(mysql_conn)
+
+    def _cleanup(mysql_conn: Connection) -> None:
+        """Clean up after test that forgot to fetch selected data."""
+        try:
+            with mysql_conn.cursor() as cursor:
+                cursor.fetchall()
+        except Exception as e:
+            print(str(e))
+
+    def _session_database(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Dict[str, Any]:
+        """Create the database once per session, and drop it at the end of it.
+
+        :returns: connection keyword arguments that were used to create the database
+        """
+        key = id(process)
+        if key not in session_databases:
+            connections = _get_connection_pool(request, process)
+            connections.release(_create_database(request, process, connection_kwargs, mysql_db))
+            session_databases[key] = connection_kwargs
+
+            def drop_session_database() -> None:
+                _drop_database(
+                    str(request.fixturename), connections, session_databases.pop(key), mysql_db
+                )
+
+            request.session.addfinalizer(drop_session_database)
+        return session_databases[key]
+
+    def _transaction_fixture(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Generator[Connection, None, None]:
+        """Run test within a transaction on the database created once per session."""
+        fixturename = str(request.fixturename)
+        connection_kwargs = _session_database(request, process, connection_kwargs, mysql_db)
+        with timings.measure(fixturename, "connect"):
+            mysql_conn = TransactionalConnection(
+                db=mysql_db, local_infile=True, **connection_kwargs
+            )
+            mysql_conn.start_transaction()
+        yield mysql_conn
+
+        with timings.measure(fixturename, "cleanup"):
+            if mysql_conn.open:
+                _cleanup(mysql_conn)
+                if not mysql_conn.implicit_commit:
+                    mysql_conn.rollback_transaction()
+                mysql_conn.close()
+        if mysql_conn.implicit_commit:
+            # committed changes can't be rolled back, recreate the database
+            connections = _get_connection_pool(request, process)
+            _drop_database(fixturename, connections, connection_kwargs, mysql_db)
+            connections.release(_create_database(request, process, connection_kwargs, mysql_db))
+
+    def _tables_fixture(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Generator[Connection, None, None]:
+        """Run test on the database created once per session, restore modified tables after it."""
+        fixturename = str(request.fixturename)
+        connection_kwargs = _session_database(request, process, connection_kwargs, mysql_db)
+        with timings.measure(fixturename, "connect"):
+            tracker_conn = Connection(**connection_kwargs)
+        dirty_tables = DirtyTables(tracker_conn, mysql_db, dirty_tracking)
+        before = dirty_tables.snapshot()
+
+        with timings.measure(fixturename, "connect"):
+            mysql_conn = Connection(db=mysql_db, local_infile=True, **connection_kwargs)
+        yield mysql_conn
+
+        with timings.measure(fixturename, "cleanup"):
+            if mysql_conn.open:
+                _cleanup(mysql_conn)
+                # release test's metadata locks, before the tables get dropped
+                mysql_conn.rollback()
+                mysql_conn.close()
+        with timings.measure(fixturename, "restore tables"):
+            modified, created = dirty_tables.modified(before, dirty_tables.snapshot())
+            if modified or created:
+                tracker_conn.query("SET SESSION FOREIGN_KEY_CHECKS = 0")
+                for table in modified | created:
+                    tracker_conn.query(f"DROP TABLE IF EXISTS `{mysql_db}`.`{table}`")
+                template_db = _get_template(request, process, connection_kwargs, mysql_db)
+                template_db.clone(mysql_db, modified)
+            tracker_conn.close()
+
+    def _get_pool(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+        pool_size: int,
+    ) -> DatabasePool:
+        """Start database pool once per session, and close it at the end of it."""
+        key = id(process)
+        if key not in pools:
+            fixturename = str(request.fixturename)
+            connections = _get_connection_pool(request, process)
+
+            # producer thread outlives the test, so it gets nothing but what it needs
+            def create(pool_db: str) -> None:
+                mysql_conn = _create_empty_database(
+                    fixturename, connections, key, connection_kwargs, pool_db
+                )
+                with timings.measure(fixturename, "load data"):
+                    _load_database(connection_kwargs, pool_db, templates.get(key))
+                connections.release(mysql_conn)
+
+            def drop(pool_db: str) -> None:
+                _drop_database(fixturename, connections, connection_kwargs, pool_db)
+
+            pool = DatabasePool(mysql_db, pool_size, create, drop)
+            # first database is created right away, settling the user and the template
+            # before other ones get created in the background
+            first_db = pool.next_name()
+            connections.release(_create_database(request, process, connection_kwargs, first_db))
+            pool.start(first_db)
+            pools[key] = pool
+
+            def close_pool() -> None:
+                pools.pop(key).close()
+
+            request.session.addfinalizer(close_pool)
+        return pools[key]
+
+    def _pool_fixture(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+        pool_size: int,
+    ) -> Generator[Connection, None, None]:
+        """Run test on the database taken from the pool, drop it in the background."""
+        fixturename = str(request.fixturename)
+        pool = _get_pool(request, process, connection_kwargs, mysql_db, pool_size)
+        pool_db = pool.get()
+        connections = _get_connection_pool(request, process)
+        with timings.measure(fixturename, "connect"):
+            mysql_conn = connections.connect(connection_kwargs)
+        _select_db(fixturename, mysql_conn, pool_db)
+        yield mysql_conn
+
+        with timings.measure(fixturename, "cleanup"):
+            if mysql_conn.open:
+                _cleanup(mysql_conn)
+                # reset connection rolls back test's transaction and releases its locks
+                connections.release(mysql_conn)
+            pool.release(pool_db)
+
+    def _database_fixture(
+        request: FixtureRequest,
+        process: Union[NoopMySQLExecutor, MySQLExecutor],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Generator[Connection, None, None]:
+        """Run test on the database created before, and dropped after it."""
+        fixturename = str(request.fixturename)
+        mysql_conn = _create_database(request, process, connection_kwargs, mysql_db)
+        yield mysql_conn
+
+        connections = _get_connection_pool(request, process)
+        with timings.measure(fixturename, "cleanup"):
+            if mysql_conn.open:
+                _cleanup(mysql_conn)
+                # reset connection rolls back test's transaction and releases its locks
+                connections.release(mysql_conn)
+        _drop_database(fixturename, connections, connection_kwargs, mysql_db)
+
+    def _digests_fixture(
+        request: FixtureRequest,
+        connections: ConnectionPool,
+        fixture: Generator[Connection, None, None],
+        connection_kwargs: Dict[str, Any],
+        mysql_db: str,
+    ) -> Generator[Connection, None, None]:
+        """Profile statements run by the test, and attach the most expensive ones to its report."""
+        mysql_conn = next(fixture)
+        # database taken from the pool is the one connection uses
+        test_db = mysql_conn.db.decode() if isinstance(mysql_conn.db, bytes) else mysql_conn.db
+        with timings.measure(str(request.fixturename), "connect"):
+            tracker_conn = connections.connect(connection_kwargs)
+        statement_digests = StatementDigests(tracker_conn, test_db or mysql_db)
+        if not statement_digests.enabled:
+            warn("performance_schema is disabled, statement digests are not collected")
+        before = statement_digests.snapshot()
+        yield mysql_conn
+
+        changes = statement_digests.delta(before, statement_digests.snapshot())
+        connections.release(tracker_conn)
+        top_digests = top(changes, get_config(request)["digests_limit"])
+        item = request.node
+        assert isinstance(item, pytest.Item)
+        item.user_properties.append(("mysql_digests", [stats._asdict() for stats in top_digests]))
+        if top_digests:
+            item.add_report_section(
+                "teardown", "mysql digests", "\n".join(format_digests(top_digests))
+            )
+        # tear the database down
+        for _ in fixture:
+            pass
+
+    def _status_fixture(
+        request: FixtureRequest,
+        connections: ConnectionPool,
+        fixture: Generator[Connection, None, None],
+        connection_kwargs: Dict[str, Any],
+    ) -> Generator[Connection, None, None]:
+        """Record changes of status counters over the test."""
+        counters = get_config(request)["status_counters"]
+        mysql_conn = next(fixture)
+        with timings.measure(str(request.fixturename), "connect"):
+            tracker_conn = connections.connect(connection_kwargs)
+        global_before = read_status(tracker_conn, "GLOBAL", counters)
+        session_before = read_status(mysql_conn, "SESSION", counters)
+        yield mysql_conn
+
+        changes = {"global": delta(global_before, read_status(tracker_conn, "GLOBAL", counters))}
+        connections.release(tracker_conn)
+        try:
+            # tests might close the connection, or leave it unusable
+            changes["session"] = delta(session_before, read_status(mysql_conn, "SESSION", counters))
+        except MySQLError:
+            pass
+        item = request.node
+        assert isinstance(item, pytest.Item)
+        item.user_properties.append(("mysql_status", changes))
+        status_log.write({"nodeid": item.nodeid, "fixture": request.fixturename, **changes})
+        # tear the database down
+        for _ in fixture:
+            pass
+
     @pytest.fixture
     def mysql_fixture(
         request: FixtureRequest,
@@ -100,6 +524,10 @@ def mysql(
         mysql_user = process.user
         mysql_passwd = passwd or config["passwd"]
         mysql_db = dbname or config["dbname"]
+        worker_input = getattr(request.config, "workerinput", None)
+        if process.shared and worker_input:
+            # every pytest-xdist worker needs its own database on the shared server
+            mysql_db = f"{mysql_db}_{worker_input['workerid']}"
 
         connection_kwargs: Dict[str, Any] = {
             "host": process.host,
@@ -111,30 +539,25 @@ def mysql(
         else:
             connection_kwargs["port"] = process.port
 
-        query_str = (
-            f"CREATE DATABASE `{mysql_db}` "
-            f"DEFAULT CHARACTER SET {charset} "
-            f"DEFAULT COLLATE {collation}"
-        )
-        try:
-            mysql_conn: Connection = _connect(connection_kwargs, query_str, mysql_db)
-        except OperationalError:
-            # Fallback to mysql connection with root user
-            connection_kwargs["user"] = "root"
-            mysql_conn = _connect(connection_kwargs, query_str, mysql_db)
-        mysql_conn.query(f"USE `{mysql_db}`")
-        yield mysql_conn
+        connections = _get_connection_pool(request, process)
+        connection_kwargs["user"] = users.get(id(process), connection_kwargs["user"])
 
-        # clean up after test that forgot to fetch selected data
-        if not mysql_conn.open:
-            mysql_conn = Connection(**connection_kwargs)
-        try:
-            with mysql_conn.cursor() as cursor:
-                cursor.fetchall()
-        except Exception as e:
-            print(str(e))
-        query_drop_database = f"DROP DATABASE IF EXISTS `{mysql_db}`"
-        mysql_conn.query(query_drop_database)
-        mysql_conn.close()
+        pool_size = db_pool_size if db_pool_size is not None else config["db_pool_size"]
+        if isolation == "transaction":
+            fixture = _transaction_fixture(request, process, connection_kwargs, mysql_db)
+        elif isolation == "tables":
+            fixture = _tables_fixture(request, process, connection_kwargs, mysql_db)
+        elif pool_size > 0:
+            fixture = _pool_fixture(request, process, connection_kwargs, mysql_db, pool_size)
+        else:
+            fixture = _database_fixture(request, process, connection_kwargs, mysql_db)
+        profile_digests = digests if digests is not None else config["digests"]
+        if profile_digests:
+            fixture = _digests_fixture(request, connections, fixture, connection_kwargs, mysql_db)
+        record_status = status if status is not None else config["status"]
+        if record_status:
+            fixture = _status_fixture(request, connections, fixture, connection_kwargs)
+        yield from fixture
 
+    prewarm.register_client(mysql_fixture, process_fixture_name)
     return mysql_fixture
@@ -0,0 +1,52 @@
+# Copyright (C) 2013 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of pytest-mysql.
+
+# pytest-mysql is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# pytest-mysql is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytest-mysql.  If not, see <http://www.gnu.org/licenses/>.
+"""Group fixture factory starting several MySQL servers at once."""
+
+from typing import Callable, Dict, Union
+
+import pytest
+from pytest import FixtureRequest
+
+from pytest_mysql import prewarm
+from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.executor_noop import NoopMySQLExecutor
+
+
+def mysql_proc_group(
+    *process_fixture_names: str,
+) -> Callable[[FixtureRequest], Dict[str, Union[MySQLExecutor, NoopMySQLExecutor]]]:
+    """Group fixture factory, starting process fixtures' servers concurrently.
+
+    :param process_fixture_names: names of process fixtures to start
+    :returns: function ``mysql_proc_group_fixture`` with session scope
+    """
+
+    @pytest.fixture(scope="session")
+    def mysql_proc_group_fixture(
+        request: FixtureRequest,
+    ) -> Dict[str, Union[MySQLExecutor, NoopMySQLExecutor]]:
+        """Start all servers in the background, and set up process fixtures using them.
+
+        :param request: fixture request object
+        :returns: process fixtures' executors by fixture name
+        """
+        for name in process_fixture_names:
+            prewarm.start_by_name(request.config, name)
+        return {name: request.getfixturevalue(name) for name in process_fixture_names}
+
+    return mysql_proc_group_fixture
@@ -18,15 +18,23 @@
 """Process fixture factory for MySQL database."""
 
 from pathlib import Path
-from typing import Callable, Generator, List, Optional, Set, Tuple, Union
+from tempfile import mkdtemp
+from typing import Any, Callable, Dict, Generator, List, Literal, Optional, Set, Tuple, Union
 from warnings import warn
 
 import pytest
 from port_for import get_port
-from pytest import FixtureRequest, TempPathFactory
+from pytest import Config, FixtureRequest, TempPathFactory
 
-from pytest_mysql.config import get_config
-from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql import prewarm
+from pytest_mysql.cache import SchemaCache, VersionCache
+from pytest_mysql.config import MySQLConfigType, get_config
+from pytest_mysql.executor import LauncherType, MySQLExecutor, ReadinessType
+from pytest_mysql.executor_noop import NoopMySQLExecutor
+from pytest_mysql.loader import LoadType
+from pytest_mysql.profiles import ProfileType
+from pytest_mysql.reuse import ReusedServer, servers_directory
+from pytest_mysql.shared import SharedServer
 
 
 def mysql_proc(
@@ -51,7 +59,20 @@ def mysql_proc(
     params: Optional[str] = None,
     logs_prefix: str = "",
     install_db: Optional[str] = None,
-) -> Callable[[FixtureRequest, TempPathFactory], Generator[MySQLExecutor, None, None]]:
+    cache_dir: Optional[Path] = None,
+    xdist_shared: Optional[bool] = None,
+    datadir_mode: Optional[Literal["disk", "tmpfs"]] = None,
+    tmpfs_path: Optional[Path] = None,
+    profile: Optional[ProfileType] = None,
+    readiness: Optional[ReadinessType] = None,
+    launcher: Optional[LauncherType] = None,
+    reuse_server: Optional[bool] = None,
+    schema: Optional[List[LoadType]] = None,
+    schema_files: Optional[List[Path]] = None,
+) -> Callable[
+    [FixtureRequest, TempPathFactory],
+    Generator[Union[MySQLExecutor, NoopMySQLExecutor], None, None],
+]:
     """Process fixture factory for MySQL server.
 
     :param mysqld_exec: path to mysql executable
@@ -68,29 +89,45 @@ def mysql_proc(
     :param params: additional command-line mysqld parameters
     :param logs_prefix: prefix for log filename
     :param install_db: path to legacy mysql_install_db script
+    :param cache_dir: directory to cache initialised data directories in
+    :param xdist_shared: start single server shared by all pytest-xdist workers
+    :param datadir_mode: ``disk`` places data directory in pytest's basetemp,
+        ``tmpfs`` places data and temporary directories on memory-backed filesystem
+    :param tmpfs_path: memory-backed filesystem path used in ``tmpfs`` mode
+    :param profile: server tuning profile: ``fast``, ``low-memory`` or ``prod-like``
+    :param readiness: how to detect that the server is ready: ``tcp``,
+        ``log`` (server's log) or ``socket`` (handshake through unix socket)
+    :param launcher: ``mysqld_safe`` to start server through mysqld_safe,
+        ``mysqld`` to run mysqld directly
+    :param reuse_server: leave the server running after the test run,
+        and attach to it in the next one
+    :param schema: sql files, import paths or callables loading the schema
+        (or running migrations) once the server starts. Callables receive pymysql's
+        connection keyword arguments. With cache_dir configured, data directory
+        with the schema loaded is restored by the following test runs.
+    :param schema_files: files or directories the schema loaders read (like migrations),
+        cached data directory is used only as long as their contents don't change
     :returns: function which makes a mysql process
     """
 
-    @pytest.fixture(scope="session")
-    def mysql_proc_fixture(
-        request: FixtureRequest, tmp_path_factory: TempPathFactory
-    ) -> Generator[MySQLExecutor, None, None]:
-        """Process fixture for MySQL server.
-
-        #. Get config.
-        #. Initialize MySQL data directory
-        #. `Start a mysqld server
-            <https://dev.mysql.com/doc/refman/5.0/en/mysqld-safe.html>`_
-        #. Stop server and remove directory after tests.
-            `See <https://dev.mysql.com/doc/refman/5.6/en/mysqladmin.html>`_
-
-        :param FixtureRequest request: fixture request object
-        :param tmp_path_factory: pytest fixture for temporary directories
-        :rtype: pytest_dbfixtures.executors.TCPExecutor
-        :returns: tcp executor
+    def _mysql_executor(
+        pytest_config: Config,
+        fixturename: str,
+        tmp_path_factory: Optional[TempPathFactory],
+        base_directory: Optional[Path] = None,
+        detached: bool = False,
+    ) -> MySQLExecutor:
+        """Configure MySQL executor.
 
+        :param pytest_config: pytest's config
+        :param fixturename: process fixture's name
+        :param tmp_path_factory: pytest's temporary directories factory,
+            system's temporary directory is used without it
+        :param base_directory: directory to place server's files in,
+            new temporary directory by default
+        :param detached: whether server will be left running after the test run
         """
-        config = get_config(request)
+        config = get_config(pytest_config)
         mysql_mysqld = mysqld_exec or config["mysqld"]
         mysql_admin_exec = admin_executable or config["admin"]
         mysql_mysqld_safe = mysqld_safe or config["mysqld_safe"]
@@ -99,8 +136,17 @@ def mysql_proc(
         mysql_host = host or config["host"]
         mysql_params = params or config["params"]
         mysql_install_db = install_db or config["install_db"]
+        mysql_cache_dir = cache_dir or config["cache_dir"]
+        mysql_datadir_mode = datadir_mode or config["datadir_mode"]
+        mysql_tmpfs_path = tmpfs_path or config["tmpfs_path"]
 
-        tmpdir = tmp_path_factory.mktemp(f"pytest-mysql-{request.fixturename}")
+        if base_directory:
+            base_directory.mkdir(parents=True)
+            tmpdir = base_directory
+        elif tmp_path_factory:
+            tmpdir = tmp_path_factory.mktemp(f"pytest-mysql-{fixturename}")
+        else:
+            tmpdir = Path(mkdtemp(prefix=f"pytest-mysql-{fixturename}-"))
 
         if logs_prefix:
             warn(
@@ -134,8 +180,205 @@ def mysql_proc(
             host=mysql_host,
             port=mysql_port,
             install_db=mysql_install_db,
+            cache_dir=Path(mysql_cache_dir) if mysql_cache_dir else None,
+            tmpfs_path=mysql_tmpfs_path if mysql_datadir_mode == "tmpfs" else None,
+            profile=profile or config["profile"],
+            readiness=readiness or config["readiness"],
+            launcher=launcher or config["launcher"],
+            detached=detached,
+            schema=schema,
+            schema_files=schema_files,
+        )
+        mysql_executor.fixturename = fixturename
+        return mysql_executor
+
+    def _reuse_settings(config: MySQLConfigType) -> Dict[str, Any]:
+        """Return settings the reused server has to be started with, to be attached to."""
+        mysql_mysqld = mysqld_exec or config["mysqld"]
+        return {
+            # changes along with the binary
+            "mysqld": VersionCache.key(mysql_mysqld) or str(mysql_mysqld),
+            "mysqld_safe": str(mysqld_safe or config["mysqld_safe"]),
+            "user": user or config["user"] or "root",
+            "host": host or config["host"],
+            "params": params or config["params"],
+            "datadir_mode": datadir_mode or config["datadir_mode"],
+            "profile": profile or config["profile"],
+            "launcher": launcher or config["launcher"],
+            "schema": SchemaCache.source_hash(schema, schema_files or []) if schema else None,
+        }
+
+    def _start(mysql_executor: MySQLExecutor, start: Callable[[], Any]) -> None:
+        """Start the server, removing its data directory from memory if it fails to start."""
+        try:
+            start()
+        except BaseException:
+            # otherwise it'd stay in memory until reboot
+            mysql_executor.remove_tmpfs_directory()
+            raise
+
+    def _reused_mysql_proc(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory
+    ) -> Generator[Union[MySQLExecutor, NoopMySQLExecutor], None, None]:
+        """Attach to the server left running by the previous test run, or start one.
+
+        Server is left running after the test run.
+        """
+        config = get_config(request)
+        server_name = str(request.fixturename)
+        worker_input = getattr(request.config, "workerinput", None)
+        if worker_input:
+            server_name = f"{server_name}_{worker_input['workerid']}"
+        reused_server = ReusedServer(
+            servers_directory(cache_dir or config["cache_dir"]) / server_name
+        )
+        settings = _reuse_settings(config)
+        state = reused_server.attach(settings)
+        if state is not None:
+            yield NoopMySQLExecutor(
+                user=state["user"],
+                host=state["host"],
+                port=state["port"],
+                unixsocket=state["unixsocket"],
+            )
+            return
+
+        # remove files left by the server that is gone
+        reused_server.stop()
+        mysql_executor = _mysql_executor(
+            request.config,
+            server_name,
+            tmp_path_factory,
+            base_directory=reused_server.base_directory,
+            detached=True,
+        )
+        _start(mysql_executor, mysql_executor.start)
+        reused_server.write(
+            {
+                "pid": mysql_executor.read_pid(),
+                "user": mysql_executor.user,
+                "host": mysql_executor.host,
+                "port": mysql_executor.port,
+                "unixsocket": mysql_executor.unixsocket,
+                "version": mysql_executor.version(),
+                "tmpfs_directory": (
+                    str(mysql_executor.tmpfs_directory) if mysql_executor.tmpfs_directory else None
+                ),
+                "settings": settings,
+            }
+        )
+        yield mysql_executor
+        mysql_executor.detach()
+
+    def _shared_mysql_proc(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory
+    ) -> Generator[Union[MySQLExecutor, NoopMySQLExecutor], None, None]:
+        """Share single MySQL server between all pytest-xdist workers.
+
+        First worker starts the server, and stops it once all workers are done.
+        Other workers only connect to it.
+        """
+        # basetemp's parent directory is shared by all xdist workers
+        shared_server = SharedServer(
+            tmp_path_factory.getbasetemp().parent / f"pytest-mysql-{request.fixturename}"
         )
-        with mysql_executor:
+        with shared_server.locked():
+            state = shared_server.attach()
+            if state is None:
+                mysql_executor = _mysql_executor(
+                    request.config, str(request.fixturename), tmp_path_factory
+                )
+                mysql_executor.shared = True
+                _start(mysql_executor, mysql_executor.start)
+                shared_server.start(
+                    {
+                        "user": mysql_executor.user,
+                        "host": mysql_executor.host,
+                        "port": mysql_executor.port,
+                        "unixsocket": mysql_executor.unixsocket,
+                    }
+                )
+
+        if state is not None:
+            noop_executor = NoopMySQLExecutor(
+                user=state["user"],
+                host=state["host"],
+                port=state["port"],
+                unixsocket=state["unixsocket"],
+            )
+            noop_executor.shared = True
+            yield noop_executor
+            shared_server.detach()
+            return
+
+        yield mysql_executor
+        shared_server.detach()
+        with shared_server.last_worker():
+            mysql_executor.stop()
+        mysql_executor.remove_tmpfs_directory()
+
+    def _prewarm_executor(pytest_config: Config, fixturename: str) -> Optional[MySQLExecutor]:
+        """Build executor to be started in the background, before the fixture is set up.
+
+        Servers shared between pytest-xdist workers, or reused in between runs
+        are started by the fixture itself.
+
+        Executor is built during the collection, before ``tmp_path_factory`` fixture
+        can be requested, so server's files are placed in system's temporary directory,
+        and removed once it's stopped.
+        """
+        config = get_config(pytest_config)
+        mysql_xdist_shared = xdist_shared if xdist_shared is not None else config["xdist_shared"]
+        mysql_reuse_server = reuse_server if reuse_server is not None else config["reuse_server"]
+        if (mysql_xdist_shared and hasattr(pytest_config, "workerinput")) or mysql_reuse_server:
+            return None
+        return _mysql_executor(pytest_config, fixturename, None)
+
+    def mysql_proc_fixture(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory
+    ) -> Generator[Union[MySQLExecutor, NoopMySQLExecutor], None, None]:
+        """Process fixture for MySQL server.
+
+        #. Get config.
+        #. Initialize MySQL data directory
+        #. `Start a mysqld server
+            <https://dev.mysql.com/doc/refman/5.0/en/mysqld-safe.html>`_
+        #. Stop server and remove directory after tests.
+            `See <https://dev.mysql.com/doc/refman/5.6/en/mysqladmin.html>`_
+
+        :param FixtureRequest request: fixture request object
+        :param tmp_path_factory: pytest fixture for temporary directories
+        :rtype: pytest_dbfixtures.executors.TCPExecutor
+        :returns: tcp executor
+
+        """
+        config = get_config(request)
+        mysql_xdist_shared = xdist_shared if xdist_shared is not None else config["xdist_shared"]
+        if mysql_xdist_shared and hasattr(request.config, "workerinput"):
+            yield from _shared_mysql_proc(request, tmp_path_factory)
+            return
+        mysql_reuse_server = reuse_server if reuse_server is not None else config["reuse_server"]
+        if mysql_reuse_server:
+            yield from _reused_mysql_proc(request, tmp_path_factory)
+            return
+
+        background_start = prewarm.take(mysql_proc_fixture, str(request.fixturename))
+        if background_start:
+            mysql_executor = background_start.executor
+            _start(mysql_executor, background_start.join)
+        else:
+            mysql_executor = _mysql_executor(
+                request.config, str(request.fixturename), tmp_path_factory
+            )
+            _start(mysql_executor, mysql_executor.start)
+        try:
             yield mysql_executor
+        finally:
+            mysql_executor.stop()
+            if background_start:
+                background_start.remove_files()
+            else:
+                mysql_executor.remove_tmpfs_directory()
 
-    return mysql_proc_fixture
+    prewarm.register(mysql_proc_fixture, _prewarm_executor)
+    return pytest.fixture(scope="session")(mysql_proc_fixture)
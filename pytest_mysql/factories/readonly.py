@@ -0,0 +1,179 @@
+# Copyright (C) 2013 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of pytest-mysql.
+
+# pytest-mysql is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# pytest-mysql is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytest-mysql.  If not, see <http://www.gnu.org/licenses/>.
+"""Read-only client fixture factory, sharing loaded database between tests."""
+
+import secrets
+from typing import Any, Callable, Dict, Generator, List, Literal, Optional, Union
+
+import pytest
+from pymysql import Connection, OperationalError
+from pytest import FixtureRequest
+
+from pytest_mysql import prewarm
+from pytest_mysql.config import get_config
+from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.executor_noop import NoopMySQLExecutor
+from pytest_mysql.loader import LoadType, build_loader
+from pytest_mysql.timing import timings
+
+ReadOnlyType = Literal["user", "session"]
+
+
+def mysql_readonly(
+    process_fixture_name: str,
+    dbname: str,
+    load: Optional[List[LoadType]] = None,
+    passwd: Optional[str] = None,
+    charset: str = "utf8",
+    collation: str = "utf8_general_ci",
+    scope: Literal["session", "module"] = "session",
+    read_only: ReadOnlyType = "user",
+) -> Callable[[FixtureRequest], Any]:
+    """Read-only client fixture factory for MySQL server.
+
+    Database is created and loaded once per scope, and shared by all tests in it,
+    without being reset in between them. Tests' writes fail with
+    :class:`pymysql.OperationalError`, instead of affecting the other tests.
+
+    :param process_fixture_name: process fixture name
+    :param dbname: database's name
+    :param load: sql files, import paths or callables loading data into the database.
+        Callables receive pymysql's connection keyword arguments.
+    :param passwd: mysql server's password
+    :param charset: MySQL characterset to use by default for the database
+    :param collation: MySQL collation to use by default for the database
+    :param scope: fixture's scope, ``session`` or ``module``
+    :param read_only: how writes are prevented. ``user`` connects tests
+        as a user granted nothing but ``SELECT`` on the database.
+        ``session`` connects as the process fixture's user, and makes the connection's
+        transactions read-only with ``SET SESSION TRANSACTION READ ONLY``,
+        which tests can switch back.
+    :returns: function ``mysql_readonly_fixture`` with a given scope
+    """
+    loaders = [build_loader(load_element) for load_element in load or []]
+
+    def _create_user(admin_conn: Connection, mysql_db: str, user: str, password: str) -> None:
+        """Create user allowed to only read from the database."""
+        admin_conn.query(
+            f"CREATE USER '{user}'@'localhost' IDENTIFIED BY '{password}', "
+            f"'{user}'@'%' IDENTIFIED BY '{password}'"
+        )
+        admin_conn.query(f"GRANT SELECT ON `{mysql_db}`.* TO '{user}'@'localhost', '{user}'@'%'")
+
+    def _drop(
+        connection_kwargs: Dict[str, Any], mysql_db: str, readonly_user: Optional[str]
+    ) -> None:
+        """Drop the database, and the read-only user if it's been created."""
+        admin_conn = Connection(**connection_kwargs)
+        try:
+            if readonly_user:
+                admin_conn.query(
+                    f"DROP USER IF EXISTS '{readonly_user}'@'localhost', '{readonly_user}'@'%'"
+                )
+            admin_conn.query(f"DROP DATABASE IF EXISTS `{mysql_db}`")
+        finally:
+            admin_conn.close()
+
+    @pytest.fixture(scope=scope)
+    def mysql_readonly_fixture(
+        request: FixtureRequest,
+    ) -> Generator[Connection, None, None]:
+        """Read-only client fixture for MySQL server.
+
+        #. Create and load the database.
+        #. Create read-only user (in ``user`` mode).
+        #. Connect to the database, for all tests in fixture's scope.
+        #. Drop the database (and the user) at the end of the scope.
+
+        :param request: fixture request object
+        :returns: read-only connection to the database
+        """
+        config = get_config(request)
+        fixturename = str(request.fixturename)
+        process: Union[NoopMySQLExecutor, MySQLExecutor] = request.getfixturevalue(
+            process_fixture_name
+        )
+        if not process.running():
+            process.start()
+
+        mysql_db = dbname
+        worker_input = getattr(request.config, "workerinput", None)
+        if process.shared and worker_input:
+            # every pytest-xdist worker needs its own database on the shared server
+            mysql_db = f"{mysql_db}_{worker_input['workerid']}"
+
+        connection_kwargs: Dict[str, Any] = {
+            "host": process.host,
+            "user": process.user,
+            "passwd": passwd or config["passwd"],
+        }
+        if process.unixsocket:
+            connection_kwargs["unix_socket"] = process.unixsocket
+        else:
+            connection_kwargs["port"] = process.port
+
+        admin_conn: Optional[Connection] = None
+        mysql_conn: Optional[Connection] = None
+        readonly_user = None
+        created = False
+        try:
+            with timings.measure(fixturename, "create database"):
+                try:
+                    admin_conn = Connection(**connection_kwargs)
+                except OperationalError:
+                    # Fallback to mysql connection with root user
+                    connection_kwargs["user"] = "root"
+                    admin_conn = Connection(**connection_kwargs)
+                admin_conn.query(
+                    f"CREATE DATABASE `{mysql_db}` "
+                    f"DEFAULT CHARACTER SET {charset} "
+                    f"DEFAULT COLLATE {collation}"
+                )
+                created = True
+
+            readonly_kwargs = dict(connection_kwargs)
+            with timings.measure(fixturename, "load data"):
+                for loader in loaders:
+                    loader(db=mysql_db, **connection_kwargs)
+            if read_only == "user":
+                # MySQL before 5.7.8 limits user names to 16 characters
+                readonly_user = f"ro_{secrets.token_hex(6)}"
+                readonly_kwargs["user"] = readonly_user
+                readonly_kwargs["passwd"] = secrets.token_hex(16)
+                _create_user(admin_conn, mysql_db, readonly_user, readonly_kwargs["passwd"])
+            admin_conn.close()
+            mysql_conn = Connection(db=mysql_db, autocommit=True, **readonly_kwargs)
+            mysql_conn.query("SET SESSION TRANSACTION READ ONLY")
+        except BaseException:
+            # teardown doesn't run for fixture failing to set up,
+            # and the database left behind would fail the next run
+            for connection in (admin_conn, mysql_conn):
+                if connection and connection.open:
+                    connection.close()
+            if created:
+                _drop(connection_kwargs, mysql_db, readonly_user)
+            raise
+        yield mysql_conn
+
+        with timings.measure(fixturename, "drop database"):
+            if mysql_conn.open:
+                mysql_conn.close()
+            _drop(connection_kwargs, mysql_db, readonly_user)
+
+    prewarm.register_client(mysql_readonly_fixture, process_fixture_name)
+    return mysql_readonly_fixture
@@ -0,0 +1,44 @@
+"""Loader helper functions."""
+
+import re
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Union
+
+from pymysql import Connection
+from pymysql.constants import CLIENT
+
+LoadType = Union[Callable[..., None], str, Path]
+
+
+def build_loader(load: LoadType) -> Callable[..., None]:
+    """Build a loader callable.
+
+    :param load: path to sql file, import path to the loading function
+        (``package.module:function`` or ``package.module.function``)
+        or the loading function itself.
+    :returns: callable accepting pymysql's connection keyword arguments
+    """
+    if isinstance(load, Path):
+        return partial(sql, load)
+    elif isinstance(load, str):
+        loader_parts = re.split("[.:]", load)
+        import_path = ".".join(loader_parts[:-1])
+        loader_name = loader_parts[-1]
+        _temp_import = __import__(import_path, globals(), locals(), fromlist=[loader_name])
+        _loader: Callable[..., None] = getattr(_temp_import, loader_name)
+        return _loader
+    else:
+        return load
+
+
+def sql(sql_filename: Path, **kwargs: Any) -> None:
+    """Database loader for sql files."""
+    db_connection = Connection(client_flag=CLIENT.MULTI_STATEMENTS, **kwargs)
+    with open(sql_filename, "r") as _fd:
+        with db_connection.cursor() as cur:
+            cur.execute(_fd.read())
+            while cur.nextset():
+                pass
+    db_connection.commit()
+    db_connection.close()
@@ -17,9 +17,19 @@
 # along with pytest-mysql.  If not, see <http://www.gnu.org/licenses/>.
 """Plugin definition."""
 
-from pytest import Parser
+from pathlib import Path
+from typing import Any, Dict, List, Optional, cast
 
-from pytest_mysql import factories
+from pytest import Config, Item, Parser, Session, TerminalReporter, TestReport, hookimpl
+
+from pytest_mysql import factories, prewarm
+from pytest_mysql.cache import DatadirCache, SchemaCache, VersionCache
+from pytest_mysql.config import get_config
+from pytest_mysql.digests import DigestStats, digest_summary, format_digests
+from pytest_mysql.profiles import PROFILES
+from pytest_mysql.reuse import ReusedServer, servers_directory
+from pytest_mysql.status import DEFAULT_COUNTERS, status_log
+from pytest_mysql.timing import timings
 
 # pylint:disable=invalid-name
 _help_mysqld = "Path to MySQLd executable"
@@ -33,6 +43,25 @@ _help_user = "MySQL username"
 _help_passwd = "MySQL password"
 _help_dbname = "Test database name"
 _help_params = "Starting parameters for the MySQL"
+_help_cache_dir = "Directory to keep initialised data directories in between test runs"
+_help_cache_clear = "Remove pytest-mysql's cached data before the test run"
+_help_xdist_shared = "Start single MySQL server shared by all pytest-xdist workers"
+_help_db_pool_size = "Number of test databases created ahead of time in the background"
+_help_datadir_mode = "Where to place data directory: disk (in pytest's basetemp) or tmpfs"
+_help_tmpfs_path = "Memory-backed filesystem path to place data directory in tmpfs mode"
+_help_profile = "Server tuning profile: fast, low-memory or prod-like"
+_help_readiness = "How to detect that the server is ready: tcp, log or socket"
+_help_launcher = "Start server through mysqld_safe, or run mysqld directly"
+_help_reuse_server = "Leave MySQL server running after the test run, and reuse it in the next one"
+_help_stop_servers = "Stop all MySQL servers left running with --mysql-reuse-server, and exit"
+_help_prewarm = "Start MySQL servers in the background as soon as tests using them are collected"
+_help_timings = "Report durations of MySQL fixtures' setup and teardown phases"
+_help_timings_json = "Write durations of MySQL fixtures' phases into a JSON file"
+_help_digests = "Profile statements run by each test with performance_schema's statement digests"
+_help_digests_limit = "Number of the most expensive statement digests to report"
+_help_status = "Record changes of server's and session's status counters over each test"
+_help_status_counters = "Comma separated names of status counters to record"
+_help_status_json = "Write status counters' changes into a JSON Lines file, a line per test"
 
 
 def pytest_addoption(parser: Parser) -> None:
@@ -70,6 +99,44 @@ def pytest_addoption(parser: Parser) -> None:
         help=_help_logsdir,
     )
 
+    parser.addini(name="mysql_cache_dir", help=_help_cache_dir, default=None)
+
+    parser.addini(name="mysql_xdist_shared", type="bool", help=_help_xdist_shared, default=False)
+
+    parser.addini(name="mysql_db_pool_size", help=_help_db_pool_size, default="0")
+
+    parser.addini(name="mysql_datadir_mode", help=_help_datadir_mode, default="disk")
+
+    parser.addini(name="mysql_tmpfs_path", help=_help_tmpfs_path, default="/dev/shm")
+
+    parser.addini(name="mysql_profile", help=_help_profile, default=None)
+
+    parser.addini(name="mysql_readiness", help=_help_readiness, default="tcp")
+
+    parser.addini(name="mysql_launcher", help=_help_launcher, default="mysqld_safe")
+
+    parser.addini(name="mysql_reuse_server", type="bool", help=_help_reuse_server, default=False)
+
+    parser.addini(name="mysql_prewarm", type="bool", help=_help_prewarm, default=False)
+
+    parser.addini(name="mysql_timings", type="bool", help=_help_timings, default=False)
+
+    parser.addini(name="mysql_timings_json", help=_help_timings_json, default=None)
+
+    parser.addini(name="mysql_digests", type="bool", help=_help_digests, default=False)
+
+    parser.addini(name="mysql_digests_limit", help=_help_digests_limit, default="5")
+
+    parser.addini(name="mysql_status", type="bool", help=_help_status, default=False)
+
+    parser.addini(
+        name="mysql_status_counters",
+        help=_help_status_counters,
+        default=",".join(DEFAULT_COUNTERS),
+    )
+
+    parser.addini(name="mysql_status_json", help=_help_status_json, default=None)
+
     parser.addoption(
         "--mysql-mysqld",
         action="store",
@@ -127,9 +194,262 @@ def pytest_addoption(parser: Parser) -> None:
         help=_help_logsdir,
     )
 
+    parser.addoption(
+        "--mysql-cache-dir",
+        action="store",
+        metavar="path",
+        dest="mysql_cache_dir",
+        help=_help_cache_dir,
+    )
+
+    parser.addoption(
+        "--mysql-cache-clear",
+        action="store_true",
+        dest="mysql_cache_clear",
+        help=_help_cache_clear,
+    )
+
+    parser.addoption(
+        "--mysql-xdist-shared",
+        action="store_true",
+        dest="mysql_xdist_shared",
+        help=_help_xdist_shared,
+    )
+
+    parser.addoption(
+        "--mysql-db-pool-size",
+        action="store",
+        type=int,
+        dest="mysql_db_pool_size",
+        help=_help_db_pool_size,
+    )
+
+    parser.addoption(
+        "--mysql-datadir-mode",
+        action="store",
+        choices=("disk", "tmpfs"),
+        dest="mysql_datadir_mode",
+        help=_help_datadir_mode,
+    )
+
+    parser.addoption(
+        "--mysql-tmpfs-path",
+        action="store",
+        metavar="path",
+        dest="mysql_tmpfs_path",
+        help=_help_tmpfs_path,
+    )
+
+    parser.addoption(
+        "--mysql-profile",
+        action="store",
+        choices=PROFILES,
+        dest="mysql_profile",
+        help=_help_profile,
+    )
+
+    parser.addoption(
+        "--mysql-readiness",
+        action="store",
+        choices=("tcp", "log", "socket"),
+        dest="mysql_readiness",
+        help=_help_readiness,
+    )
+
+    parser.addoption(
+        "--mysql-launcher",
+        action="store",
+        choices=("mysqld_safe", "mysqld"),
+        dest="mysql_launcher",
+        help=_help_launcher,
+    )
+
+    parser.addoption(
+        "--mysql-reuse-server",
+        action="store_true",
+        dest="mysql_reuse_server",
+        help=_help_reuse_server,
+    )
+
+    parser.addoption(
+        "--mysql-stop-servers",
+        action="store_true",
+        dest="mysql_stop_servers",
+        help=_help_stop_servers,
+    )
+
+    parser.addoption(
+        "--mysql-prewarm",
+        action="store_true",
+        dest="mysql_prewarm",
+        help=_help_prewarm,
+    )
+
+    parser.addoption(
+        "--mysql-timings",
+        action="store_true",
+        dest="mysql_timings",
+        help=_help_timings,
+    )
+
+    parser.addoption(
+        "--mysql-timings-json",
+        action="store",
+        dest="mysql_timings_json",
+        help=_help_timings_json,
+    )
+
+    parser.addoption(
+        "--mysql-digests",
+        action="store_true",
+        dest="mysql_digests",
+        help=_help_digests,
+    )
+
+    parser.addoption(
+        "--mysql-digests-limit",
+        action="store",
+        type=int,
+        dest="mysql_digests_limit",
+        help=_help_digests_limit,
+    )
+
+    parser.addoption(
+        "--mysql-status",
+        action="store_true",
+        dest="mysql_status",
+        help=_help_status,
+    )
+
+    parser.addoption(
+        "--mysql-status-counters",
+        action="store",
+        dest="mysql_status_counters",
+        help=_help_status_counters,
+    )
+
+    parser.addoption(
+        "--mysql-status-json",
+        action="store",
+        dest="mysql_status_json",
+        help=_help_status_json,
+    )
+
+
+def pytest_cmdline_main(config: Config) -> Optional[int]:
+    """Stop servers left running by previous test runs, if requested."""
+    if not config.getoption("mysql_stop_servers"):
+        return None
+    cache_dir = config.getoption("mysql_cache_dir") or config.getini("mysql_cache_dir")
+    # servers kept in other cache directories are found through the registry
+    reused_servers = {
+        reused_server.base_directory.absolute(): reused_server
+        for reused_server in (
+            *ReusedServer.all(servers_directory(cache_dir)),
+            *ReusedServer.registered(),
+        )
+    }
+    for base_directory, reused_server in reused_servers.items():
+        reused_server.stop()
+        print(f"Stopped MySQL server {base_directory}")
+    return 0
+
+
+def _worker_path(config: Config, path: Path) -> Path:
+    """Add pytest-xdist worker's id to the file name, so that every worker writes its own file."""
+    worker_input = getattr(config, "workerinput", None)
+    if worker_input:
+        return path.with_name(f"{path.stem}.{worker_input['workerid']}{path.suffix}")
+    return path
+
+
+def pytest_plugin_registered(plugin: object) -> None:
+    """Remember process fixtures defined in plugins and conftest modules, for group fixtures."""
+    prewarm.collect(plugin)
+
+
+def pytest_sessionstart(session: Session) -> None:
+    """Start writing status counters' changes, and clear pytest-mysql's cache if requested."""
+    config = session.config
+    status_json = config.getoption("mysql_status_json") or config.getini("mysql_status_json")
+    if status_json:
+        status_log.start(_worker_path(config, Path(status_json)))
+    # xdist workers share the cache with the controller, which clears it for them
+    if not config.getoption("mysql_cache_clear") or hasattr(config, "workerinput"):
+        return
+    cache_dir = config.getoption("mysql_cache_dir") or config.getini("mysql_cache_dir")
+    if cache_dir:
+        DatadirCache(Path(cache_dir)).clear()
+        VersionCache(Path(cache_dir)).clear()
+        SchemaCache(Path(cache_dir)).clear()
+
+
+def pytest_itemcollected(item: Item) -> None:
+    """Start servers used by collected test in the background, if requested."""
+    if item.config.getoption("mysql_prewarm") or item.config.getini("mysql_prewarm"):
+        prewarm.prewarm(item)
+
+
+def pytest_runtest_logreport(report: TestReport) -> None:
+    """Sum statement digests attached to tests' reports, also the ones of pytest-xdist workers."""
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "mysql_digests":
+            digests = cast(List[Dict[str, Any]], value)
+            digest_summary.record([DigestStats(**stats) for stats in digests])
+
+
+def pytest_sessionfinish(session: Session) -> None:
+    """Stop unused servers started in the background, close status log and write timings."""
+    prewarm.stop_unused()
+    status_log.close()
+    config = session.config
+    timings_json = config.getoption("mysql_timings_json") or config.getini("mysql_timings_json")
+    if timings_json:
+        timings.write_json(_worker_path(config, Path(timings_json)))
+    worker_output = getattr(config, "workeroutput", None)
+    if worker_output is not None:
+        # pytest-xdist's controller reports timings of all workers
+        worker_output["mysql_timings"] = timings.durations()
+
+
+@hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge timings measured by finished pytest-xdist worker."""
+    worker_output = getattr(node, "workeroutput", {})
+    timings.merge(worker_output.get("mysql_timings", []))
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    """Report durations of fixtures' phases, and the most expensive statements if requested."""
+    config = terminalreporter.config
+    if config.getoption("mysql_timings") or config.getini("mysql_timings"):
+        terminalreporter.write_sep("=", "pytest-mysql timings")
+        for line in timings.report():
+            terminalreporter.write_line(line)
+    top_digests = digest_summary.top(get_config(config)["digests_limit"])
+    if top_digests:
+        terminalreporter.write_sep("=", "pytest-mysql statement digests")
+        for line in format_digests(top_digests):
+            terminalreporter.write_line(line)
+
 
 mysql_proc = factories.mysql_proc()
 mysql_noproc = factories.mysql_noproc()
 mysql = factories.mysql("mysql_proc")
 
-__all__ = ("pytest_addoption", "mysql_proc", "mysql_noproc", "mysql")
+__all__ = (
+    "pytest_addoption",
+    "pytest_cmdline_main",
+    "pytest_plugin_registered",
+    "pytest_sessionstart",
+    "pytest_itemcollected",
+    "pytest_runtest_logreport",
+    "pytest_sessionfinish",
+    "pytest_testnodedown",
+    "pytest_terminal_summary",
+    "mysql_proc",
+    "mysql_noproc",
+    "mysql",
+)
@@ -0,0 +1,145 @@
+"""Starting MySQL servers in the background, before tests need them."""
+
+import shutil
+import threading
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from pytest import Config, Item
+
+from pytest_mysql.executor import MySQLExecutor
+
+# builds executor for a given fixture name, None if fixture doesn't start its own server
+PrewarmBuilder = Callable[[Config, str], Optional[MySQLExecutor]]
+
+_builders: Dict[Callable[..., Any], PrewarmBuilder] = {}
+# process fixtures' names client fixtures use, by client fixture's function
+_clients: Dict[Callable[..., Any], str] = {}
+# process fixtures defined in plugins and conftest modules, by fixture name
+_fixtures: Dict[str, Callable[..., Any]] = {}
+# process fixtures' names client fixtures defined there use, by client fixture's name
+_client_fixtures: Dict[str, str] = {}
+# servers started in the background by process fixture's function and name,
+# as fixtures defined in different conftest modules might share the name
+PrewarmKey = Tuple[Callable[..., Any], str]
+_prewarmed: Dict[PrewarmKey, "BackgroundStart"] = {}
+# fixtures that have already been set up, and don't need their server anymore
+_taken: Set[PrewarmKey] = set()
+
+
+class BackgroundStart:
+    """Executor being started in a background thread."""
+
+    def __init__(self, executor: MySQLExecutor) -> None:
+        """Start executor (with data directory initialisation) in a background thread."""
+        self.executor = executor
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._start, daemon=True)
+        self._thread.start()
+
+    def _start(self) -> None:
+        try:
+            self.executor.start()
+        except BaseException as e:
+            self._error = e
+
+    def join(self) -> MySQLExecutor:
+        """Wait for the executor to start, and return it.
+
+        Exception raised while starting the executor is raised here.
+        """
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self.executor
+
+    def remove_files(self) -> None:
+        """Remove server's files, once it's stopped."""
+        self.executor.remove_tmpfs_directory()
+        shutil.rmtree(self.executor.base_directory, ignore_errors=True)
+
+
+def register(fixture_function: Callable[..., Any], builder: PrewarmBuilder) -> None:
+    """Register process fixture's function, that can be prewarmed with builder."""
+    _builders[fixture_function] = builder
+
+
+def register_client(fixture: Callable[..., Any], process_fixture_name: str) -> None:
+    """Register client fixture, getting its server from process fixture with a given name."""
+    _clients[_unwrap(fixture)] = process_fixture_name
+
+
+def _unwrap(fixture: Any) -> Any:
+    """Return function pytest's fixture decorator has wrapped."""
+    return getattr(fixture, "__wrapped__", fixture)
+
+
+def collect(plugin: object) -> None:
+    """Remember fixtures defined in pytest's plugin or conftest module by their names."""
+    if not isinstance(plugin, ModuleType):
+        return
+    for name, value in list(vars(plugin).items()):
+        fixture_function = _unwrap(value)
+        if not isinstance(fixture_function, FunctionType):
+            continue
+        if fixture_function in _builders:
+            _fixtures[name] = fixture_function
+        elif fixture_function in _clients:
+            _client_fixtures[name] = _clients[fixture_function]
+
+
+def start_by_name(config: Config, fixturename: str) -> None:
+    """Start server of the process fixture with a given name in the background.
+
+    Nothing happens, if there's no such process fixture in plugins
+    or conftest modules (see :func:`collect`), or it's already been
+    set up or started in the background.
+
+    :param config: pytest's config
+    :param fixturename: fixture's name
+    """
+    fixture_function = _fixtures.get(fixturename)
+    if fixture_function is not None:
+        _start(config, fixturename, fixture_function)
+
+
+def _start(config: Config, fixturename: str, fixture_function: Callable[..., Any]) -> None:
+    builder = _builders.get(fixture_function)
+    key = (fixture_function, fixturename)
+    if builder is None or key in _prewarmed or key in _taken:
+        return
+    executor = builder(config, fixturename)
+    if executor is not None:
+        _prewarmed[key] = BackgroundStart(executor)
+
+
+def prewarm(item: Item) -> None:
+    """Start servers of process fixtures used by collected test, directly or by client fixtures."""
+    for name in getattr(item, "fixturenames", ()):
+        start_by_name(item.config, _client_fixtures.get(name, name))
+
+
+def take(fixture_function: Callable[..., Any], fixturename: str) -> Optional[BackgroundStart]:
+    """Return server started in the background for a given fixture, if any.
+
+    Called by the fixture, when it's being set up.
+
+    :param fixture_function: process fixture's function, as registered
+    :param fixturename: fixture's name
+    """
+    key = (fixture_function, fixturename)
+    _taken.add(key)
+    return _prewarmed.pop(key, None)
+
+
+def stop_unused() -> None:
+    """Stop servers started in the background, that no test has used."""
+    while _prewarmed:
+        _, background_start = _prewarmed.popitem()
+        try:
+            executor = background_start.join()
+        except Exception:
+            background_start.remove_files()
+            continue
+        executor.stop()
+        background_start.remove_files()
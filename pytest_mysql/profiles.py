@@ -0,0 +1,66 @@
+"""Server tuning profiles for test workloads."""
+
+from typing import List, Literal, Union
+
+from packaging.version import parse
+
+ProfileType = Literal["fast", "low-memory", "prod-like"]
+PROFILES = ("fast", "low-memory", "prod-like")
+
+
+def profile_params(
+    profile: ProfileType,
+    implementation: Union[Literal["mariadb"], Literal["mysql"]],
+    version: str,
+) -> List[str]:
+    """Return mysqld parameters for a given profile, valid for a given server.
+
+    * ``fast`` - no durability: no log flushing on commit, no doublewrite buffer
+      and no binary log.
+    * ``low-memory`` - small buffers and caches, few connections
+      and no performance schema, for running many servers in parallel.
+    * ``prod-like`` - durable settings, as on production servers.
+
+    :param profile: profile name
+    :param implementation: server's implementation
+    :param version: server's version
+    """
+    is_mysql8 = implementation == "mysql" and parse(version) >= parse("8.0")
+    # innodb_doublewrite became an enum in MySQL 8.0.30
+    doublewrite_off = (
+        "OFF" if implementation == "mysql" and parse(version) >= parse("8.0.30") else "0"
+    )
+    if profile == "fast":
+        params = [
+            "--innodb-flush-log-at-trx-commit=0",
+            f"--innodb-doublewrite={doublewrite_off}",
+            "--sync-binlog=0",
+            # no --skip-name-resolve, it breaks grants for users at localhost connecting over TCP
+        ]
+        if is_mysql8:
+            # binary log is enabled by default since MySQL 8.0
+            params.append("--skip-log-bin")
+        return params
+    if profile == "low-memory":
+        params = [
+            "--innodb-buffer-pool-size=8M",
+            "--innodb-log-buffer-size=1M",
+            "--key-buffer-size=1M",
+            "--max-connections=20",
+            "--table-open-cache=64",
+            "--table-definition-cache=400",
+            "--thread-cache-size=0",
+            "--tmp-table-size=1M",
+            "--max-heap-table-size=1M",
+            "--performance-schema=0",
+        ]
+        if is_mysql8:
+            params.append("--temptable-max-ram=2M")
+        return params
+    if profile == "prod-like":
+        return [
+            "--innodb-flush-log-at-trx-commit=1",
+            f"--innodb-doublewrite={'ON' if doublewrite_off == 'OFF' else '1'}",
+            "--sync-binlog=1",
+        ]
+    raise ValueError(f"Unknown profile {profile}, choose one of {', '.join(PROFILES)}")
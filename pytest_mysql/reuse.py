@@ -0,0 +1,137 @@
+"""Keeping MySQL server running in between test runs."""
+
+import getpass
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from pytest_mysql.executor import handshake_received
+
+
+def servers_directory(cache_dir: Union[str, Path, None]) -> Path:
+    """Return directory to keep reused servers' state and data in."""
+    if cache_dir:
+        return Path(cache_dir) / "servers"
+    return Path(tempfile.gettempdir()) / f"pytest-mysql-{getpass.getuser()}"
+
+
+def registry_path() -> Path:
+    """Return file listing all reused servers, whichever cache directory they're kept in."""
+    return servers_directory(None) / "registry"
+
+
+class ReusedServer:
+    """Server left running after the test run, to be attached to by the next one.
+
+    Server's state (connection details, pid, version and settings it was started with)
+    is kept in a state file next to server's base directory, and its base directory
+    is listed in the registry, so that it can be stopped without knowing the cache directory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize reused server.
+
+        :param path: server's base directory, state file is placed next to it.
+        """
+        self.base_directory = path
+        self.state_path = path.with_suffix(".json")
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Read server's state, None if it has not been recorded."""
+        if not self.state_path.exists():
+            return None
+        state: Dict[str, Any] = json.loads(self.state_path.read_text())
+        return state
+
+    def write(self, state: Dict[str, Any]) -> None:
+        """Record server's state."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state))
+        entry = str(self.base_directory.absolute())
+        registry = registry_path()
+        if entry not in _registry_entries(registry):
+            registry.parent.mkdir(parents=True, exist_ok=True)
+            with registry.open("a") as registry_file:
+                registry_file.write(f"{entry}\n")
+
+    def attach(self, settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return server's state, if it's running with the given settings.
+
+        Server that is not responding, or was started with different settings
+        gets stopped.
+        """
+        state = self.read()
+        if state is None:
+            return None
+        if (
+            state["settings"] == settings
+            and _pid_running(state["pid"])
+            and handshake_received(state["unixsocket"])
+        ):
+            return state
+        self.stop()
+        return None
+
+    def stop(self, timeout: float = 60) -> None:
+        """Stop the server, and remove its files."""
+        state = self.read()
+        if state and state["pid"] and _pid_running(state["pid"]):
+            os.kill(state["pid"], signal.SIGTERM)
+            deadline = time.monotonic() + timeout
+            while _pid_running(state["pid"]):
+                if time.monotonic() > deadline:
+                    os.kill(state["pid"], signal.SIGKILL)
+                    break
+                time.sleep(0.01)
+        if state and state.get("tmpfs_directory"):
+            shutil.rmtree(state["tmpfs_directory"], ignore_errors=True)
+        shutil.rmtree(self.base_directory, ignore_errors=True)
+        self.state_path.unlink(missing_ok=True)
+        entry = str(self.base_directory.absolute())
+        registry = registry_path()
+        entries = _registry_entries(registry)
+        if entry in entries:
+            registry.write_text("".join(f"{other}\n" for other in entries if other != entry))
+
+    @classmethod
+    def all(cls, directory: Path) -> Iterator["ReusedServer"]:
+        """Iterate over servers recorded in a given directory."""
+        if directory.is_dir():
+            for state_path in sorted(directory.glob("*.json")):
+                yield cls(state_path.with_suffix(""))
+
+    @classmethod
+    def registered(cls) -> Iterator["ReusedServer"]:
+        """Iterate over servers listed in the registry, that still have their state recorded."""
+        for entry in _registry_entries(registry_path()):
+            reused_server = cls(Path(entry))
+            if reused_server.state_path.exists():
+                yield reused_server
+
+
+def _registry_entries(registry: Path) -> List[str]:
+    if not registry.exists():
+        return []
+    # pytest-xdist workers might have registered the same server at once
+    return list(dict.fromkeys(registry.read_text().splitlines()))
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        # reap the server if it was started by this process, it'd stay a zombie otherwise
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,205 @@
+"""Bulk loading of rows into tables of the test database."""
+
+import csv
+import os
+import tempfile
+import threading
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from pymysql import Connection, MySQLError
+from pymysql.constants import ER
+
+# server refused loading local data: disabled by local_infile system variable
+# (MySQL 8.0 reports it with its own error code)
+LOCAL_INFILE_DISABLED = (ER.NOT_ALLOWED_COMMAND, 3948)
+# rows are written into the pipe in chunks of about that size
+CHUNK_SIZE = 64 * 1024
+
+SeedType = Union[Path, Iterable[Sequence[Any]]]
+
+
+def seed(
+    connection: Connection,
+    table: str,
+    data: SeedType,
+    columns: Optional[Sequence[str]] = None,
+    header: bool = True,
+    batch_size: int = 1000,
+) -> int:
+    """Load rows into the table, without keeping all of them in memory.
+
+    Rows are streamed through ``LOAD DATA LOCAL INFILE`` - CSV file directly,
+    other rows through a named pipe. If the server or the connection doesn't allow
+    loading local data, rows are inserted with multi-row ``INSERT`` statements instead.
+    Loaded rows are not committed.
+
+    :param connection: connection to the database, see client fixture
+    :param table: table's name
+    :param data: path to CSV file (comma separated, optionally quoted with ``"``,
+        unquoted ``NULL`` for NULL values) or iterable of rows
+    :param columns: names of table's columns, in the order of rows' values.
+        By default, read from CSV file's header or all table's columns.
+    :param header: whether CSV file's first line names the columns
+    :param batch_size: number of rows inserted by single ``INSERT`` statement
+    :returns: number of loaded rows
+    """
+    if isinstance(data, Path) and header and columns is None:
+        with open(data, newline="") as csv_file:
+            columns = next(csv.reader(csv_file))
+    # pymysql fails reading the response, if the server asks for a file it's not allowed to send
+    if getattr(connection, "_local_infile", False):
+        try:
+            if isinstance(data, Path):
+                return _load_data(connection, table, str(data), columns, header)
+            return _load_rows(connection, table, data, columns)
+        except _LocalInfileDisabled:
+            pass
+    if isinstance(data, Path):
+        return _insert(connection, table, _read_csv(data, header), columns, batch_size)
+    return _insert(connection, table, iter(data), columns, batch_size)
+
+
+class _LocalInfileDisabled(Exception):
+    """Server doesn't allow loading local data."""
+
+
+def _load_data(
+    connection: Connection,
+    table: str,
+    path: str,
+    columns: Optional[Sequence[str]],
+    ignore_header: bool = False,
+) -> int:
+    """Run LOAD DATA LOCAL INFILE, reading a given file."""
+    query = (
+        f"LOAD DATA LOCAL INFILE {connection.escape(path)} INTO TABLE `{table}` "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        "LINES TERMINATED BY '\\n'"
+    )
+    if ignore_header:
+        query += " IGNORE 1 LINES"
+    if columns:
+        query += f" ({', '.join(f'`{column}`' for column in columns)})"
+    try:
+        with connection.cursor() as cursor:
+            loaded: int = cursor.execute(query)
+            return loaded
+    except MySQLError as e:
+        if e.args and e.args[0] in LOCAL_INFILE_DISABLED:
+            raise _LocalInfileDisabled() from e
+        raise
+
+
+def _load_rows(
+    connection: Connection,
+    table: str,
+    rows: Iterable[Sequence[Any]],
+    columns: Optional[Sequence[str]],
+) -> int:
+    """Stream rows through a named pipe, read by LOAD DATA LOCAL INFILE."""
+    with tempfile.TemporaryDirectory(prefix="pytest-mysql-seed-") as tmpdir:
+        fifo = os.path.join(tmpdir, f"{table}.csv")
+        os.mkfifo(fifo)
+        writer = _PipeWriter(fifo, rows)
+        try:
+            loaded = _load_data(connection, table, fifo, columns)
+        finally:
+            # writer still waits for the pipe to be opened, if the server never read it
+            writer.cancel()
+        writer.join()
+    return loaded
+
+
+class _PipeWriter:
+    """Thread writing rows into a named pipe, as CSV read by LOAD DATA."""
+
+    def __init__(self, fifo: str, rows: Iterable[Sequence[Any]]) -> None:
+        self.fifo = fifo
+        self.rows = rows
+        self._cancelled = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def _write(self) -> None:
+        try:
+            # blocks until the pipe gets opened for reading
+            with open(self.fifo, "wb") as pipe:
+                # rows of the cancelled load are left for the INSERT fallback
+                if self._cancelled.is_set():
+                    return
+                chunk: List[bytes] = []
+                size = 0
+                for row in self.rows:
+                    line = _csv_line(row)
+                    chunk.append(line)
+                    size += len(line)
+                    if size >= CHUNK_SIZE:
+                        pipe.write(b"".join(chunk))
+                        chunk, size = [], 0
+                pipe.write(b"".join(chunk))
+        except BrokenPipeError:
+            pass
+        except BaseException as e:
+            self._error = e
+
+    def cancel(self) -> None:
+        """Stop the writer, that might still be waiting for the pipe to get opened."""
+        self._cancelled.set()
+        fd = os.open(self.fifo, os.O_RDONLY | os.O_NONBLOCK)
+        self._thread.join()
+        os.close(fd)
+
+    def join(self) -> None:
+        """Wait for all rows to be written, and raise writer's error if any."""
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+
+def _csv_value(value: Any) -> bytes:
+    if value is None:
+        return b"NULL"
+    if isinstance(value, bool):
+        value = int(value)
+    encoded = value if isinstance(value, bytes) else str(value).encode("utf-8")
+    return b'"' + encoded.replace(b'"', b'""') + b'"'
+
+
+def _csv_line(row: Sequence[Any]) -> bytes:
+    return b",".join(_csv_value(value) for value in row) + b"\n"
+
+
+def _read_csv(path: Path, header: bool) -> Iterator[List[Optional[str]]]:
+    """Read CSV file's rows, the way LOAD DATA would."""
+    with open(path, newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        if header:
+            next(reader, None)
+        for row in reader:
+            yield [None if value == "NULL" else value for value in row]
+
+
+def _insert(
+    connection: Connection,
+    table: str,
+    rows: Iterator[Sequence[Any]],
+    columns: Optional[Sequence[str]],
+    batch_size: int,
+) -> int:
+    """Insert rows with multi-row INSERT statements, batch by batch."""
+    first_row = next(rows, None)
+    if first_row is None:
+        return 0
+    column_list = f" ({', '.join(f'`{column}`' for column in columns)})" if columns else ""
+    placeholders = ", ".join(["%s"] * len(first_row))
+    query = f"INSERT INTO `{table}`{column_list} VALUES ({placeholders})"
+    inserted = 0
+    rows = chain([first_row], rows)
+    with connection.cursor() as cursor:
+        while batch := list(islice(rows, batch_size)):
+            inserted += cursor.executemany(query, batch) or 0
+    return inserted
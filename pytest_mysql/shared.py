@@ -0,0 +1,122 @@
+"""Sharing single MySQL server between pytest-xdist workers."""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from warnings import warn
+
+
+def _alive(pid: int) -> bool:
+    """Check whether the process is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedServer:
+    """State of the server shared between pytest-xdist workers.
+
+    Workers coordinate through a state file guarded by a file lock,
+    both placed in the directory shared by all workers.
+    First worker to attach starts the server, and records how to connect to it.
+    Others only add their process ids to the attached workers.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize shared server.
+
+        :param path: path prefix for state and lock files,
+            within the directory shared by all workers.
+        """
+        self.state_path = path.with_suffix(".json")
+        self.lock_path = path.with_suffix(".lock")
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold exclusive lock on the shared state."""
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Read shared server's state, None if server is not running."""
+        if not self.state_path.exists():
+            return None
+        state: Dict[str, Any] = json.loads(self.state_path.read_text())
+        return state
+
+    def write(self, state: Optional[Dict[str, Any]]) -> None:
+        """Write shared server's state, remove it if None is passed."""
+        if state is None:
+            self.state_path.unlink(missing_ok=True)
+        else:
+            self.state_path.write_text(json.dumps(state))
+
+    def attach(self) -> Optional[Dict[str, Any]]:
+        """Attach worker to the running server.
+
+        Has to be called with the lock held.
+
+        :returns: server's state, None if server has not been started yet.
+        """
+        state = self.read()
+        if state is not None:
+            state["workers"].append(os.getpid())
+            self.write(state)
+        return state
+
+    def start(self, state: Dict[str, Any]) -> None:
+        """Record how to connect to the server started by this worker.
+
+        Has to be called with the lock held.
+        """
+        self.write({**state, "workers": [os.getpid()]})
+
+    def detach(self) -> None:
+        """Detach worker from the server."""
+        with self.locked():
+            state = self.read()
+            assert state
+            state["workers"].remove(os.getpid())
+            self.write(state)
+
+    @contextmanager
+    def last_worker(self, interval: float = 0.1, timeout: float = 300) -> Iterator[None]:
+        """Wait until all workers detach, and hold the lock.
+
+        Workers that died without detaching (like the ones crashed and restarted
+        by pytest-xdist) are not waited for. After the timeout, server gets stopped
+        with a warning, even if other workers are still attached.
+
+        Server can be stopped and state removed within the context,
+        without other workers attaching in the meantime.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.locked():
+                state = self.read()
+                workers: List[int] = [
+                    pid for pid in (state or {}).get("workers", []) if _alive(pid)
+                ]
+                if workers and time.monotonic() >= deadline:
+                    warn(
+                        f"Stopping shared MySQL server, while workers {workers} "
+                        f"are still attached after {timeout}s."
+                    )
+                    workers = []
+                if not workers:
+                    yield
+                    self.write(None)
+                    return
+            time.sleep(interval)
@@ -0,0 +1,75 @@
+"""Server status counters' changes over each test."""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Literal, Optional, TextIO
+
+from pymysql import Connection
+
+StatusScope = Literal["GLOBAL", "SESSION"]
+
+DEFAULT_COUNTERS = (
+    "Innodb_buffer_pool_read_requests",
+    "Innodb_buffer_pool_reads",
+    "Created_tmp_tables",
+    "Created_tmp_disk_tables",
+    "Sort_merge_passes",
+    "Innodb_row_lock_waits",
+    "Innodb_row_lock_time",
+    "Table_locks_waited",
+    "Bytes_sent",
+    "Bytes_received",
+)
+
+
+def read_status(
+    connection: Connection, scope: StatusScope, counters: Iterable[str]
+) -> Dict[str, int]:
+    """Read status counters of the server or connection's session.
+
+    :param connection: connection to read the status with
+    :param scope: ``GLOBAL`` for server's counters, ``SESSION`` for connection's ones.
+        Counters without session value (like InnoDB's ones) report global value in both.
+    :param counters: names of the counters
+    :returns: counters' values, skipping unknown and non-numeric ones
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SHOW {scope} STATUS WHERE Variable_name IN %s", (tuple(counters),))
+        return {name: int(value) for name, value in cursor.fetchall() if value.isdigit()}
+
+
+def delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    """Return counters' changes in between readings."""
+    return {name: value - before[name] for name, value in after.items() if name in before}
+
+
+class StatusLog:
+    """JSON Lines file with status counters' changes, a line per test."""
+
+    def __init__(self) -> None:
+        """Initialize log, not written anywhere until it's started."""
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def start(self, path: Path) -> None:
+        """Start writing into the file, replacing its previous content."""
+        with self._lock:
+            self._file = open(path, "w")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write test's record, if the log has been started."""
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        """Stop writing into the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+status_log = StatusLog()
@@ -0,0 +1,100 @@
+"""Template database cloned into test databases."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Collection, Dict, List, NamedTuple, Optional
+
+from pymysql import Connection
+
+
+class TableDefinition(NamedTuple):
+    """Template's table definition needed to clone it."""
+
+    name: str
+    create_statement: str
+    columns: str
+    has_rows: bool
+
+
+class TemplateDatabase:
+    """Database loaded once, and cloned into each test's database.
+
+    Tables are recreated from ``SHOW CREATE TABLE`` output (``CREATE TABLE ... LIKE``
+    would skip foreign keys) and filled with ``INSERT ... SELECT``.
+    Tables are split between worker threads, each using its own connection.
+    Views, triggers and stored routines are not cloned.
+    """
+
+    def __init__(self, connection_kwargs: Dict[str, Any], dbname: str, workers: int) -> None:
+        """Read template database's definition.
+
+        :param connection_kwargs: pymysql's connection keyword arguments
+        :param dbname: template database name, that has already been loaded
+        :param workers: maximum number of threads cloning tables
+        """
+        self.connection_kwargs = connection_kwargs
+        self.dbname = dbname
+        self.workers = workers
+        self.tables = self._read_tables()
+
+    def _read_tables(self) -> List[TableDefinition]:
+        mysql_conn = Connection(**self.connection_kwargs)
+        tables = []
+        with mysql_conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_NAME FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME",
+                (self.dbname,),
+            )
+            for (table,) in cursor.fetchall():
+                cursor.execute(f"SHOW CREATE TABLE `{self.dbname}`.`{table}`")
+                create_statement = cursor.fetchone()[1]
+                # generated columns can not be inserted into
+                cursor.execute(
+                    "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s "
+                    "AND EXTRA NOT LIKE '%%GENERATED%%' ORDER BY ORDINAL_POSITION",
+                    (self.dbname, table),
+                )
+                columns = ", ".join(f"`{column}`" for (column,) in cursor.fetchall())
+                has_rows = bool(cursor.execute(f"SELECT 1 FROM `{self.dbname}`.`{table}` LIMIT 1"))
+                tables.append(TableDefinition(table, create_statement, columns, has_rows))
+        mysql_conn.close()
+        return tables
+
+    def clone(self, dbname: str, table_names: Optional[Collection[str]] = None) -> None:
+        """Clone template's tables into already created database.
+
+        :param dbname: target database name
+        :param table_names: names of tables to clone, all tables by default
+        """
+        tables = self.tables
+        if table_names is not None:
+            tables = [table for table in tables if table.name in table_names]
+        if not tables:
+            return
+        workers = min(self.workers, len(tables))
+        batches = [tables[worker::workers] for worker in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # consume results to raise exceptions from worker threads
+            list(pool.map(lambda batch: self.clone_tables(dbname, batch), batches))
+
+    def clone_tables(self, dbname: str, tables: List[TableDefinition]) -> None:
+        """Clone given template's tables using a single connection."""
+        mysql_conn = Connection(db=dbname, **self.connection_kwargs)
+        # tables get created in any order, foreign keys might not be resolved yet
+        mysql_conn.query("SET SESSION FOREIGN_KEY_CHECKS = 0")
+        for table in tables:
+            mysql_conn.query(table.create_statement)
+            if table.has_rows:
+                mysql_conn.query(
+                    f"INSERT INTO `{dbname}`.`{table.name}` ({table.columns}) "
+                    f"SELECT {table.columns} FROM `{self.dbname}`.`{table.name}`"
+                )
+        mysql_conn.commit()
+        mysql_conn.close()
+
+    def drop(self) -> None:
+        """Drop template database."""
+        mysql_conn = Connection(**self.connection_kwargs)
+        mysql_conn.query(f"DROP DATABASE IF EXISTS `{self.dbname}`")
+        mysql_conn.close()
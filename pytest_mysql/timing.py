@@ -0,0 +1,110 @@
+"""Timing of fixtures' setup and teardown phases."""
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, DefaultDict, Dict, Iterator, List, Tuple
+
+
+def percentile(durations: List[float], fraction: float) -> float:
+    """Return nearest-rank percentile of durations."""
+    ordered = sorted(durations)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class Timings:
+    """Durations of fixtures' phases, collected across the test session.
+
+    Phases can be measured from several threads at once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty timings."""
+        self._durations: DefaultDict[Tuple[str, str], List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, fixture: str, phase: str) -> Iterator[None]:
+        """Measure duration of the phase within the context.
+
+        :param fixture: fixture's name
+        :param phase: phase's name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(fixture, phase, time.perf_counter() - start)
+
+    def record(self, fixture: str, phase: str, duration: float) -> None:
+        """Record phase's duration in seconds."""
+        with self._lock:
+            self._durations[(fixture, phase)].append(duration)
+
+    def durations(self) -> List[Tuple[str, str, List[float]]]:
+        """Return all recorded durations, in a form pytest-xdist can send to the controller."""
+        with self._lock:
+            return [
+                (fixture, phase, list(phase_durations))
+                for (fixture, phase), phase_durations in self._durations.items()
+            ]
+
+    def merge(self, durations: List[Tuple[str, str, List[float]]]) -> None:
+        """Add durations recorded by another process, see :meth:`durations`."""
+        with self._lock:
+            for fixture, phase, phase_durations in durations:
+                self._durations[(fixture, phase)].extend(phase_durations)
+
+    def clear(self) -> None:
+        """Remove all recorded durations."""
+        with self._lock:
+            self._durations.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate durations per fixture and phase, in seconds."""
+        with self._lock:
+            durations = dict(self._durations)
+        return [
+            {
+                "fixture": fixture,
+                "phase": phase,
+                "count": len(phase_durations),
+                "total": sum(phase_durations),
+                "p50": percentile(phase_durations, 0.5),
+                "p95": percentile(phase_durations, 0.95),
+                "max": max(phase_durations),
+            }
+            for (fixture, phase), phase_durations in sorted(durations.items())
+        ]
+
+    def report(self) -> List[str]:
+        """Format summary as table lines, with durations in milliseconds."""
+        header = ("fixture", "phase", "count", "total", "p50", "p95", "max")
+        rows = [
+            (
+                row["fixture"],
+                row["phase"],
+                str(row["count"]),
+                *(f"{row[column] * 1000:.1f}" for column in ("total", "p50", "p95", "max")),
+            )
+            for row in self.summary()
+        ]
+        widths = [max(len(row[column]) for row in [header, *rows]) for column in range(7)]
+        return [
+            "  ".join(
+                cell.ljust(width) if column < 2 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in [header, *rows]
+        ]
+
+    def write_json(self, path: Path) -> None:
+        """Write summary into JSON file."""
+        path.write_text(json.dumps(self.summary(), indent=2))
+
+
+timings = Timings()
@@ -0,0 +1,86 @@
+"""Connection running whole test within a single transaction."""
+
+import re
+from typing import Any
+
+from pymysql import Connection, MySQLError
+from pymysql.constants import SERVER_STATUS
+
+# statements committing pending changes, before starting a new transaction
+BEGIN_STATEMENT = re.compile(r"\s*(BEGIN|START\s+TRANSACTION)\b", re.IGNORECASE)
+
+
+class TransactionalConnection(Connection):
+    """Connection keeping all test's changes within one transaction.
+
+    Transaction control used by the test (begin, commit, rollback) is turned
+    into savepoints, so everything the test did can be rolled back at the end.
+    ``BEGIN`` and ``START TRANSACTION`` queries are turned into savepoints as well.
+    Statements committing implicitly (DDL, LOCK TABLES, explicit COMMIT query)
+    can not be rolled back, and are detected through server status flags,
+    or by the savepoint set at the beginning of the test missing at its end.
+    """
+
+    SAVEPOINT = "pytest_mysql"
+    START_SAVEPOINT = "pytest_mysql_start"
+    server_status: int
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Open connection with autocommit turned off."""
+        self.implicit_commit = False
+        self._transaction_started = False
+        kwargs["autocommit"] = False
+        super().__init__(*args, **kwargs)
+
+    def start_transaction(self) -> None:
+        """Begin transaction wrapping the test."""
+        super().begin()
+        self.query(f"SAVEPOINT {self.START_SAVEPOINT}")
+        self.query(f"SAVEPOINT {self.SAVEPOINT}")
+        self._transaction_started = True
+
+    def rollback_transaction(self) -> None:
+        """Roll back transaction wrapping the test.
+
+        Savepoint set at the beginning of the test is gone,
+        if test's transaction got committed without changing server status flags.
+        """
+        self._transaction_started = False
+        try:
+            super().query(f"ROLLBACK TO SAVEPOINT {self.START_SAVEPOINT}")
+        except MySQLError:
+            self.implicit_commit = True
+        super().rollback()
+
+    def begin(self) -> None:
+        """Mark beginning of test's transaction with savepoint."""
+        self.query(f"SAVEPOINT {self.SAVEPOINT}")
+
+    def commit(self) -> None:
+        """Move savepoint instead of committing test's transaction."""
+        self.query(f"SAVEPOINT {self.SAVEPOINT}")
+
+    def rollback(self) -> None:
+        """Roll back changes made since the last commit or begin."""
+        self.query(f"ROLLBACK TO SAVEPOINT {self.SAVEPOINT}")
+
+    def autocommit(self, value: Any) -> None:
+        """Set autocommit mode, which commits pending changes when turned on."""
+        super().autocommit(value)
+        self._check_transaction()
+
+    def query(self, sql: Any, unbuffered: bool = False) -> int:
+        """Run query, and check whether it committed test's transaction."""
+        text = sql.decode(errors="replace") if isinstance(sql, bytes) else str(sql)
+        if self._transaction_started and BEGIN_STATEMENT.match(text):
+            # starting a new transaction would commit test's one
+            sql = f"SAVEPOINT {self.SAVEPOINT}"
+        result = super().query(sql, unbuffered)
+        self._check_transaction()
+        return result
+
+    def _check_transaction(self) -> None:
+        if self._transaction_started and not (
+            self.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS
+        ):
+            self.implicit_commit = True
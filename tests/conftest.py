@@ -1,11 +1,76 @@
 """Tests main conftest file."""
 
+from pathlib import Path
+
 from pytest_mysql import factories
 from pytest_mysql.plugin import *  # noqa: F403
+from tests.loader import load_broken
+
+pytest_plugins = ["pytester"]
+
+TEST_SQL_DIR = Path(__file__).parent / "test_sql"
 
 # pylint:disable=invalid-name
 mysql_proc2 = factories.mysql_proc(port=3308)
 mysql2 = factories.mysql("mysql_proc2", dbname="test-db")
 mysql_rand_proc = factories.mysql_proc(port=None)
 mysql_rand = factories.mysql("mysql_rand_proc")
+mysql_procs = factories.mysql_proc_group("mysql_proc2", "mysql_rand_proc")
+mysql_schema_proc = factories.mysql_proc(port=None, schema=[TEST_SQL_DIR / "schema.sql"])
+mysql_schema = factories.mysql("mysql_schema_proc")
+mysql_transaction = factories.mysql(
+    "mysql_proc",
+    dbname="test-transaction",
+    isolation="transaction",
+    load=[TEST_SQL_DIR / "pets.sql"],
+)
+mysql_template = factories.mysql(
+    "mysql_proc",
+    dbname="test-template",
+    load=[TEST_SQL_DIR / "pets.sql", TEST_SQL_DIR / "owners.sql"],
+    template=True,
+)
+mysql_tables = factories.mysql(
+    "mysql_proc",
+    dbname="test-tables",
+    isolation="tables",
+    load=[TEST_SQL_DIR / "pets.sql", TEST_SQL_DIR / "owners.sql"],
+)
+mysql_tables_checksum = factories.mysql(
+    "mysql_proc",
+    dbname="test-tables-checksum",
+    isolation="tables",
+    load=[TEST_SQL_DIR / "pets.sql", TEST_SQL_DIR / "owners.sql"],
+    dirty_tracking="checksum",
+)
+mysql_tables_cascade = factories.mysql(
+    "mysql_proc",
+    dbname="test-tables-cascade",
+    isolation="tables",
+    load=[TEST_SQL_DIR / "cascade.sql"],
+)
+mysql_pool = factories.mysql(
+    "mysql_proc",
+    dbname="test-pool",
+    load=[TEST_SQL_DIR / "pets.sql"],
+    db_pool_size=2,
+)
+mysql_readonly = factories.mysql_readonly(
+    "mysql_proc", dbname="test-readonly", load=[TEST_SQL_DIR / "pets.sql"]
+)
+mysql_readonly_session = factories.mysql_readonly(
+    "mysql_proc",
+    dbname="test-readonly-session",
+    load=[TEST_SQL_DIR / "pets.sql"],
+    scope="module",
+    read_only="session",
+)
+mysql_readonly_broken = factories.mysql_readonly(
+    "mysql_proc", dbname="test-readonly-broken", load=[TEST_SQL_DIR / "pets.sql", load_broken]
+)
+mysql_digests = factories.mysql("mysql_proc", dbname="test-digests", digests=True)
+mysql_pool_digests = factories.mysql(
+    "mysql_proc", dbname="test-pool-digests", db_pool_size=2, digests=True
+)
+mysql_status = factories.mysql("mysql_proc", dbname="test-status", status=True)
 # pylint:enable=invalid-name
@@ -0,0 +1,25 @@
+"""Loader callables used in tests."""
+
+from typing import Any
+
+from pymysql import Connection
+
+
+def load_pets(**kwargs: Any) -> None:
+    """Create and fill pet table."""
+    connection = Connection(**kwargs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE pet (name VARCHAR(20), owner VARCHAR(20), "
+            "species VARCHAR(20), sex CHAR(1), birth DATE, death DATE)"
+        )
+        cursor.execute(
+            "INSERT INTO pet VALUES ('Fluffy', 'Harold', 'cat', 'f', '1993-02-04', NULL)"
+        )
+    connection.commit()
+    connection.close()
+
+
+def load_broken(**kwargs: Any) -> None:
+    """Fail loading the data."""
+    raise ValueError("Broken data")
@@ -0,0 +1,45 @@
+"""Tests for asyncio client fixture."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from pytest_mysql import factories
+from tests.conftest import TEST_SQL_DIR
+
+pytest.importorskip("aiomysql")
+pytest.importorskip("pytest_asyncio")
+
+# pylint:disable=invalid-name
+mysql_async = factories.mysql_async(
+    "mysql_proc", dbname="test-async", load=[TEST_SQL_DIR / "pets.sql"]
+)
+# pylint:enable=invalid-name
+
+
+async def count_pets(pool: Any) -> int:
+    """Count pets in the test database, on the connection taken from the pool."""
+    async with pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute("SELECT COUNT(*) FROM pet")
+            (count,) = await cursor.fetchone()
+            return int(count)
+
+
+@pytest.mark.asyncio
+async def test_mysql_async(mysql_async: Any) -> None:
+    """Pool connects to the loaded test database."""
+    async with mysql_async.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute("SELECT DATABASE()")
+            assert await cursor.fetchone() == ("test-async",)
+    assert await count_pets(mysql_async) > 0
+
+
+@pytest.mark.asyncio
+async def test_mysql_async_concurrent_queries(mysql_async: Any) -> None:
+    """Many queries run concurrently, sharing pool's connections."""
+    counts = await asyncio.gather(*(count_pets(mysql_async) for _ in range(20)))
+    assert len(set(counts)) == 1
+    assert mysql_async.size == mysql_async.maxsize
@@ -0,0 +1,59 @@
+"""Tests for the benchmark suite's helpers."""
+
+from typing import Any, Dict
+
+from pymysql import Connection
+
+from benchmarks.fake_server import FakeMySQLServer
+from benchmarks.run import client_metrics, compare
+
+
+def test_fake_server() -> None:
+    """Fake server accepts connections, and answers the client fixture's queries."""
+    with FakeMySQLServer() as server:
+        connection = Connection(host=server.host, port=server.port, user="root", password="")
+        connection.query("CREATE DATABASE `test`")
+        connection.query("USE `test`")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert not cursor.fetchall()
+        connection.close()
+
+
+def _results(setup: float, throughput: float) -> Dict[str, Any]:
+    return {
+        "targets": {
+            "fake": {
+                "status": "ok",
+                "metrics": {"client_setup_p50": setup, "throughput": throughput},
+            },
+            "mysql": {"status": "skipped", "reason": "mysqld binary not found"},
+        }
+    }
+
+
+def test_compare() -> None:
+    """Durations regress when they go up, throughput when it goes down."""
+    baseline = _results(setup=0.010, throughput=100)
+    assert not compare(baseline, _results(setup=0.011, throughput=90), threshold=0.2)
+    assert compare(baseline, _results(setup=0.013, throughput=100), threshold=0.2) == [
+        "fake client_setup_p50"
+    ]
+    assert compare(baseline, _results(setup=0.010, throughput=70), threshold=0.2) == [
+        "fake throughput"
+    ]
+
+
+def test_client_metrics() -> None:
+    """Latency percentiles come from tests' setup and teardown, leaving process fixture's out."""
+    run = {
+        "durations": [2.0, 0.1, 0.1, 0.2, 3.0],
+        "setup": [1.9, 0.01, 0.02, 0.03, 0.04],
+        "teardown": [0.01, 0.02, 0.03, 0.04, 2.9],
+    }
+    metrics = client_metrics(run)
+    assert metrics["client_setup_p50"] == 0.02
+    assert metrics["client_setup_p95"] == 0.04
+    assert metrics["client_teardown_p50"] == 0.02
+    assert metrics["client_teardown_p95"] == 0.04
+    assert metrics["throughput"] == 3 / 0.4
@@ -0,0 +1,93 @@
+"""Tests for query budget."""
+
+from typing import Iterator, Optional, Tuple
+from unittest.mock import patch
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.budget import QueryCounter, query_budget
+from pytest_mysql.exceptions import QueryBudgetExceeded
+
+
+class FakeCounter:
+    """Counter returning given counts in turn."""
+
+    def __init__(self, connection: Connection, tracker: Optional[Connection]) -> None:
+        """Prepare counts."""
+        self.counts: Iterator[Tuple[int, int]] = iter([(10, 100), (13, 400)])
+
+    def counters(self) -> Tuple[int, int]:
+        """Return next counts."""
+        return next(self.counts)
+
+    def since(self, before: Tuple[int, int]) -> Tuple[int, int]:
+        """Return difference of counts."""
+        after = self.counters()
+        return after[0] - before[0], after[1] - before[1]
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+@pytest.mark.parametrize(
+    "max_queries, max_rows_examined, message",
+    (
+        (2, None, "3 queries run, 2 allowed"),
+        (None, 299, "300 rows examined, 299 allowed"),
+        (1, 1, "3 queries run, 1 allowed; 300 rows examined, 1 allowed"),
+    ),
+)
+def test_query_budget_exceeded(
+    max_queries: Optional[int], max_rows_examined: Optional[int], message: str
+) -> None:
+    """Exceeding any of the limits fails with counts in the message."""
+    with patch("pytest_mysql.budget.QueryCounter", FakeCounter):
+        with pytest.raises(QueryBudgetExceeded, match=message):
+            with query_budget(None, max_queries, max_rows_examined):  # type: ignore[arg-type]
+                pass
+
+
+def test_query_budget_within_limits() -> None:
+    """Usage is filled in once the block ends."""
+    with patch("pytest_mysql.budget.QueryCounter", FakeCounter):
+        with query_budget(None, max_queries=3, max_rows_examined=300) as usage:  # type: ignore
+            pass
+    assert (usage.queries, usage.rows_examined) == (3, 300)
+
+
+def test_query_budget(mysql: Connection) -> None:
+    """N+1 queries exceed the budget."""
+    with mysql.cursor() as cursor:
+        cursor.execute("CREATE TABLE owner (id INT PRIMARY KEY, name VARCHAR(20))")
+        cursor.executemany("INSERT INTO owner VALUES (%s, %s)", [(i, str(i)) for i in range(50)])
+    with pytest.raises(QueryBudgetExceeded, match="10 queries run, 5 allowed"):
+        with query_budget(mysql, max_queries=5):
+            with mysql.cursor() as cursor:
+                for owner_id in range(10):
+                    cursor.execute("SELECT name FROM owner WHERE id = %s", (owner_id,))
+    with query_budget(mysql, max_queries=1) as usage:
+        with mysql.cursor() as cursor:
+            cursor.execute("SELECT name FROM owner WHERE name LIKE '1%'")
+    assert usage.queries == 1
+    assert usage.rows_examined >= 50
+
+
+@pytest.mark.parametrize("performance_schema", (True, False))
+def test_query_counter(mysql: Connection, performance_schema: bool) -> None:
+    """Both performance schema's and session status counters count statements and rows."""
+    with mysql.cursor() as cursor:
+        cursor.execute("CREATE TABLE pet (name VARCHAR(20))")
+        cursor.executemany("INSERT INTO pet VALUES (%s)", [(str(i),) for i in range(20)])
+        cursor.execute("SELECT @@performance_schema")
+        if performance_schema and not cursor.fetchone()[0]:
+            pytest.skip("performance_schema is turned off")
+    counter = QueryCounter(mysql, performance_schema=performance_schema)
+    before = counter.counters()
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT * FROM pet")
+        cursor.execute("SELECT * FROM pet")
+    statements, rows_examined = counter.since(before)
+    counter.close()
+    assert statements == 2
+    assert rows_examined >= 40
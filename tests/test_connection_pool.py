@@ -0,0 +1,105 @@
+"""Tests for the pool of connections reused in between tests."""
+
+from typing import Any, Dict, Iterator
+from unittest.mock import patch
+
+import pytest
+from pymysql import Connection, InternalError, ProgrammingError
+
+from benchmarks.fake_server import FakeMySQLServer
+from pytest_mysql.connection_pool import ConnectionPool
+from pytest_mysql.executor import MySQLExecutor
+
+
+@pytest.fixture
+def fake_kwargs() -> Iterator[Dict[str, Any]]:
+    """Start the fake server, and return its connection arguments."""
+    with FakeMySQLServer() as server:
+        yield {"host": server.host, "port": server.port, "user": "root", "password": ""}
+
+
+def test_connection_reused(fake_kwargs: Dict[str, Any]) -> None:
+    """Released connection is reset and handed out again, up to pool's size."""
+    pool = ConnectionPool(size=1)
+    first = pool.connect(fake_kwargs)
+    second = pool.connect(fake_kwargs)
+    assert first is not second
+    pool.release(first)
+    pool.release(second)
+    assert not second.open
+
+    assert pool.connect(fake_kwargs) is first
+    pool.release(first)
+    pool.close()
+    assert not first.open
+    assert pool.connect(fake_kwargs) is not first
+
+
+def test_closed_connection_not_kept(fake_kwargs: Dict[str, Any]) -> None:
+    """Connections closed by the test are not kept."""
+    pool = ConnectionPool()
+    mysql_conn = pool.connect(fake_kwargs)
+    mysql_conn.close()
+    pool.release(mysql_conn)
+    assert pool.connect(fake_kwargs) is not mysql_conn
+
+
+def test_reset_unsupported(fake_kwargs: Dict[str, Any]) -> None:
+    """Pool stops keeping connections, once server doesn't know the reset command."""
+    pool = ConnectionPool()
+    mysql_conn = pool.connect(fake_kwargs)
+    pool.release(mysql_conn)
+    with patch.object(mysql_conn, "_read_ok_packet", side_effect=InternalError(1047, "Unknown")):
+        assert pool.connect(fake_kwargs) is not mysql_conn
+    assert not mysql_conn.open
+    assert not pool.supported
+    new_conn = pool.connect(fake_kwargs)
+    pool.release(new_conn)
+    assert not new_conn.open
+
+
+def test_session_reset(mysql_proc: MySQLExecutor, mysql: Connection) -> None:
+    """Reused connection keeps its settings, but not test's session state."""
+    kwargs = {
+        "unix_socket": mysql_proc.unixsocket,
+        "user": mysql.user,
+        "password": mysql.password,
+        "database": mysql.db,
+    }
+    pool = ConnectionPool()
+    mysql_conn = pool.connect(kwargs)
+    mysql_conn.query("SET @leftover = 1")
+    mysql_conn.query("CREATE TEMPORARY TABLE leftover (id INT)")
+    mysql_conn.autocommit(True)
+    mysql_conn.begin()
+    pool.release(mysql_conn)
+
+    assert pool.connect(kwargs) is mysql_conn
+    with mysql_conn.cursor() as cursor:
+        cursor.execute("SELECT @leftover, @@autocommit, @@character_set_client")
+        assert cursor.fetchone() == (None, 0, mysql_conn.charset)
+        with pytest.raises(ProgrammingError):
+            cursor.execute("SELECT * FROM leftover")
+    pool.close()
+
+
+def test_connection_reused_with_same_arguments(fake_kwargs: Dict[str, Any]) -> None:
+    """Connections are only handed out to callers connecting with the same arguments."""
+    pool = ConnectionPool()
+    mysql_conn = pool.connect(fake_kwargs)
+    pool.release(mysql_conn)
+    other_kwargs = {**fake_kwargs, "user": "other"}
+    other_conn = pool.connect(other_kwargs)
+    assert other_conn is not mysql_conn
+    pool.release(other_conn)
+    assert pool.connect(fake_kwargs) is mysql_conn
+    assert pool.connect(other_kwargs) is other_conn
+    pool.close()
+
+
+def test_foreign_connection_not_kept(fake_kwargs: Dict[str, Any]) -> None:
+    """Connections opened outside of the pool are closed on release."""
+    pool = ConnectionPool()
+    mysql_conn = Connection(**fake_kwargs)
+    pool.release(mysql_conn)
+    assert not mysql_conn.open
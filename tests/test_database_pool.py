@@ -0,0 +1,76 @@
+"""Tests for the pool of databases created ahead of time."""
+
+import threading
+import time
+from typing import List
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.database_pool import DatabasePool
+
+
+def test_pool_creates_and_drops_databases() -> None:
+    """Pool keeps databases ready, and drops released ones in the background."""
+    created: List[str] = []
+    dropped: List[str] = []
+    pool = DatabasePool("test", 2, created.append, dropped.append)
+    first_db = pool.next_name()
+    created.append(first_db)
+    pool.start(first_db)
+
+    assert pool.get() == "test_pool0"
+    assert pool.get() == "test_pool1"
+    pool.release("test_pool0")
+    pool.release("test_pool1")
+    pool.close()
+
+    assert dropped[:2] == ["test_pool0", "test_pool1"]
+    # databases left ready in the pool get dropped on close as well
+    assert sorted(dropped) == sorted(created)
+
+
+def test_pool_size_kept() -> None:
+    """Pool creates no more databases than its size, until one of them gets taken."""
+    created: List[str] = []
+    pool = DatabasePool("test", 2, created.append, lambda dbname: None)
+    pool.start()
+    while len(created) < 2:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    assert created == ["test_pool0", "test_pool1"]
+
+    assert pool.get() == "test_pool0"
+    while len(created) < 3:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    assert created == ["test_pool0", "test_pool1", "test_pool2"]
+    pool.close()
+
+
+def test_pool_creation_error() -> None:
+    """Error raised while creating database in the background is raised to the test."""
+    created = threading.Event()
+
+    def create(dbname: str) -> None:
+        created.set()
+        raise RuntimeError(f"Can't create {dbname}")
+
+    pool = DatabasePool("test", 1, create, lambda dbname: None)
+    pool.start()
+    created.wait()
+    with pytest.raises(RuntimeError, match="Can't create test_pool0"):
+        pool.get()
+    pool.close()
+
+
+@pytest.mark.parametrize("owner", ("Harold", "Gwen"))
+def test_pool_database(mysql_pool: Connection, owner: str) -> None:
+    """Each test gets its own loaded database from the pool."""
+    with mysql_pool.cursor() as cursor:
+        cursor.execute("SELECT DATABASE()")
+        assert cursor.fetchone()[0].startswith("test-pool_pool")
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("DELETE FROM pet WHERE owner = %s", (owner,))
+    mysql_pool.commit()
@@ -0,0 +1,146 @@
+"""Tests for statement digests' profiling."""
+
+from pathlib import Path
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.digests import (
+    DigestStats,
+    DigestSummary,
+    StatementDigests,
+    format_digests,
+    top,
+)
+from pytest_mysql.executor import MySQLExecutor
+
+
+def stats(digest: str, calls: int, latency: float, examined: int, sent: int) -> DigestStats:
+    """Build digest's statistics."""
+    return DigestStats(digest, f"SELECT {digest}", calls, latency, examined, sent)
+
+
+def test_delta() -> None:
+    """Only statements run in between snapshots are taken, minus earlier statistics."""
+    before = {"a": stats("a", 2, 0.2, 20, 2), "b": stats("b", 1, 0.1, 10, 1)}
+    after = {
+        "a": stats("a", 5, 0.5, 50, 5),
+        "b": stats("b", 1, 0.1, 10, 1),
+        "c": stats("c", 1, 0.3, 0, 1),
+    }
+    changes = StatementDigests.delta(before, after)
+    assert changes[0] == stats("a", 3, 0.5 - 0.2, 30, 3)
+    assert changes[1:] == [stats("c", 1, 0.3, 0, 1)]
+
+
+def test_top() -> None:
+    """Digests are taken by each measure, and ordered by latency."""
+    digests = [
+        stats("slow", 1, 1.0, 1, 1),
+        stats("scan", 1, 0.1, 1000, 1),
+        stats("fetch", 1, 0.2, 10, 500),
+        stats("cheap", 1, 0.01, 1, 1),
+    ]
+    assert [digest.digest for digest in top(digests, 1)] == ["slow", "fetch", "scan"]
+    assert [digest.digest for digest in top(digests, 10)] == ["slow", "fetch", "scan", "cheap"]
+
+
+def test_format_digests() -> None:
+    """Digests are formatted as table, with latency in milliseconds and shortened statements."""
+    lines = format_digests([stats("a", 3, 0.0125, 30, 3)], text_width=6)
+    assert lines[0].split() == ["calls", "latency", "examined", "sent", "statement"]
+    assert lines[1].split() == ["3", "12.5", "30", "3", "SELECT"]
+
+
+def test_digest_summary() -> None:
+    """Statistics of the same digest get summed across tests."""
+    summary = DigestSummary()
+    summary.record([stats("a", 1, 0.1, 10, 1)])
+    summary.record([stats("a", 2, 0.2, 20, 2), stats("b", 1, 0.05, 1, 1)])
+    assert summary.top(5) == [stats("a", 3, 0.1 + 0.2, 30, 3), stats("b", 1, 0.05, 1, 1)]
+    summary.clear()
+    assert not summary.top(5)
+
+
+def test_digest_summary_xdist(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Controller sums digests attached to reports by pytest-xdist workers."""
+    pytest.importorskip("xdist")
+    # workers import the plugin in separate processes
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parent.parent))
+    pytester.makeconftest("from pytest_mysql.plugin import *  # noqa: F403\n")
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.parametrize("worker", range(4))
+        def test_digests(request, worker):
+            stats = {
+                "digest": "abc",
+                "text": "SELECT * FROM `digested`",
+                "calls": 2,
+                "latency": 0.25,
+                "rows_examined": 10,
+                "rows_sent": 1,
+            }
+            request.node.user_properties.append(("mysql_digests", [stats]))
+        """
+    )
+    result = pytester.runpytest_subprocess("-n", "2")
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(
+        ["*pytest-mysql statement digests*", "*8*1000.0*40*4*SELECT * FROM `digested`"]
+    )
+
+
+def _tracker(mysql_proc: MySQLExecutor, mysql_conn: Connection) -> Connection:
+    """Connect to the server under test as the test's connection user, to take snapshots."""
+    return Connection(
+        unix_socket=mysql_proc.unixsocket, user=mysql_conn.user, password=mysql_conn.password
+    )
+
+
+def _db_name(mysql_conn: Connection) -> str:
+    """Return name of the database test's connection uses."""
+    db = mysql_conn.db
+    return str(db.decode() if isinstance(db, bytes) else db)
+
+
+def test_statement_digests(mysql_proc: MySQLExecutor, mysql: Connection) -> None:
+    """Statements run on the test database are in between snapshots' difference."""
+    tracker = _tracker(mysql_proc, mysql)
+    statement_digests = StatementDigests(tracker, _db_name(mysql))
+    before = statement_digests.snapshot()
+    with mysql.cursor() as cursor:
+        cursor.execute("CREATE TABLE digested (id INT)")
+        for _ in range(3):
+            cursor.execute("SELECT * FROM digested")
+    changes = StatementDigests.delta(before, statement_digests.snapshot())
+    tracker.close()
+    if statement_digests.enabled:
+        assert sorted(digest.calls for digest in changes if "digested" in digest.text) == [1, 3]
+    else:
+        assert not changes
+
+
+def test_mysql_digests(mysql_digests: Connection) -> None:
+    """Client fixture profiling statements works as the regular one."""
+    with mysql_digests.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
+
+
+def test_mysql_pool_digests(mysql_proc: MySQLExecutor, mysql_pool_digests: Connection) -> None:
+    """Statements are profiled in the database taken from the pool, that connection uses."""
+    with mysql_pool_digests.cursor() as cursor:
+        cursor.execute("SELECT DATABASE()")
+        (test_db,) = cursor.fetchone()
+    assert test_db.startswith("test-pool-digests_pool")
+    assert _db_name(mysql_pool_digests) == test_db
+
+    tracker = _tracker(mysql_proc, mysql_pool_digests)
+    statement_digests = StatementDigests(tracker, test_db)
+    texts = [stats.text for stats in statement_digests.snapshot().values()]
+    tracker.close()
+    if statement_digests.enabled:
+        assert any("DATABASE ( )" in text for text in texts)
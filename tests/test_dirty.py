@@ -0,0 +1,106 @@
+"""Tests for restoring only modified tables between tests."""
+
+from datetime import datetime
+from typing import Dict, Set
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.dirty import DirtyTables, Snapshot, TableState, TrackingType
+
+
+@pytest.mark.parametrize("fixture_name", ("mysql_tables", "mysql_tables_checksum"))
+@pytest.mark.parametrize("statement", ("DELETE FROM pet", "DROP TABLE pet", "TRUNCATE pet"))
+def test_modified_tables_restored(
+    request: pytest.FixtureRequest, fixture_name: str, statement: str
+) -> None:
+    """Tables modified by previous tests are restored."""
+    mysql: Connection = request.getfixturevalue(fixture_name)
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("SELECT COUNT(*) FROM toy")
+        assert cursor.fetchone() == (1,)
+        cursor.execute(statement)
+        cursor.execute("DELETE FROM toy")
+    mysql.commit()
+
+
+@pytest.mark.parametrize("table", ("cat", "dog"))
+def test_created_tables_dropped(mysql_tables: Connection, table: str) -> None:
+    """Tables created by previous tests are dropped."""
+    with mysql_tables.cursor() as cursor:
+        cursor.execute("SHOW TABLES")
+        assert cursor.fetchall() == (("owner",), ("pet",), ("toy",))
+        cursor.execute(f"CREATE TABLE {table} (name VARCHAR(20))")
+
+
+@pytest.mark.parametrize("run", (1, 2))
+def test_cascaded_tables_restored(mysql_tables_cascade: Connection, run: int) -> None:
+    """Tables modified by foreign keys' cascades are restored."""
+    with mysql_tables_cascade.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM toy")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("DELETE FROM owner")
+        cursor.execute("SELECT COUNT(*) FROM toy")
+        assert cursor.fetchone() == (0,)
+    mysql_tables_cascade.commit()
+
+
+def _snapshot(taken_at: int, tables: Dict[str, TableState]) -> Snapshot:
+    return Snapshot(datetime(2024, 1, 1, 12, 0, taken_at), tables)
+
+
+@pytest.mark.parametrize(
+    "tracking, before, after, modified, created",
+    (
+        (
+            "checksum",
+            _snapshot(0, {"pet": (1, None, "name", 10), "toy": (1, 2, "id", 20)}),
+            _snapshot(1, {"pet": (1, None, "name", 11), "toy": (1, 2, "id", 20)}),
+            {"pet"},
+            set(),
+        ),
+        (
+            "performance_schema",
+            _snapshot(0, {"pet": (1, None, "name", 10), "toy": (1, 2, "id", 20)}),
+            _snapshot(1, {"toy": (1, 2, "id, name", 20), "cat": (1, None, "name", 0)}),
+            {"pet", "toy"},
+            {"cat"},
+        ),
+        (
+            "performance_schema",
+            Snapshot(
+                datetime(2024, 1, 1, 12, 0, 0),
+                {"owner": (1, 2, "id", 1), "toy": (1, 2, "id", 1), "part": (1, 2, "id", 1)},
+                (("owner", "toy"), ("toy", "part")),
+            ),
+            _snapshot(
+                1, {"owner": (1, 2, "id", 2), "toy": (1, 2, "id", 1), "part": (1, 2, "id", 1)}
+            ),
+            {"owner", "toy", "part"},
+            set(),
+        ),
+        (
+            "update_time",
+            _snapshot(5, {"pet": (1, None, "name", datetime(2024, 1, 1, 12, 0, 5))}),
+            _snapshot(5, {"pet": (1, None, "name", datetime(2024, 1, 1, 12, 0, 5))}),
+            {"pet"},
+            set(),
+        ),
+        (
+            "update_time",
+            _snapshot(5, {"pet": (1, None, "name", datetime(2024, 1, 1, 12, 0, 4))}),
+            _snapshot(6, {"pet": (1, None, "name", datetime(2024, 1, 1, 12, 0, 4))}),
+            set(),
+            set(),
+        ),
+    ),
+)
+def test_dirty_tables_compare(
+    tracking: TrackingType, before: Snapshot, after: Snapshot, modified: Set[str], created: Set[str]
+) -> None:
+    """Compare snapshots to find modified and created tables."""
+    dirty_tables = DirtyTables.__new__(DirtyTables)
+    dirty_tables.tracking = tracking
+    assert dirty_tables.modified(before, after) == (modified, created)
@@ -1,13 +1,45 @@
 """Executor tests."""
 
+import socket
+import subprocess
+import tempfile
+import threading
 from pathlib import Path
-from unittest.mock import patch
+from typing import Any, Callable, Dict, List
+from unittest.mock import MagicMock, patch
 
 import pytest
+from pymysql import InternalError, OperationalError
 from pytest import TempPathFactory
 
-from pytest_mysql.exceptions import MySQLUnsupported
-from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.cache import DatadirCache, SchemaCache
+from pytest_mysql.exceptions import MySQLUnsupported, NotEnoughSpace
+from pytest_mysql.executor import LauncherType, MySQLExecutor, _version_outputs
+
+ExecutorFactory = Callable[..., MySQLExecutor]
+
+
+@pytest.fixture
+def make_executor(tmp_path_factory: TempPathFactory) -> ExecutorFactory:
+    """Return factory of executors, not pointing to any real server unless overridden."""
+
+    def factory(**overrides: Any) -> MySQLExecutor:
+        kwargs: Dict[str, Any] = {
+            "mysqld_safe": Path(""),
+            "mysqld": Path(""),
+            "admin_exec": "",
+            "logfile_path": "",
+            "params": "",
+            "user": "",
+            "host": "",
+            "port": 8838,
+            **overrides,
+        }
+        if "base_directory" not in kwargs:
+            kwargs["base_directory"] = tmp_path_factory.mktemp("pytest-mysql")
+        return MySQLExecutor(**kwargs)
+
+    return factory
 
 
 @pytest.mark.parametrize(
@@ -34,19 +66,9 @@ from pytest_mysql.executor import MySQLExecutor
         ((b"\nmysqld  Ver 5.7.23 for osx10.13 on x86_64 (Homebrew)"), "5.7.23"),
     ),
 )
-def test_version_check(verstr: bytes, version: str, tmp_path_factory: TempPathFactory) -> None:
+def test_version_check(verstr: bytes, version: str, make_executor: ExecutorFactory) -> None:
     """Test executor's version property."""
-    executor = MySQLExecutor(
-        mysqld_safe=Path(""),
-        mysqld=Path(""),
-        admin_exec="",
-        logfile_path="",
-        params="",
-        base_directory=tmp_path_factory.mktemp("pytest-mysql"),
-        user="",
-        host="",
-        port=8838,
-    )
+    executor = make_executor()
 
     with patch("subprocess.check_output", lambda *args: verstr):
         assert version == executor.version()
@@ -80,21 +102,9 @@ def test_version_check(verstr: bytes, version: str, tmp_path_factory: TempPathFa
         ),
     ),
 )
-def test_implementation(
-    verstr: bytes, implementation: str, tmp_path_factory: TempPathFactory
-) -> None:
+def test_implementation(verstr: bytes, implementation: str, make_executor: ExecutorFactory) -> None:
     """Check detecting implementation."""
-    executor = MySQLExecutor(
-        mysqld_safe=Path(""),
-        mysqld=Path(""),
-        admin_exec="",
-        logfile_path="",
-        params="",
-        base_directory=tmp_path_factory.mktemp("pytest-mysql"),
-        user="",
-        host="",
-        port=8838,
-    )
+    executor = make_executor()
 
     with patch("subprocess.check_output", lambda *args: verstr):
         assert implementation == executor.implementation()
@@ -112,22 +122,338 @@ def test_implementation(
         ),
     ),
 )
-def test_exception_raised(verstr: bytes, tmp_path_factory: TempPathFactory) -> None:
+def test_exception_raised(verstr: bytes, make_executor: ExecutorFactory) -> None:
     """Raise exception on not supported versions."""
-    executor = MySQLExecutor(
-        mysqld_safe=Path(""),
-        mysqld=Path(""),
-        admin_exec="",
-        logfile_path="",
-        params="",
-        base_directory=tmp_path_factory.mktemp("pytest-mysql"),
-        user="",
-        host="",
-        port=8838,
-    )
+    executor = make_executor()
 
     with (
         patch("subprocess.check_output", lambda *args, **kwargs: verstr),
         pytest.raises(MySQLUnsupported),
     ):
         executor.start()
+
+
+def test_datadir_cache(tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory) -> None:
+    """Initialised datadir gets cached and reused by next executor."""
+    cache_dir = tmp_path_factory.mktemp("pytest-mysql-cache")
+    init_commands = []
+
+    def check_output(command: Any, **kwargs: Any) -> bytes:
+        if isinstance(command, str):
+            init_commands.append(command)
+            datadir = Path(command.split("--datadir=")[1].split()[0])
+            (datadir / "ibdata1").write_bytes(b"data")
+            (datadir / "auto.cnf").write_bytes(b"uuid")
+        return b"mysqld  Ver 8.0.12 for Linux on x86_64 (MySQL Community Server - GPL)"
+
+    executors = [
+        # not resolvable, so fake version doesn't get memoized for the real mysqld
+        make_executor(mysqld=Path("mysqld-not-installed"), cache_dir=cache_dir)
+        for _ in range(2)
+    ]
+    with patch("subprocess.check_output", check_output):
+        for executor in executors:
+            executor.initialize_mysqld()
+
+    assert len(init_commands) == 1
+    assert (executors[1].datadir / "ibdata1").read_bytes() == b"data"
+    assert not (executors[1].datadir / "auto.cnf").exists()
+
+    DatadirCache(cache_dir).clear()
+    assert not list(cache_dir.iterdir())
+
+
+def test_tmpfs_datadir(tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory) -> None:
+    """Data and temporary directories are placed on memory-backed filesystem."""
+    tmpfs_path = tmp_path_factory.mktemp("shm")
+    executor = make_executor(tmpfs_path=tmpfs_path)
+    assert executor.tmpfs_directory
+    assert executor.datadir.parent == executor.tmpfs_directory
+    assert executor.tmpdir.parent == executor.tmpfs_directory
+    assert executor.tmpfs_directory.parent == tmpfs_path
+    assert f"--tmpdir={executor.tmpdir}" in executor.command
+
+    executor.remove_tmpfs_directory()
+    assert not list(tmpfs_path.iterdir())
+
+
+def test_tmpfs_not_enough_space(
+    tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory
+) -> None:
+    """Raise exception, when memory-backed filesystem can not fit data directory."""
+    with (
+        patch.object(MySQLExecutor, "TMPFS_MIN_FREE", 2**80),
+        pytest.raises(NotEnoughSpace),
+    ):
+        make_executor(tmpfs_path=tmp_path_factory.mktemp("shm"))
+
+
+def test_version_memoized(
+    tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory
+) -> None:
+    """Binary gets run once, and its version output is kept in the cache directory."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    calls = bin_dir / "calls"
+    mysqld = bin_dir / "mysqld"
+    mysqld.write_text(
+        f"#!/bin/sh\necho called >> {calls}\n"
+        "echo 'mysqld  Ver 10.1.30-MariaDB for debian-linux-gnu on x86_64'\n"
+    )
+    mysqld.chmod(0o755)
+    cache_dir = tmp_path_factory.mktemp("pytest-mysql-cache")
+
+    def executor() -> MySQLExecutor:
+        return make_executor(mysqld=mysqld, cache_dir=cache_dir)
+
+    first = executor()
+    assert first.implementation() == "mariadb"
+    assert first.version() == "10.1.30"
+    assert executor().version() == "10.1.30"
+    assert calls.read_text() == "called\n"
+
+    # next test run reads the output from the cache directory
+    _version_outputs.clear()
+    with patch("subprocess.check_output") as check_output:
+        assert executor().version() == "10.1.30"
+    check_output.assert_not_called()
+
+    # changed binary gets run again
+    _version_outputs.clear()
+    mysqld.write_text(mysqld.read_text().replace("10.1.30", "10.11.10"))
+    assert executor().version() == "10.11.10"
+
+
+def test_log_readiness(tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory) -> None:
+    """Server is ready once it logs it's ready for connections after the start."""
+    base_directory = tmp_path_factory.mktemp("pytest-mysql")
+    logfile_path = base_directory / "mysql-server.log"
+    logfile_path.write_text("2024-01-01 [Note] /usr/sbin/mysqld: ready for connections.\n")
+    executor = make_executor(
+        logfile_path=str(logfile_path), base_directory=base_directory, readiness="log"
+    )
+    # line logged by the previous start
+    executor._log_offset = logfile_path.stat().st_size
+    assert not executor.after_start_check()
+
+    with logfile_path.open("a") as logfile:
+        logfile.write("[System] [MY-011323] [Server] X Plugin ready for connections.\n")
+    assert not executor.after_start_check()
+    with logfile_path.open("a") as logfile:
+        logfile.write("[System] [MY-010931] [Server] /usr/sbin/mysqld: ready for connections.\n")
+    assert executor.after_start_check()
+
+
+@pytest.mark.parametrize("first_byte, ready", ((10, True), (0xFF, False)))
+def test_socket_readiness(first_byte: int, ready: bool, make_executor: ExecutorFactory) -> None:
+    """Server is ready once it sends handshake through the unix socket."""
+    # pytest's tmp_path might exceed unix socket path length limit
+    with tempfile.TemporaryDirectory() as directory:
+        base_directory = Path(directory)
+        executor = make_executor(base_directory=base_directory, readiness="socket")
+        assert not executor.after_start_check()
+
+        with socket.socket(socket.AF_UNIX) as server:
+            server.bind(executor.unixsocket)
+            server.listen()
+
+            def handshake() -> None:
+                connection, _ = server.accept()
+                connection.sendall(bytes((74, 0, 0, 0, first_byte)) + b"8.0.36\0")
+                connection.close()
+
+            thread = threading.Thread(target=handshake)
+            thread.start()
+            assert executor.after_start_check() is ready
+            thread.join()
+
+
+@pytest.mark.parametrize(
+    "launcher, executable, skip_syslog",
+    (("mysqld_safe", "/usr/bin/mysqld_safe", True), ("mysqld", "/usr/sbin/mysqld", False)),
+)
+def test_launcher(
+    launcher: LauncherType, executable: str, skip_syslog: bool, make_executor: ExecutorFactory
+) -> None:
+    """Server is started through mysqld_safe or directly."""
+    executor = make_executor(
+        mysqld_safe=Path("/usr/bin/mysqld_safe"), mysqld=Path("/usr/sbin/mysqld"), launcher=launcher
+    )
+    assert executor.command_parts[0] == executable
+    assert f"--datadir={executor.datadir}" in executor.command_parts
+    assert ("--skip-syslog" in executor.command_parts) is skip_syslog
+
+
+def test_shutdown_statement(make_executor: ExecutorFactory) -> None:
+    """Server is shut down through the unix socket, falling back to root user."""
+    executor = make_executor(user="test")
+    executor.pidfile.write_text("1")
+    users: List[str] = []
+
+    def connection(unix_socket: str, user: str) -> MagicMock:
+        assert unix_socket == executor.unixsocket
+        users.append(user)
+        if user != "root":
+            raise OperationalError(1045, "Access denied")
+        mysql_conn = MagicMock()
+        # server removes its pidfile once it's shut down
+        mysql_conn.query.side_effect = lambda query: executor.pidfile.unlink()
+        return mysql_conn
+
+    with patch("pytest_mysql.executor.Connection", connection), patch("os.kill") as kill:
+        executor.shutdown()
+    assert users == ["test", "root"]
+    kill.assert_not_called()
+
+
+def test_shutdown_statement_privileges(make_executor: ExecutorFactory) -> None:
+    """User without SHUTDOWN privilege falls back to root, and every connection gets closed."""
+    executor = make_executor(user="test")
+    executor.pidfile.write_text("1")
+    connections: List[MagicMock] = []
+
+    def connection(unix_socket: str, user: str) -> MagicMock:
+        mysql_conn = MagicMock()
+        if user == "root":
+            mysql_conn.query.side_effect = lambda query: executor.pidfile.unlink()
+        else:
+            mysql_conn.query.side_effect = InternalError(1227, "Access denied")
+        connections.append(mysql_conn)
+        return mysql_conn
+
+    with patch("pytest_mysql.executor.Connection", connection), patch("os.kill") as kill:
+        executor.shutdown()
+    assert len(connections) == 2
+    for mysql_conn in connections:
+        mysql_conn.close.assert_called_once_with()
+    kill.assert_not_called()
+
+
+def test_shutdown_sigterm_fallback(make_executor: ExecutorFactory) -> None:
+    """Server still running after the timeout gets SIGTERM."""
+    executor = make_executor(admin_exec="true")
+    executor._timeout = 0.1
+    server = subprocess.Popen(["sleep", "60"])
+    executor.pidfile.write_text(str(server.pid))
+    with patch("pytest_mysql.executor.Connection", side_effect=OperationalError(2002, "")):
+        executor.shutdown()
+    assert server.wait(timeout=5) == -15
+
+
+def test_schema_snapshot(tmp_path_factory: TempPathFactory, make_executor: ExecutorFactory) -> None:
+    """Schema gets loaded once, following executors restore data directory's snapshot."""
+    cache_dir = tmp_path_factory.mktemp("pytest-mysql-cache")
+    loaded_into = []
+
+    def check_output(command: Any, **kwargs: Any) -> bytes:
+        if isinstance(command, str):
+            datadir = Path(command.split("--datadir=")[1].split()[0])
+            (datadir / "ibdata1").write_bytes(b"data")
+        return b"mysqld  Ver 8.0.12 for Linux on x86_64 (MySQL Community Server - GPL)"
+
+    executors: List[MySQLExecutor] = []
+    stop_calls = []
+
+    def load_schema(**kwargs: Any) -> None:
+        loaded_into.append(executors[-1])
+        (executors[-1].datadir / "app").mkdir()
+
+    for port in (8840, 8841):
+        executors.append(
+            make_executor(
+                mysqld=Path("mysqld-not-installed"),
+                user="root",
+                host="localhost",
+                port=port,
+                cache_dir=cache_dir,
+                launcher="mysqld",
+                schema=[load_schema],
+            )
+        )
+        with (
+            patch("subprocess.check_output", check_output),
+            patch("mirakuru.base.SimpleExecutor.start"),
+            patch("mirakuru.base.SimpleExecutor.stop") as stop,
+            patch.object(executors[-1], "wait_for"),
+            patch("pytest_mysql.executor.Connection"),
+        ):
+            executors[-1].start()
+        stop_calls.append(stop.call_count)
+
+    assert loaded_into == executors[:1]
+    # first server got restarted to take the snapshot from
+    assert stop_calls == [1, 0]
+    assert (executors[1].datadir / "app").is_dir()
+    assert (executors[1].datadir / "ibdata1").read_bytes() == b"data"
+
+
+def test_schema_source_hash(tmp_path: Path) -> None:
+    """Schema's hash changes along with its files' contents."""
+    migrations = tmp_path / "migrations"
+    migrations.mkdir()
+    (migrations / "0001_initial.py").write_text("create table")
+    schema_sql = tmp_path / "schema.sql"
+    schema_sql.write_text("CREATE DATABASE app;")
+
+    source_hash = SchemaCache.source_hash(["app.migrate"], [migrations])
+    assert source_hash == SchemaCache.source_hash(["app.migrate"], [migrations])
+    assert source_hash != SchemaCache.source_hash(["app.other_migrate"], [migrations])
+    (migrations / "0002_pets.py").write_text("create table pets")
+    assert source_hash != SchemaCache.source_hash(["app.migrate"], [migrations])
+
+    sql_hash = SchemaCache.source_hash([schema_sql], [])
+    schema_sql.write_text("CREATE DATABASE app2;")
+    assert sql_hash != SchemaCache.source_hash([schema_sql], [])
+
+
+def test_schema_source_hash_location(tmp_path: Path) -> None:
+    """Schema's hash doesn't depend on where the project is checked out, but on files' names."""
+    checkouts = [tmp_path / "checkout", tmp_path / "other" / "checkout"]
+    for checkout in checkouts:
+        (checkout / "migrations").mkdir(parents=True)
+        (checkout / "migrations" / "0001_initial.py").write_text("create table")
+        (checkout / "schema.sql").write_text("CREATE DATABASE app;")
+    first, second = (
+        SchemaCache.source_hash([checkout / "schema.sql"], [checkout / "migrations"])
+        for checkout in checkouts
+    )
+    assert first == second
+
+    (checkouts[1] / "migrations" / "0001_initial.py").rename(
+        checkouts[1] / "migrations" / "0001_renamed.py"
+    )
+    assert first != SchemaCache.source_hash(
+        [checkouts[1] / "schema.sql"], [checkouts[1] / "migrations"]
+    )
+
+
+def test_tmpfs_removed_when_start_fails(pytester: pytest.Pytester) -> None:
+    """Data directory is removed from memory-backed filesystem, when the server fails to start."""
+    tmpfs_path = pytester.mkdir("shm")
+    mysqld = pytester.path / "mysqld"
+    mysqld.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "--version" ]; then\n'
+        "    echo 'mysqld  Ver 8.0.36 for Linux on x86_64 (MySQL Community Server - GPL)'\n"
+        "    exit 0\n"
+        "fi\n"
+        "exit 1\n"
+    )
+    mysqld.chmod(0o755)
+    pytester.makeconftest(
+        f"""
+        from pathlib import Path
+        from pytest_mysql import factories
+        from pytest_mysql.plugin import *  # noqa: F403
+
+        mysql_tmpfs_proc = factories.mysql_proc(
+            mysqld_exec=Path({str(mysqld)!r}),
+            port=None,
+            datadir_mode="tmpfs",
+            tmpfs_path=Path({str(tmpfs_path)!r}),
+        )
+        """
+    )
+    pytester.makepyfile("def test_start(mysql_tmpfs_proc):\n    pass\n")
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    assert not list(tmpfs_path.iterdir())
@@ -0,0 +1,21 @@
+"""Loader tests."""
+
+from pathlib import Path
+
+from pytest_mysql.loader import build_loader, sql
+from tests.loader import load_pets
+
+
+def test_loader_callables() -> None:
+    """Test handling callables in build_loader."""
+    assert load_pets == build_loader(load_pets)
+    assert load_pets == build_loader("tests.loader:load_pets")
+    assert load_pets == build_loader("tests.loader.load_pets")
+
+
+def test_loader_sql() -> None:
+    """Test returning partial running sql for the sql file path."""
+    sql_path = Path("test_sql/pets.sql")
+    loader_func = build_loader(sql_path)
+    assert loader_func.args == (sql_path,)  # type: ignore
+    assert loader_func.func == sql  # type: ignore
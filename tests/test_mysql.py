@@ -1,8 +1,11 @@
 """Actual tests for pytest-mysql."""
 
+from typing import Dict
+
 from pymysql import Connection
 
 from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.timing import timings
 
 QUERY = """CREATE TABLE pet (name VARCHAR(20), owner VARCHAR(20),
     species VARCHAR(20), sex CHAR(1), birth DATE, death DATE);"""
@@ -13,6 +16,13 @@ def test_proc(mysql_proc: MySQLExecutor) -> None:
     assert mysql_proc.running()
 
 
+def test_proc_group(mysql_procs: Dict[str, MySQLExecutor], mysql_rand_proc: MySQLExecutor) -> None:
+    """Check servers of the group are started together."""
+    assert set(mysql_procs) == {"mysql_proc2", "mysql_rand_proc"}
+    assert all(executor.running() for executor in mysql_procs.values())
+    assert mysql_procs["mysql_rand_proc"] is mysql_rand_proc
+
+
 def test_mysql(mysql: Connection) -> None:
     """Check first, basic client fixture factory."""
     cursor = mysql.cursor()
@@ -26,6 +36,12 @@ def test_mysql_test_without_cursor(mysql: Connection) -> None:
     mysql.query("SELECT VERSION();")
 
 
+def test_mysql_timings(mysql: Connection) -> None:
+    """Client fixture's setup phases get measured separately."""
+    phases = {row["phase"] for row in timings.summary() if row["fixture"] == "mysql"}
+    assert {"connect", "create database", "select database", "load data"} <= phases
+
+
 def test_mysql_newfixture(mysql: Connection, mysql2: Connection) -> None:
     """More complext test with several mysql_processes."""
     cursor = mysql.cursor()
@@ -43,3 +59,10 @@ def test_random_port(mysql_rand: Connection) -> None:
     """Test if mysql fixture can be started on random port."""
     mysql = mysql_rand
     mysql.cursor()
+
+
+def test_schema(mysql_schema: Connection) -> None:
+    """Process fixture loads the schema once the server starts."""
+    with mysql_schema.cursor() as cursor:
+        cursor.execute("SELECT name FROM app.pet")
+        assert cursor.fetchall() == (("Fluffy",),)
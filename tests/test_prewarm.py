@@ -0,0 +1,125 @@
+"""Tests for starting MySQL servers in the background."""
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from pytest_mysql import prewarm
+
+
+def test_background_start() -> None:
+    """Executor started in the background is returned once it's started."""
+    executor = MagicMock()
+    background_start = prewarm.BackgroundStart(executor)
+    assert background_start.join() is executor
+    executor.start.assert_called_once_with()
+
+
+def test_background_start_error() -> None:
+    """Error raised while starting the executor is raised on join."""
+    executor = MagicMock()
+    executor.start.side_effect = RuntimeError("mysqld not found")
+    background_start = prewarm.BackgroundStart(executor)
+    with pytest.raises(RuntimeError, match="mysqld not found"):
+        background_start.join()
+
+
+def test_prewarm_collected_item(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Servers get started for tests using process fixtures directly, or through client ones."""
+    started: List[str] = []
+
+    class RecordedStart(prewarm.BackgroundStart):
+        def __init__(self, executor: Any) -> None:
+            self.executor = executor
+            started.append(executor.fixturename)
+
+        def join(self) -> Any:
+            raise RuntimeError("Not started")
+
+    monkeypatch.setattr(prewarm, "BackgroundStart", RecordedStart)
+    pytester.makeconftest(
+        """
+        from pytest_mysql import factories
+        from pytest_mysql.plugin import *  # noqa: F403
+
+        mysql_proc_direct = factories.mysql_proc(port=None)
+        mysql_proc_client = factories.mysql_proc(port=None)
+        mysql_proc_unused = factories.mysql_proc(port=None)
+        mysql_client = factories.mysql("mysql_proc_client")
+        """
+    )
+    pytester.makepyfile(
+        """
+        def test_direct(mysql_proc_direct):
+            pass
+
+
+        def test_client(mysql_client):
+            pass
+
+
+        def test_client_again(mysql_client):
+            pass
+        """
+    )
+    result = pytester.runpytest("--collect-only", "--mysql-prewarm")
+    assert result.ret == 0
+    assert started == ["mysql_proc_direct", "mysql_proc_client"]
+
+
+def test_stop_unused(tmp_path: Path) -> None:
+    """Servers started in the background, that no test has used, get stopped."""
+    executor = MagicMock(base_directory=tmp_path / "pytest-mysql")
+    executor.base_directory.mkdir()
+
+    def mysql_proc_fixture() -> None:
+        """Process fixture function."""
+
+    prewarm.register(mysql_proc_fixture, lambda config, fixturename: executor)
+    conftest = ModuleType("conftest")
+    vars(conftest).update(mysql_proc_stopped=mysql_proc_fixture)
+    prewarm.collect(conftest)
+    config: Any = None
+    prewarm.start_by_name(config, "mysql_proc_stopped")
+
+    prewarm.stop_unused()
+    executor.stop.assert_called_once_with()
+    assert not executor.base_directory.exists()
+    assert prewarm.take(mysql_proc_fixture, "mysql_proc_stopped") is None
+
+
+def test_prewarm_by_name() -> None:
+    """Process fixtures defined in conftest modules get started by name, until they're set up."""
+    executor = MagicMock()
+    builds = []
+
+    def mysql_proc_fixture() -> None:
+        """Process fixture function."""
+
+    def builder(config: Any, fixturename: str) -> MagicMock:
+        builds.append(fixturename)
+        return executor
+
+    prewarm.register(mysql_proc_fixture, builder)
+    conftest = ModuleType("conftest")
+    vars(conftest).update(
+        mysql_proc_named=pytest.fixture(scope="session")(mysql_proc_fixture),
+        mysql_noproc_named=len,
+    )
+    prewarm.collect(conftest)
+    config: Any = None
+    prewarm.start_by_name(config, "mysql_noproc_named")
+    prewarm.start_by_name(config, "mysql_proc_named")
+    # fixture with the same name, defined in another conftest module
+    assert prewarm.take(builder, "mysql_proc_named") is None
+    background_start = prewarm.take(mysql_proc_fixture, "mysql_proc_named")
+    assert background_start is not None
+    assert background_start.join() is executor
+
+    # server of the fixture that has been set up doesn't get started again
+    prewarm.start_by_name(config, "mysql_proc_named")
+    assert builds == ["mysql_proc_named"]
+    assert prewarm.take(mysql_proc_fixture, "mysql_proc_named") is None
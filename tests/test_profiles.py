@@ -0,0 +1,63 @@
+"""Tests for server tuning profiles."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pytest import TempPathFactory
+
+from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.profiles import profile_params
+
+
+@pytest.mark.parametrize(
+    "implementation, version, expected, unexpected",
+    (
+        ("mysql", "5.7.21", "--innodb-doublewrite=0", "--skip-log-bin"),
+        ("mysql", "8.0.12", "--skip-log-bin", "--innodb-doublewrite=OFF"),
+        ("mysql", "8.0.36", "--innodb-doublewrite=OFF", "--innodb-doublewrite=0"),
+        ("mariadb", "10.6.16", "--innodb-doublewrite=0", "--skip-log-bin"),
+    ),
+)
+def test_fast_profile(implementation: str, version: str, expected: str, unexpected: str) -> None:
+    """Fast profile parameters depend on server's version and implementation."""
+    params = profile_params("fast", implementation, version)  # type: ignore[arg-type]
+    assert "--innodb-flush-log-at-trx-commit=0" in params
+    assert "--skip-name-resolve" not in params
+    assert expected in params
+    assert unexpected not in params
+
+
+def test_unknown_profile() -> None:
+    """Unknown profile name is rejected."""
+    with pytest.raises(ValueError):
+        profile_params("slow", "mysql", "8.0.12")  # type: ignore[arg-type]
+
+
+def test_profile_command(tmp_path_factory: TempPathFactory) -> None:
+    """Profile parameters are added before user's parameters, once version is known."""
+    executor = MySQLExecutor(
+        mysqld_safe=Path(""),
+        mysqld=Path(""),
+        admin_exec="",
+        logfile_path="",
+        params="--max-connections=5",
+        base_directory=tmp_path_factory.mktemp("pytest-mysql"),
+        user="",
+        host="",
+        port=8838,
+        profile="low-memory",
+    )
+    assert "--max-connections=20" not in executor.command_parts
+
+    verstr = b"mysqld  Ver 8.0.12 for Linux on x86_64 (MySQL Community Server - GPL)"
+    with (
+        patch("subprocess.check_output", lambda *args, **kwargs: verstr),
+        patch("mirakuru.base.SimpleExecutor.start"),
+        patch.object(executor, "wait_for"),
+    ):
+        executor.start()
+    assert "--temptable-max-ram=2M" in executor.command_parts
+    assert executor.command_parts.index("--max-connections=20") < (
+        executor.command_parts.index("--max-connections=5")
+    )
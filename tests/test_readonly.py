@@ -0,0 +1,84 @@
+"""Tests for read-only client fixture."""
+
+from typing import Any, List
+
+import pytest
+from pymysql import Connection, OperationalError
+
+from pytest_mysql.factories import readonly
+
+
+@pytest.mark.parametrize("statement", ("DELETE FROM pet", "DROP TABLE pet"))
+def test_writes_fail(mysql_readonly: Connection, statement: str) -> None:
+    """Writes fail, and the data stays intact for the other tests."""
+    with mysql_readonly.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        with pytest.raises(OperationalError):
+            cursor.execute(statement)
+
+
+def test_session_read_only(mysql_readonly_session: Connection) -> None:
+    """In session mode, transactions of process fixture's user are read-only."""
+    with mysql_readonly_session.cursor() as cursor:
+        cursor.execute("SELECT name FROM pet ORDER BY name")
+        assert cursor.fetchall() == (("Claws",), ("Fluffy",))
+        with pytest.raises(OperationalError):
+            cursor.execute("DELETE FROM pet")
+
+
+def test_failed_setup_cleaned_up(request: pytest.FixtureRequest, mysql: Connection) -> None:
+    """Database and read-only user are dropped, when loading the data fails."""
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM mysql.user WHERE User LIKE 'ro\\_%'")
+        users_before = cursor.fetchone()
+    with pytest.raises(ValueError, match="Broken data"):
+        request.getfixturevalue("mysql_readonly_broken")
+    with mysql.cursor() as cursor:
+        cursor.execute("SHOW DATABASES LIKE 'test-readonly-broken'")
+        assert not cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM mysql.user WHERE User LIKE 'ro\\_%'")
+        assert cursor.fetchone() == users_before
+
+
+def test_failed_connect_cleaned_up(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Database and read-only user are dropped, when connecting as the read-only user fails."""
+    queries: List[str] = []
+    connections: List["RecordedConnection"] = []
+
+    class RecordedConnection:
+        def __init__(self, **kwargs: Any) -> None:
+            if "db" in kwargs:
+                raise OperationalError(1045, "Access denied")
+            self.open = True
+            connections.append(self)
+
+        def query(self, sql: str) -> None:
+            queries.append(sql.split(" `")[0].split(" '")[0])
+
+        def close(self) -> None:
+            self.open = False
+
+    monkeypatch.setattr(readonly, "Connection", RecordedConnection)
+    pytester.makeconftest(
+        """
+        from pytest_mysql import factories
+        from pytest_mysql.plugin import *  # noqa: F403
+
+        mysql_readonly_failing = factories.mysql_readonly("mysql_noproc", dbname="test-failing")
+        """
+    )
+    pytester.makepyfile("def test_readonly(mysql_readonly_failing):\n    pass\n")
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    assert queries == [
+        "CREATE DATABASE",
+        "CREATE USER",
+        "GRANT SELECT ON",
+        "DROP USER IF EXISTS",
+        "DROP DATABASE IF EXISTS",
+    ]
+    assert connections
+    assert not any(connection.open for connection in connections)
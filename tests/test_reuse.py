@@ -0,0 +1,112 @@
+"""Tests for keeping MySQL server running in between test runs."""
+
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from pytest import TempPathFactory
+
+from pytest_mysql import reuse
+from pytest_mysql.executor import MySQLExecutor
+from pytest_mysql.reuse import ReusedServer, servers_directory
+
+
+@pytest.fixture(autouse=True)
+def registry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep registry of the servers reused by tests away from the real one."""
+    registry_path = tmp_path / "registry"
+    monkeypatch.setattr(reuse, "registry_path", lambda: registry_path)
+    return registry_path
+
+
+def test_servers_directory() -> None:
+    """Servers are kept in the cache directory, or in user's temporary directory."""
+    assert servers_directory("/cache") == Path("/cache/servers")
+    assert servers_directory(None).parent == Path(tempfile.gettempdir())
+
+
+def test_reused_server() -> None:
+    """Running server started with the same settings gets attached to."""
+    # pytest's tmp_path might exceed unix socket path length limit
+    with tempfile.TemporaryDirectory() as directory, socket.socket(socket.AF_UNIX) as server:
+        reused_server = ReusedServer(Path(directory) / "servers" / "mysql_proc")
+        reused_server.base_directory.mkdir(parents=True)
+        unixsocket = str(reused_server.base_directory / "mysql.sock")
+        server.bind(unixsocket)
+        server.listen()
+
+        def handshake() -> None:
+            connection, _ = server.accept()
+            connection.sendall(bytes((74, 0, 0, 0, 10)) + b"8.0.36\0")
+            connection.close()
+
+        mysqld = subprocess.Popen(["sleep", "60"])
+        state: Dict[str, Any] = {
+            "pid": mysqld.pid,
+            "unixsocket": unixsocket,
+            "settings": {"params": ""},
+        }
+        reused_server.write(state)
+
+        thread = threading.Thread(target=handshake)
+        thread.start()
+        assert reused_server.attach({"params": ""}) == state
+        thread.join()
+
+        # server started with different settings gets stopped
+        assert reused_server.attach({"params": "--skip-log-bin"}) is None
+        with pytest.raises(ProcessLookupError):
+            os.kill(mysqld.pid, 0)
+        assert not reused_server.base_directory.exists()
+        assert reused_server.read() is None
+        assert not list(ReusedServer.all(Path(directory) / "servers"))
+
+
+def test_stop_servers(pytester: pytest.Pytester, registry: Path) -> None:
+    """All registered servers get stopped, whichever cache directory they're kept in."""
+    reused_servers = [
+        ReusedServer(servers_directory(pytester.path / cache) / "mysql_proc")
+        for cache in ("cache", "other-cache")
+    ]
+    for reused_server in reused_servers:
+        reused_server.base_directory.mkdir(parents=True)
+        reused_server.write({"pid": None})
+        # registered once, even when its state gets written again
+        reused_server.write({"pid": None})
+    assert len(registry.read_text().splitlines()) == 2
+
+    # other cache directory's server can be found only through the registry
+    result = pytester.runpytest(
+        "-p",
+        "pytest_mysql.plugin",
+        "--mysql-stop-servers",
+        f"--mysql-cache-dir={pytester.path / 'cache'}",
+    )
+    assert result.ret == 0
+    for reused_server in reused_servers:
+        assert not reused_server.base_directory.exists()
+        assert reused_server.read() is None
+    assert not list(ReusedServer.registered())
+    assert not registry.read_text()
+
+
+def test_detached_executor(tmp_path_factory: TempPathFactory) -> None:
+    """Detached server is not marked to be killed by mirakuru on exit."""
+    executor = MySQLExecutor(
+        mysqld_safe=Path(""),
+        mysqld=Path(""),
+        admin_exec="",
+        logfile_path="",
+        params="",
+        base_directory=tmp_path_factory.mktemp("pytest-mysql"),
+        user="",
+        host="",
+        port=8838,
+        detached=True,
+    )
+    assert "mirakuru_uuid" not in executor.envvars
@@ -0,0 +1,76 @@
+"""Tests for bulk loading rows into tables."""
+
+import datetime
+import os
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.seed import _csv_line, _PipeWriter, seed
+
+PETS_TABLE = """CREATE TABLE pet (name VARCHAR(20), owner VARCHAR(20),
+    species VARCHAR(20), sex CHAR(1), birth DATE, death DATE)"""
+
+
+def _pets(count: int) -> Iterator[Tuple[object, ...]]:
+    for number in range(count):
+        yield (f"pet {number}", 'Harold "Harry"', "cat", "f", datetime.date(1993, 2, 4), None)
+
+
+def test_csv_line() -> None:
+    """Values get quoted, NULLs are left unquoted."""
+    assert _csv_line(("a,b", 'say "hi"', None, True, 1.5, b"\x00")) == (
+        b'"a,b","say ""hi""",NULL,"1","1.5","\x00"\n'
+    )
+
+
+def test_pipe_writer(tmp_path: Path) -> None:
+    """Rows are streamed through the pipe, as they're read."""
+    fifo = tmp_path / "pet.csv"
+    os.mkfifo(fifo)
+    writer = _PipeWriter(str(fifo), _pets(10000))
+    with open(fifo, "rb") as pipe:
+        lines = pipe.read().splitlines()
+    writer.join()
+    assert len(lines) == 10000
+    assert lines[0] == b'"pet 0","Harold ""Harry""","cat","f","1993-02-04",NULL'
+
+
+def test_pipe_writer_cancelled(tmp_path: Path) -> None:
+    """Cancelled writer doesn't consume any rows."""
+    fifo = tmp_path / "pet.csv"
+    os.mkfifo(fifo)
+    rows = _pets(10)
+    writer = _PipeWriter(str(fifo), rows)
+    writer.cancel()
+    assert next(rows)[0] == "pet 0"
+    assert not writer._thread.is_alive()
+
+
+@pytest.mark.parametrize("local_infile", (True, False))
+def test_seed_rows(mysql: Connection, local_infile: bool) -> None:
+    """Rows are loaded through LOAD DATA, or inserted if local data can't be loaded."""
+    mysql.query(PETS_TABLE)
+    mysql._local_infile = local_infile  # type: ignore[attr-defined]
+    assert seed(mysql, "pet", _pets(2500), batch_size=1000) == 2500
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*), COUNT(death) FROM pet WHERE owner = 'Harold \"Harry\"'")
+        assert cursor.fetchone() == (2500, 0)
+
+
+@pytest.mark.parametrize("local_infile", (True, False))
+def test_seed_csv(mysql: Connection, tmp_path: Path, local_infile: bool) -> None:
+    """CSV file's columns are read from its header."""
+    mysql.query(PETS_TABLE)
+    mysql._local_infile = local_infile  # type: ignore[attr-defined]
+    csv_path = tmp_path / "pets.csv"
+    csv_path.write_text('species,name,death\ncat,"Fluffy, the cat",NULL\ndog,Buffy,2001-01-01\n')
+    assert seed(mysql, "pet", csv_path) == 2
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT name, species, death FROM pet ORDER BY name")
+        assert cursor.fetchall() == (
+            ("Buffy", "dog", datetime.date(2001, 1, 1)),
+            ("Fluffy, the cat", "cat", None),
+        )
@@ -0,0 +1,57 @@
+"""Tests for sharing MySQL server between pytest-xdist workers."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pytest_mysql.shared import SharedServer
+
+
+def test_shared_server_workers(tmp_path: Path) -> None:
+    """First worker starts the server, the last one to detach stops it."""
+    shared_server = SharedServer(tmp_path / "pytest-mysql-mysql_proc")
+    with shared_server.locked():
+        assert shared_server.attach() is None
+        shared_server.start({"port": 3307})
+
+    other_worker = SharedServer(tmp_path / "pytest-mysql-mysql_proc")
+    with other_worker.locked():
+        assert other_worker.attach() == {"port": 3307, "workers": [os.getpid(), os.getpid()]}
+
+    shared_server.detach()
+    other_worker.detach()
+    with shared_server.last_worker(interval=0):
+        assert shared_server.read() == {"port": 3307, "workers": []}
+    assert shared_server.read() is None
+
+
+def test_shared_server_dead_worker(tmp_path: Path) -> None:
+    """Workers that died without detaching are not waited for."""
+    dead_worker = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead_worker.wait()
+    shared_server = SharedServer(tmp_path / "pytest-mysql-mysql_proc")
+    with shared_server.locked():
+        shared_server.start({"port": 3307})
+        state = shared_server.read()
+        assert state
+        shared_server.write({**state, "workers": [*state["workers"], dead_worker.pid]})
+
+    shared_server.detach()
+    with shared_server.last_worker(interval=0, timeout=60):
+        pass
+    assert shared_server.read() is None
+
+
+def test_shared_server_timeout(tmp_path: Path) -> None:
+    """Server gets stopped with a warning, when workers don't detach in time."""
+    shared_server = SharedServer(tmp_path / "pytest-mysql-mysql_proc")
+    with shared_server.locked():
+        shared_server.start({"port": 3307})
+
+    with pytest.warns(UserWarning, match="still attached"):
+        with shared_server.last_worker(interval=0, timeout=0):
+            pass
+    assert shared_server.read() is None
@@ -0,0 +1,5 @@
+CREATE TABLE owner (id INT PRIMARY KEY, name VARCHAR(20));
+CREATE TABLE toy (id INT PRIMARY KEY, owner_id INT, name VARCHAR(20),
+    FOREIGN KEY (owner_id) REFERENCES owner (id) ON DELETE CASCADE);
+INSERT INTO owner VALUES (1, 'Harold'), (2, 'Gwen');
+INSERT INTO toy VALUES (1, 1, 'ball'), (2, 2, 'bone');
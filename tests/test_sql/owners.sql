@@ -0,0 +1,6 @@
+CREATE TABLE owner (id INT PRIMARY KEY AUTO_INCREMENT, name VARCHAR(20),
+    upper_name VARCHAR(20) AS (UPPER(name)));
+CREATE TABLE toy (id INT PRIMARY KEY AUTO_INCREMENT, owner_id INT, name VARCHAR(20),
+    FOREIGN KEY (owner_id) REFERENCES owner (id));
+INSERT INTO owner (name) VALUES ('Harold'), ('Gwen');
+INSERT INTO toy (owner_id, name) VALUES (1, 'ball');
@@ -0,0 +1,4 @@
+CREATE TABLE pet (name VARCHAR(20), owner VARCHAR(20),
+    species VARCHAR(20), sex CHAR(1), birth DATE, death DATE);
+INSERT INTO pet VALUES ('Fluffy', 'Harold', 'cat', 'f', '1993-02-04', NULL);
+INSERT INTO pet VALUES ('Claws', 'Gwen', 'cat', 'm', '1994-03-17', NULL);
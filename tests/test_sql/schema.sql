@@ -0,0 +1,4 @@
+CREATE DATABASE app;
+CREATE TABLE app.pet (name VARCHAR(20), owner VARCHAR(20),
+    species VARCHAR(20), sex CHAR(1), birth DATE, death DATE);
+INSERT INTO app.pet VALUES ('Fluffy', 'Harold', 'cat', 'f', '1993-02-04', NULL);
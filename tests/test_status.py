@@ -0,0 +1,80 @@
+"""Tests for status counters' changes."""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.factories import client
+from pytest_mysql.status import DEFAULT_COUNTERS, StatusLog, delta, read_status
+
+
+def test_delta() -> None:
+    """Changes are calculated for counters read both times."""
+    before = {"Bytes_sent": 100, "Created_tmp_tables": 2}
+    after = {"Bytes_sent": 350, "Created_tmp_tables": 2, "Sort_merge_passes": 1}
+    assert delta(before, after) == {"Bytes_sent": 250, "Created_tmp_tables": 0}
+
+
+def test_status_log(tmp_path: Path) -> None:
+    """Log replaces file's content, writes a line per record, and nothing once closed."""
+    path = tmp_path / "status.jsonl"
+    path.write_text("previous run\n")
+    log = StatusLog()
+    log.write({"nodeid": "not started"})
+    log.start(path)
+    log.write({"nodeid": "test_a", "global": {"Bytes_sent": 1}})
+    log.write({"nodeid": "test_b", "global": {"Bytes_sent": 2}})
+    log.close()
+    log.write({"nodeid": "closed"})
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["nodeid"] for record in records] == ["test_a", "test_b"]
+
+
+def test_read_status(mysql: Connection) -> None:
+    """Status counters are read, skipping unknown ones."""
+    counters = ("Bytes_sent", "Bytes_received", "No_such_counter")
+    before = read_status(mysql, "SESSION", counters)
+    assert set(before) == {"Bytes_sent", "Bytes_received"}
+    with mysql.cursor() as cursor:
+        cursor.execute("SELECT REPEAT('x', 1000)")
+        cursor.fetchall()
+    assert delta(before, read_status(mysql, "SESSION", counters))["Bytes_sent"] > 1000
+
+
+@pytest.fixture
+def status_report(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[None]:
+    """Check status counters' changes recorded, once test's fixtures requested later are done."""
+    path = tmp_path / "status.jsonl"
+    log = StatusLog()
+    log.start(path)
+    monkeypatch.setattr(client, "status_log", log)
+    yield
+    log.close()
+    if "mysql_status" not in request.node.funcargs:
+        # client fixture failed to set up, which gets reported on its own
+        return
+
+    properties = dict(request.node.user_properties)
+    assert set(properties["mysql_status"]) == {"global", "session"}
+    assert properties["mysql_status"]["global"]["Bytes_sent"] > 0
+    assert properties["mysql_status"]["session"]["Bytes_sent"] > 0
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records == [
+        {"nodeid": request.node.nodeid, "fixture": "mysql_status", **properties["mysql_status"]}
+    ]
+
+
+def test_mysql_status(status_report: None, mysql_status: Connection) -> None:
+    """Client fixture recording status counters works as the regular one.
+
+    Its changes get recorded in test's report and JSON Lines file.
+    """
+    with mysql_status.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
+    assert "Bytes_sent" in read_status(mysql_status, "GLOBAL", DEFAULT_COUNTERS)
@@ -0,0 +1,28 @@
+"""Tests for cloning template database into test databases."""
+
+import pytest
+from pymysql import Connection
+
+
+@pytest.mark.parametrize("owner", ("Harold", "Gwen"))
+def test_template_cloned(mysql_template: Connection, owner: str) -> None:
+    """Each test gets its own copy of template's data."""
+    with mysql_template.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("DELETE FROM pet WHERE owner = %s", (owner,))
+    mysql_template.commit()
+
+
+def test_template_keys_and_generated_columns(mysql_template: Connection) -> None:
+    """Foreign keys, generated columns and auto increments are cloned."""
+    with mysql_template.cursor() as cursor:
+        cursor.execute("SELECT name, upper_name FROM owner ORDER BY id")
+        assert cursor.fetchall() == (("Harold", "HAROLD"), ("Gwen", "GWEN"))
+        cursor.execute("INSERT INTO owner (name) VALUES ('Benny')")
+        assert cursor.lastrowid == 3
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.REFERENTIAL_CONSTRAINTS "
+            "WHERE CONSTRAINT_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME = 'owner'"
+        )
+        assert cursor.fetchone() == (1,)
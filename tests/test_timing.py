@@ -0,0 +1,107 @@
+"""Tests for fixtures' phases timing."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pytest_mysql.timing import Timings, percentile
+
+
+@pytest.mark.parametrize(
+    "fraction, expected",
+    ((0.5, 5.0), (0.95, 10.0), (0.1, 1.0), (0.0, 1.0), (1.0, 10.0)),
+)
+def test_percentile(fraction: float, expected: float) -> None:
+    """Percentile uses nearest rank method."""
+    durations = [float(duration) for duration in range(10, 0, -1)]
+    assert percentile(durations, fraction) == expected
+
+
+def test_timings_summary(tmp_path: Path) -> None:
+    """Durations get aggregated per fixture and phase."""
+    timings = Timings()
+    for duration in (0.3, 0.1, 0.2):
+        timings.record("mysql", "create database", duration)
+    with timings.measure("mysql_proc", "process start"):
+        pass
+
+    summary = timings.summary()
+    assert [(row["fixture"], row["phase"], row["count"]) for row in summary] == [
+        ("mysql", "create database", 3),
+        ("mysql_proc", "process start", 1),
+    ]
+    assert summary[0]["total"] == pytest.approx(0.6)
+    assert summary[0]["p50"] == 0.2
+    assert summary[0]["p95"] == 0.3
+    assert summary[0]["max"] == 0.3
+
+    report = timings.report()
+    assert report[0].split() == ["fixture", "phase", "count", "total", "p50", "p95", "max"]
+    assert report[1].split() == [
+        "mysql",
+        "create",
+        "database",
+        "3",
+        "600.0",
+        "200.0",
+        "300.0",
+        "300.0",
+    ]
+
+    timings.write_json(tmp_path / "timings.json")
+    assert json.loads((tmp_path / "timings.json").read_text()) == summary
+
+    timings.clear()
+    assert not timings.summary()
+
+
+def test_timings_measure_failed_phase() -> None:
+    """Phase gets measured even if it raises an exception."""
+    timings = Timings()
+    with pytest.raises(ValueError):
+        with timings.measure("mysql_proc", "readiness"):
+            raise ValueError
+    assert timings.summary()[0]["count"] == 1
+
+
+def test_timings_merge() -> None:
+    """Durations recorded by pytest-xdist workers get merged into the controller's ones."""
+    worker_timings = Timings()
+    worker_timings.record("mysql", "connect", 0.1)
+    timings = Timings()
+    timings.record("mysql", "connect", 0.3)
+    timings.merge(worker_timings.durations())
+    timings.merge(worker_timings.durations())
+    summary = timings.summary()
+    assert summary[0]["count"] == 3
+    assert summary[0]["total"] == pytest.approx(0.5)
+
+
+def test_timings_xdist(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Controller reports timings measured in pytest-xdist workers."""
+    pytest.importorskip("xdist")
+    # workers import the plugin in separate processes
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parent.parent))
+    pytester.makeconftest("from pytest_mysql.plugin import *  # noqa: F403\n")
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from pytest_mysql.timing import timings
+
+
+        @pytest.mark.parametrize("duration", (0.1, 0.2, 0.3, 0.4))
+        def test_measure(duration):
+            timings.record("mysql", "connect", duration)
+        """
+    )
+    result = pytester.runpytest_subprocess(
+        "-n", "2", "--mysql-timings", "--mysql-timings-json=timings.json"
+    )
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(["*pytest-mysql timings*", "mysql*connect*4*1000.0*"])
+    summary = json.loads((pytester.path / "timings.json").read_text())
+    assert [(row["fixture"], row["phase"], row["count"]) for row in summary] == [
+        ("mysql", "connect", 4)
+    ]
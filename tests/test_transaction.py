@@ -0,0 +1,54 @@
+"""Tests for transaction isolation of client fixture."""
+
+import pytest
+from pymysql import Connection
+
+from pytest_mysql.transaction import TransactionalConnection
+
+
+@pytest.mark.parametrize("owner", ("Harold", "Gwen"))
+def test_changes_rolled_back(mysql_transaction: Connection, owner: str) -> None:
+    """Committed changes are not visible in the following tests."""
+    with mysql_transaction.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("DELETE FROM pet WHERE owner = %s", (owner,))
+    mysql_transaction.commit()
+    assert isinstance(mysql_transaction, TransactionalConnection)
+    assert not mysql_transaction.implicit_commit
+
+
+def test_rollback_to_commit(mysql_transaction: Connection) -> None:
+    """Rollback reverts changes since the last commit."""
+    with mysql_transaction.cursor() as cursor:
+        cursor.execute("DELETE FROM pet WHERE owner = 'Harold'")
+        mysql_transaction.commit()
+        cursor.execute("DELETE FROM pet")
+        mysql_transaction.rollback()
+        cursor.execute("SELECT owner FROM pet")
+        assert cursor.fetchall() == (("Gwen",),)
+
+
+@pytest.mark.parametrize("table", ("toy", "food"))
+def test_implicit_commit_detected(mysql_transaction: Connection, table: str) -> None:
+    """Database gets recreated after the test running DDL."""
+    with mysql_transaction.cursor() as cursor:
+        cursor.execute("SHOW TABLES")
+        assert cursor.fetchall() == (("pet",),)
+        cursor.execute(f"CREATE TABLE {table} (name VARCHAR(20))")
+    assert isinstance(mysql_transaction, TransactionalConnection)
+    assert mysql_transaction.implicit_commit
+
+
+@pytest.mark.parametrize("statement", ("BEGIN", "start  transaction", "COMMIT AND CHAIN", "BEGIN"))
+def test_transaction_statements_rolled_back(mysql_transaction: Connection, statement: str) -> None:
+    """Changes don't leak into following tests, when test controls transactions with queries."""
+    with mysql_transaction.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pet")
+        assert cursor.fetchone() == (2,)
+        cursor.execute("DELETE FROM pet WHERE owner = 'Harold'")
+        cursor.execute(statement)
+        cursor.execute("DELETE FROM pet WHERE owner = 'Gwen'")
+    assert isinstance(mysql_transaction, TransactionalConnection)
+    # COMMIT AND CHAIN gets detected once the test is over
+    assert not mysql_transaction.implicit_commit